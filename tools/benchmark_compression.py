@@ -0,0 +1,123 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Compare listing large collections with and without compression.
+
+Serves a management instance listing from a local stub server, optionally
+throttled to simulate a WAN link, and lists it with HTTPClient while the
+server compresses responses or not. Prints the bytes sent by the server
+and the time taken by the client.
+
+    python tools/benchmark_compression.py --instances 5000 --bandwidth 1000000
+"""
+
+import argparse
+import gzip
+import http.server
+import json
+import statistics
+import threading
+import time
+
+from troveclient import client
+
+
+def make_listing(count):
+    return json.dumps({'instances': [{
+        'id': '%08d-0000-4000-8000-000000000000' % i,
+        'name': 'instance-%d' % i,
+        'status': 'ACTIVE',
+        'tenant_id': 'a1b2c3d4e5f60718293a4b5c6d7e8f90',
+        'server_id': '%08d-1111-4000-8000-000000000000' % i,
+        'flavor': {'id': 'm1.medium', 'links': []},
+        'volume': {'size': 10},
+        'datastore': {'type': 'mysql', 'version': '5.7.29'},
+        'links': [{'rel': 'self',
+                   'href': 'http://trove:8779/v1.0/tenant/instances/%d' % i}],
+    } for i in range(count)]}).encode('utf-8')
+
+
+class StubServer(http.server.ThreadingHTTPServer):
+
+    def __init__(self, listing, bandwidth=None):
+        super(StubServer, self).__init__(('127.0.0.1', 0), StubHandler)
+        self.listing = listing
+        self.compressed = gzip.compress(listing, compresslevel=6)
+        self.bandwidth = bandwidth
+        self.compress = True
+        self.bytes_sent = 0
+
+
+class StubHandler(http.server.BaseHTTPRequestHandler):
+
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        server = self.server
+        body = server.listing
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        if server.compress and 'gzip' in self.headers.get(
+                'Accept-Encoding', ''):
+            body = server.compressed
+            self.send_header('Content-Encoding', 'gzip')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        if server.bandwidth:
+            time.sleep(len(body) / server.bandwidth)
+        self.wfile.write(body)
+        server.bytes_sent += len(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def run(http_client, server, compress, repeat):
+    server.compress = compress
+    server.bytes_sent = 0
+    timings = []
+    for _i in range(repeat):
+        started = time.perf_counter()
+        http_client.get('/mgmt/instances')
+        timings.append(time.perf_counter() - started)
+    return server.bytes_sent // repeat, statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--instances', type=int, default=2000,
+                        help='number of instances listed')
+    parser.add_argument('--bandwidth', type=float, default=None,
+                        help='simulated link speed, in bytes per second')
+    parser.add_argument('--repeat', type=int, default=5,
+                        help='number of listings timed')
+    args = parser.parse_args()
+
+    server = StubServer(make_listing(args.instances), args.bandwidth)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    http_client = client.HTTPClient('user', 'password', 'project',
+                                    'http://127.0.0.1/identity')
+    http_client.management_url = 'http://127.0.0.1:%d/v1.0/project' % (
+        server.server_address[1])
+    http_client.auth_token = 'token'
+    try:
+        print('%-12s %12s %12s' % ('', 'bytes', 'seconds'))
+        for name, compress in (('identity', False), ('gzip', True)):
+            size, elapsed = run(http_client, server, compress, args.repeat)
+            print('%-12s %12d %12.4f' % (name, size, elapsed))
+    finally:
+        http_client.close()
+        server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -414,8 +414,6 @@ def from_response(response, method, url):
         "url": url,
         "request_id": response.headers.get("x-compute-request-id"),
     }
-    if "retry-after" in response.headers:
-        kwargs["retry_after"] = response.headers["retry-after"]
 
     content_type = response.headers.get("Content-Type", "")
     if content_type.startswith("application/json"):
@@ -456,4 +454,9 @@ def from_response(response, method, url):
             cls = HTTPClientError
         else:
             cls = HttpError
+    # NOTE: Only some exceptions take the Retry-After header, the others
+    # expose it through their response.
+    if ("retry-after" in response.headers and
+            issubclass(cls, RequestEntityTooLarge)):
+        kwargs["retry_after"] = response.headers["retry-after"]
     return cls(**kwargs)
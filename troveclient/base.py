@@ -19,15 +19,24 @@
 Base utilities to build API operation managers and objects on top of.
 """
 import abc
+import collections
+import collections.abc
+from concurrent import futures
 import contextlib
-import hashlib
-import os
+import copy
+import functools
+import inspect
+import threading
+import time
 
+from oslo_utils import strutils
 from urllib import parse
 
 from troveclient.apiclient import base
-from troveclient.apiclient import exceptions
 from troveclient import common
+from troveclient import completion
+from troveclient import exceptions
+from troveclient import tracing
 from troveclient import utils
 
 # Python 2.4 compat
@@ -57,19 +66,77 @@ class Manager(utils.HookableMixin):
     images, etc.) and provide CRUD operations for them.
     """
     resource_class = None
+    # Used instead of resource_class when the client asks for compact
+    # resources, see CompactResource.
+    compact_resource_class = None
+    # Whether GET requests go through the response cache of the client, if
+    # it has one. Meant for the read-mostly catalog endpoints.
+    cache_responses = False
 
     def __init__(self, api):
         self.api = api
+        if (self.compact_resource_class is not None and
+                getattr(api, 'compact_resources', False) is True):
+            self.resource_class = self.compact_resource_class
+
+    def __init_subclass__(cls, **kwargs):
+        super(Manager, cls).__init_subclass__(**kwargs)
+        # Trace the public methods of the managers when osprofiler is
+        # installed.
+        for name, value in list(vars(cls).items()):
+            if not name.startswith('_') and inspect.isfunction(value):
+                setattr(cls, name, tracing.trace_method(
+                    value, '%s.%s' % (cls.__name__, name)))
+
+    def _api_get(self, url, stream_key=None):
+        kwargs = {}
+        if self.cache_responses:
+            kwargs['cache'] = True
+        coalescer = getattr(self.api, 'request_coalescer', None)
+        if not isinstance(coalescer, RequestCoalescer):
+            if stream_key:
+                kwargs['stream_key'] = stream_key
+            return self.api.client.get(url, **kwargs)
+        # NOTE: A streamed body is decoded as it is consumed, so it cannot
+        # be shared between the coalesced requests.
+        return coalescer.request(
+            url, functools.partial(self.api.client.get, url, **kwargs))
 
     def _paginated(self, url, response_key, limit=None, marker=None,
-                   query_strings=None):
+                   query_strings=None, all_pages=False, prefetch=False):
+        """Get one page of a collection, or iterate over all of its pages.
+
+        :param all_pages: if set, return a generator yielding every item of
+                          the collection, following the ``next`` links page
+                          by page. ``limit`` is then used as the page size.
+        :param prefetch: with ``all_pages``, fetch the next page in the
+                         background while the current one is consumed.
+        """
+        if all_pages:
+            return self._paginated_iter(url, response_key, limit=limit,
+                                        marker=marker,
+                                        query_strings=query_strings,
+                                        prefetch=prefetch)
         query_strings = query_strings or {}
         url = common.append_query_strings(url, limit=limit, marker=marker,
                                           **query_strings)
-        resp, body = self.api.client.get(url)
+        resp, body = self._api_get(url)
+        return self._build_page(url, body, response_key)
+
+    def _build_page(self, url, body, response_key, loaded=False):
+        """Build a :class:`common.Paginated` page from a listing body."""
         if not body:
             raise Exception("Call to " + url + " did not return a body.")
         links = body.get('links', [])
+        with tracing.trace('troveclient-resources', count=len(
+                body[response_key])):
+            data = [self.resource_class(self, res, loaded=loaded)
+                    for res in body[response_key]]
+        return common.Paginated(data, next_marker=self._next_marker(links),
+                                links=links)
+
+    @staticmethod
+    def _next_marker(links):
         next_links = [link['href'] for link in links if link['rel'] == 'next']
         next_marker = None
         for link in next_links:
@@ -77,15 +144,72 @@ class Manager(utils.HookableMixin):
             parsed_url = parse.urlparse(link)
             query_dict = dict(parse.parse_qsl(parsed_url.query))
             next_marker = query_dict.get('marker')
-        data = [self.resource_class(self, res) for res in body[response_key]]
-        return common.Paginated(data, next_marker=next_marker, links=links)
+        return next_marker
+
+    def _stream_page(self, url, response_key, limit=None, marker=None,
+                     query_strings=None):
+        """Yield the items of a page, decoding them one at a time.
+
+        :returns: the marker of the next page.
+        """
+        query_strings = query_strings or {}
+        url = common.append_query_strings(url, limit=limit, marker=marker,
+                                          **query_strings)
+        resp, body = self._api_get(url, stream_key=response_key)
+        if not body:
+            raise Exception("Call to " + url + " did not return a body.")
+        for res in body[response_key]:
+            yield self.resource_class(self, res)
+        return self._next_marker(body.get('links', []))
+
+    def _paginated_iter(self, url, response_key, limit=None, marker=None,
+                        query_strings=None, prefetch=False):
+        """Yield the items of a paginated collection page by page.
+
+        Only the page being consumed (plus the prefetched one, if any) is
+        kept in memory. Without prefetching, the items of a page are decoded
+        as they are consumed.
+        """
+        if not prefetch:
+            while True:
+                next_marker = yield from self._stream_page(
+                    url, response_key, limit=limit, marker=marker,
+                    query_strings=query_strings)
+                if not next_marker or next_marker == marker:
+                    return
+                marker = next_marker
+
+        fetch = functools.partial(self._paginated, url, response_key,
+                                  limit=limit, query_strings=query_strings)
+        with futures.ThreadPoolExecutor(max_workers=1) as executor:
+            page = fetch(marker=marker)
+            while True:
+                next_page = None
+                if page.next and page.next != marker:
+                    marker = page.next
+                    next_page = executor.submit(fetch, marker=marker)
+                for item in page:
+                    yield item
+                if next_page is None:
+                    return
+                page = next_page.result()
+
+    def iter_all(self, *args, **kwargs):
+        """Iterate over every item of ``list()``, following pagination.
+
+        Accepts the same arguments as the manager's ``list()`` method, plus
+        ``prefetch`` to fetch the next page while the current one is
+        consumed.
+        """
+        kwargs['all_pages'] = True
+        return self.list(*args, **kwargs)
 
     def _list(self, url, response_key, obj_class=None, body=None):
         resp = None
         if body:
             resp, body = self.api.client.post(url, body=body)
         else:
-            resp, body = self.api.client.get(url)
+            resp, body = self._api_get(url)
 
         if obj_class is None:
             obj_class = self.resource_class
@@ -101,8 +225,9 @@ class Manager(utils.HookableMixin):
 
         with self.completion_cache('human_id', obj_class, mode="w"):
             with self.completion_cache('uuid', obj_class, mode="w"):
-                return [obj_class(self, res, loaded=True)
-                        for res in data if res]
+                with tracing.trace('troveclient-resources', count=len(data)):
+                    return [obj_class(self, res, loaded=True)
+                            for res in data if res]
 
     @contextlib.contextmanager
     def completion_cache(self, cache_type, obj_class, mode):
@@ -111,69 +236,79 @@ class Manager(utils.HookableMixin):
         The completion cache store items that can be used for bash
         autocompletion, like UUIDs or human-friendly IDs.
 
-        A resource listing will clear and repopulate the cache.
-
-        A resource create will append to the cache.
-
-        Delete is not handled because listings are assumed to be performed
-        often enough to keep the cache reasonably up-to-date.
+        Items written within the context are buffered and saved to the
+        :class:`troveclient.completion.CompletionIndex` in one transaction
+        when it exits. A resource listing (mode ``w``) replaces the cached
+        items of the resource, a resource create (mode ``a``) adds to them
+        and a resource delete removes the items of the deleted resource.
         """
-        base_dir = utils.env('TROVECLIENT_UUID_CACHE_DIR',
-                             default="~/.troveclient")
-
-        # NOTE(sirp): Keep separate UUID caches for each username + endpoint
-        # pair
-        username = utils.env('OS_USERNAME', 'TROVE_USERNAME')
-        url = utils.env('OS_URL', 'NOVA_URL')
-        uniqifier = hashlib.md5(username.encode('utf-8') +
-                                url.encode('utf-8')).hexdigest()
-
-        cache_dir = os.path.expanduser(os.path.join(base_dir, uniqifier))
-
-        try:
-            os.makedirs(cache_dir, 0o755)
-        except OSError:
-            # NOTE(kiall): This is typically either permission denied while
-            #              attempting to create the directory, or the directory
-            #              already exists. Either way, don't fail.
-            pass
-
-        resource = obj_class.__name__.lower()
-        filename = "%s-%s-cache" % (resource, cache_type.replace('_', '-'))
-        path = os.path.join(cache_dir, filename)
-
         cache_attr = "_%s_cache" % cache_type
-
-        try:
-            setattr(self, cache_attr, open(path, mode))
-        except IOError:
-            # NOTE(kiall): This is typically a permission denied while
-            #              attempting to write the cache file.
-            pass
-
+        entries = []
+        setattr(self, cache_attr, entries)
         try:
             yield
         finally:
-            cache = getattr(self, cache_attr, None)
-            if cache:
-                cache.close()
-                delattr(self, cache_attr)
-
-    def write_to_completion_cache(self, cache_type, val):
+            delattr(self, cache_attr)
+        with tracing.trace('troveclient-completion-cache',
+                           cache_type=cache_type, count=len(entries)):
+            completion.CompletionIndex.default().update(
+                utils.get_resource_name(obj_class).lower(), cache_type,
+                entries,
+                replace=(mode == "w"))
+
+    def write_to_completion_cache(self, cache_type, val, obj_id=None):
         cache = getattr(self, "_%s_cache" % cache_type, None)
-        if cache:
-            cache.write("%s\n" % val)
+        if cache is not None:
+            cache.append((val, obj_id))
+
+    def hydrate(self, resources, concurrency=8):
+        """Load the details of the resources which are not loaded yet.
+
+        The resources of a listing are summaries, and the first access to
+        an attribute they lack gets the resource, one request each. This
+        gets them up front instead, up to ``concurrency`` at a time.
+
+        :returns: the resources, as a list.
+        :raises: the first error met getting a resource, once all of them
+                 were attempted.
+        """
+        resources = list(resources)
+        pending = [resource for resource in resources
+                   if not getattr(resource, 'is_loaded', True)]
+
+        def load(resource):
+            new = self.get(resource.id)
+            resource._add_details(new._info)
+            resource._loaded = True
+
+        errors = [error for resource, error in
+                  utils.run_on_many(load, pending, concurrency)
+                  if error is not None]
+        if errors:
+            raise errors[0]
+        return resources
 
     def _get(self, url, response_key=None):
-        resp, body = self.api.client.get(url)
-        if response_key:
-            return self.resource_class(self, body[response_key], loaded=True)
-        else:
-            return self.resource_class(self, body, loaded=True)
+        resp, body = self._api_get(url)
+        with tracing.trace('troveclient-resources', count=1):
+            if response_key:
+                return self.resource_class(self, body[response_key],
+                                           loaded=True)
+            else:
+                return self.resource_class(self, body, loaded=True)
+
+    def _invalidate_caches(self):
+        index = getattr(self.api, 'resolution_index', None)
+        if index is not None:
+            index.invalidate(self)
+        coalescer = getattr(self.api, 'request_coalescer', None)
+        if isinstance(coalescer, RequestCoalescer):
+            coalescer.forget()
 
     def _create(self, url, body, response_key, return_raw=False, **kwargs):
         self.run_hooks('modify_body_for_create', body, **kwargs)
         resp, body = self.api.client.post(url, body=body)
+        self._invalidate_caches()
         if body:
             if return_raw:
                 return body[response_key]
@@ -186,15 +321,22 @@ class Manager(utils.HookableMixin):
 
     def _delete(self, url):
         resp, body = self.api.client.delete(url)
+        self._invalidate_caches()
+        if getattr(self.resource_class, '__name__', None):
+            resource = utils.get_resource_name(self.resource_class)
+            completion.CompletionIndex.default().remove(
+                resource.lower(), url.rstrip('/').rsplit('/', 1)[-1])
         return resp, body
 
     def _update(self, url, body, **kwargs):
         self.run_hooks('modify_body_for_update', body, **kwargs)
         resp, body = self.api.client.put(url, body=body)
+        self._invalidate_caches()
         return body
 
     def _edit(self, url, body):
         resp, body = self.api.client.patch(url, body=body)
+        self._invalidate_caches()
         return body
 
 
@@ -208,37 +350,230 @@ class ManagerWithFind(Manager, metaclass=abc.ABCMeta):
     def find(self, **kwargs):
         """Find a single item with attributes matching ``**kwargs``.
 
-        This isn't very efficient: it loads the entire list then filters on
-        the Python side.
+        The candidates are looked up in the client's resolution index, which
+        is built from a single listing, and the full representation of the
+        match is fetched only if the listing did not return it.
         """
         matches = self.findall(**kwargs)
         num_matches = len(matches)
         if num_matches == 0:
-            msg = "No %s matching %s." % (self.resource_class.__name__, kwargs)
+            msg = "No %s matching %s." % (
+                utils.get_resource_name(self.resource_class), kwargs)
             raise exceptions.NotFound(404, msg)
         elif num_matches > 1:
             raise exceptions.NoUniqueMatch
+        elif not getattr(matches[0], 'is_loaded', True):
+            return self.get(matches[0].id)
         else:
             return matches[0]
 
     def findall(self, **kwargs):
         """Find all items with attributes matching ``**kwargs``.
 
-        This isn't very efficient: it loads the entire list then filters on
-        the Python side.
+        The items are returned as listed, without fetching each match
+        again. If the client has a resolution index the listing is shared
+        with the other lookups on this manager until the index expires.
         """
-        found = []
+        index = getattr(self.api, 'resolution_index', None)
+        if index is not None:
+            return index.findall(self, **kwargs)
+        return _filter_resources(self._find_candidates(), kwargs.items())
+
+    def _find_candidates(self):
+        """List the resources searched by find() and findall()."""
+        if 'all_pages' in inspect.signature(self.list).parameters:
+            return self.list(all_pages=True)
+        return self.list()
+
+
+_MISSING = object()
+
+
+def _peek(resource, attr):
+    """Get an attribute without lazy-loading the resource."""
+    if attr in vars(resource):
+        return vars(resource)[attr]
+    if isinstance(resource, CompactResource):
+        if attr in resource._info:
+            return resource._info[attr]
+        if isinstance(getattr(type(resource), attr, None), _Field):
+            return _MISSING
+    if hasattr(type(resource), attr):
+        return getattr(resource, attr, _MISSING)
+    return _MISSING
+
+
+def _filter_resources(resources, searches):
+    return [obj for obj in resources
+            if all(_peek(obj, attr) == value for (attr, value) in searches)]
+
+
+class ResolutionIndex(object):
+    """Per-client index resolving resource names and IDs to resources.
+
+    The index of a manager is built from a single listing the first time
+    ``find()`` or ``findall()`` is called on it, and reused by the following
+    lookups until it is older than ``ttl`` seconds or a resource is created,
+    updated or deleted through the manager. A ``ttl`` of 0 disables reuse.
+
+    :param ttl: number of seconds an index stays valid
+    """
+
+    INDEXED_ATTRS = ('id', 'name', 'human_id', 'display_name')
+
+    def __init__(self, ttl=30):
+        self.ttl = ttl
+        self._lock = threading.RLock()
+        self._indexes = {}
+
+    @staticmethod
+    def _key(manager):
+        return (type(manager).__name__,
+                getattr(manager.resource_class, '__name__', None))
+
+    def _get_index(self, manager):
+        # NOTE: The index is built while holding the lock so that threads
+        # resolving names concurrently share a single listing.
+        with self._lock:
+            return self._get_index_locked(manager)
+
+    def _get_index_locked(self, manager):
+        key = self._key(manager)
+        index = self._indexes.get(key)
+        if index and index[0] > time.time():
+            return index
+
+        resources = list(manager._find_candidates())
+        lookup = collections.defaultdict(list)
+        for res in resources:
+            for attr in self.INDEXED_ATTRS:
+                value = _peek(res, attr)
+                if value is _MISSING or value is None:
+                    continue
+                try:
+                    lookup[(attr, value)].append(res)
+                except TypeError:
+                    # Unhashable values are only matched by a full scan.
+                    pass
+        index = (time.time() + (self.ttl or 0), resources, lookup)
+        if self.ttl:
+            self._indexes[key] = index
+        return index
+
+    def findall(self, manager, **kwargs):
+        """Return the resources of ``manager`` matching ``**kwargs``."""
+        expires, resources, lookup = self._get_index(manager)
         searches = list(kwargs.items())
+        for attr, value in searches:
+            if attr in self.INDEXED_ATTRS:
+                try:
+                    resources = lookup.get((attr, value), [])
+                except TypeError:
+                    continue
+                break
+        return _filter_resources(resources, searches)
+
+    def invalidate(self, manager=None):
+        """Drop the index of ``manager``, or of every manager if not given."""
+        with self._lock:
+            if manager is None:
+                self._indexes.clear()
+            else:
+                self._indexes.pop(self._key(manager), None)
+
+
+class RequestCoalescer(object):
+    """Share one GET between the threads requesting the same URL at once.
+
+    The first thread requesting a URL sends the request; the threads
+    requesting it before the response is received wait for it instead of
+    sending their own. Each of them gets its own copy of the decoded body,
+    taken from a snapshot the first thread makes before using the body, so
+    that the resources built from it stay independent, and the error
+    raised if the request failed.
+    """
 
-        for obj in self.list():
-            try:
-                if all(getattr(obj, attr) == value
-                       for (attr, value) in searches):
-                    found.append(self.get(obj.id))
-            except AttributeError:
-                continue
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+
+    def request(self, key, send):
+        """Return ``send()``, or the result of the same call in flight."""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = futures.Future()
+                call.followers = 0
+            else:
+                call.followers += 1
+
+        if not leader:
+            resp, snapshot = call.result()
+            return resp, copy.deepcopy(snapshot)
+
+        try:
+            resp, body = send()
+        except BaseException as e:
+            self._done(key, call)
+            call.set_exception(e)
+            raise
+        self._done(key, call)
+        # No thread can join the call once it is done, so the body is only
+        # copied when others wait for it. The snapshot is private: the
+        # waiting threads copy it while this one builds resources from the
+        # body.
+        snapshot = copy.deepcopy(body) if call.followers else None
+        call.set_result((resp, snapshot))
+        return resp, body
+
+    def _done(self, key, call):
+        with self._lock:
+            if self._calls.get(key) is call:
+                del self._calls[key]
+
+    def forget(self):
+        """Let the next requests be sent rather than join those in flight.
+
+        Called after a resource is modified, as the responses in flight
+        may predate the change.
+        """
+        with self._lock:
+            self._calls.clear()
+
+
+class LazyLoads(object):
+    """Count the resources loaded on the access to a missing attribute.
+
+    Such a lazy load sends one request per resource, so counting them finds
+    the loops over listings that should use :meth:`Manager.hydrate`.
+
+    :param strict: raise :class:`troveclient.exceptions.LazyLoadError`
+                   instead of loading the resource
+    """
+
+    def __init__(self, strict=False):
+        self.strict = strict
+        self.counts = collections.Counter()
+        self._lock = threading.Lock()
+
+    def record(self, resource, attr):
+        name = utils.get_resource_name(type(resource))
+        with self._lock:
+            self.counts[(name, attr)] += 1
+        if self.strict:
+            raise exceptions.LazyLoadError(
+                name, getattr(resource, '_info', {}).get('id'), attr)
+
+    @property
+    def total(self):
+        """Number of lazy loads counted."""
+        with self._lock:
+            return sum(self.counts.values())
 
-        return found
+    def reset(self):
+        with self._lock:
+            self.counts.clear()
 
 
 class Resource(base.Resource):
@@ -257,9 +592,154 @@ class Resource(base.Resource):
         # NOTE(sirp): ensure `id` is already present because if it isn't we'll
         # enter an infinite loop of __getattr__ -> get -> __init__ ->
         # __getattr__ -> ...
-        if 'id' in self.__dict__ and len(str(self.id)) == 36:
-            self.manager.write_to_completion_cache('uuid', self.id)
+        if 'id' in self._info and len(str(self.id)) == 36:
+            self.manager.write_to_completion_cache('uuid', self.id,
+                                                   obj_id=self.id)
 
         human_id = self.human_id
         if human_id:
-            self.manager.write_to_completion_cache('human_id', human_id)
+            self.manager.write_to_completion_cache(
+                'human_id', human_id, obj_id=self._info.get('id'))
+
+    def __getattr__(self, k):
+        if k != "__setstate__" and k not in self.__dict__ and \
+                not self.is_loaded:
+            self._lazy_load(k)
+        return super(Resource, self).__getattr__(k)
+
+    def _lazy_load(self, attr):
+        """Get the resource, as ``attr`` is missing."""
+        manager = self.__dict__.get('manager')
+        tracker = getattr(getattr(manager, 'api', None), 'lazy_loads', None)
+        if isinstance(tracker, LazyLoads):
+            tracker.record(self, attr)
+        self._get()
+
+
+class _Field(object):
+    """An attribute of a compact resource, read from its raw dict."""
+
+    __slots__ = ('name',)
+
+    def __init__(self, name):
+        self.name = name
+
+    def __get__(self, resource, owner=None):
+        if resource is None:
+            return self
+        try:
+            return resource._info[self.name]
+        except KeyError:
+            # NOTE: Falls back to __getattr__, which lazy-loads.
+            raise AttributeError(self.name)
+
+
+class CompactResource(Resource):
+    """A resource keeping its attributes in its raw dict only.
+
+    A :class:`Resource` copies every key of its dict to an attribute, and
+    its :meth:`to_dict` returns a deep copy. A compact resource reads its
+    attributes from the dict instead, and :meth:`to_dict` returns a
+    :class:`CopyOnWriteDict` of it, so that a listing is held in memory
+    once. Attributes set on the resource shadow the keys of the dict
+    without modifying it.
+
+    The subclasses may declare the keys they usually have in ``FIELDS``;
+    these are looked up without going through :meth:`__getattr__`, and
+    listed by ``dir()``. ``RESOURCE_NAME`` is the name of the resource in
+    the completion cache and the messages, that of the class made compact.
+    """
+    FIELDS = ()
+    RESOURCE_NAME = None
+
+    def __init_subclass__(cls, **kwargs):
+        super(CompactResource, cls).__init_subclass__(**kwargs)
+        for name in vars(cls).get('FIELDS', ()):
+            setattr(cls, name, _Field(name))
+
+    def _add_details(self, info):
+        if info is not self._info:
+            self._info.update(info)
+            for k in info:
+                self.__dict__.pop(k, None)
+
+    def __getattr__(self, k):
+        if k.startswith('__') or k in ('manager', '_info', '_loaded'):
+            raise AttributeError(k)
+        try:
+            return self._info[k]
+        except KeyError:
+            pass
+        # NOTE(bcwaldon): disallow lazy-loading if already loaded once
+        if not self.is_loaded:
+            self._lazy_load(k)
+            return self.__getattr__(k)
+        raise AttributeError(k)
+
+    def __repr__(self):
+        keys = set(self._info).union(vars(self))
+        reprkeys = sorted(k for k in keys if k[0] != '_' and k != 'manager')
+        info = ", ".join("%s=%s" % (k, getattr(self, k)) for k in reprkeys)
+        return "<%s %s>" % (utils.get_resource_name(type(self)), info)
+
+    @property
+    def human_id(self):
+        if self.HUMAN_ID and self.NAME_ATTR in self._info:
+            return strutils.to_slug(getattr(self, self.NAME_ATTR))
+        return None
+
+    def to_dict(self):
+        return CopyOnWriteDict(self._info)
+
+
+_DELETED = object()
+
+
+class CopyOnWriteDict(collections.abc.MutableMapping):
+    """A mapping over a dict, keeping its own changes apart.
+
+    Reads go to the dict unless the key was set or deleted on the mapping,
+    so the dict is never modified. The values are shared with the dict, so
+    they must not be modified in place; ``copy.deepcopy()`` returns a deep
+    copy as a plain dict.
+    """
+
+    def __init__(self, data):
+        self._data = data
+        self._changes = {}
+
+    def __getitem__(self, key):
+        value = self._changes.get(key, _MISSING)
+        if value is _MISSING:
+            return self._data[key]
+        if value is _DELETED:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key, value):
+        self._changes[key] = value
+
+    def __delitem__(self, key):
+        self[key]
+        self._changes[key] = _DELETED
+
+    def __iter__(self):
+        for key in self._data:
+            if self._changes.get(key) is not _DELETED:
+                yield key
+        for key, value in self._changes.items():
+            if key not in self._data and value is not _DELETED:
+                yield key
+
+    def __len__(self):
+        return sum(1 for _key in self)
+
+    def __repr__(self):
+        return repr(dict(self))
+
+    def __deepcopy__(self, memo):
+        return copy.deepcopy(dict(self), memo)
+
+    def copy(self):
+        """Return a shallow copy as a plain dict."""
+        return dict(self)
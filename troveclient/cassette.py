@@ -0,0 +1,179 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""
+Record the HTTP exchanges of a client to a cassette, and replay them.
+
+Meant for measuring the client side performance offline and reproducibly::
+
+    cs = client.Client(...)
+    cassette.record(cs, 'instances.cassette')
+    cs.instances.list()
+
+    cassette.replay(cs, 'instances.cassette', latency=1.0)
+    cs.instances.list()
+
+A cassette is a JSON Lines file with one exchange per line. The request
+bodies are not recorded and the token headers are redacted, but the
+response bodies are kept as they are and may contain tokens.
+"""
+
+import base64
+import collections
+import datetime
+import json
+import threading
+import time
+from urllib import parse
+
+import requests
+from requests import adapters
+from requests import structures
+
+from troveclient import exceptions
+
+REDACTED = 'REDACTED'
+_REDACTED_HEADERS = frozenset(['x-auth-token', 'x-subject-token'])
+# The recorded bodies are decoded, so these headers no longer apply.
+_DROPPED_HEADERS = frozenset(['content-encoding', 'content-length',
+                              'transfer-encoding'])
+
+
+def _key(method, url):
+    parts = parse.urlsplit(url)
+    query = parse.urlencode(sorted(parse.parse_qsl(parts.query)))
+    return method.upper(), parts._replace(query=query).geturl()
+
+
+class RecordingAdapter(adapters.HTTPAdapter):
+    """Send requests and append the exchanges to the cassette at ``path``."""
+
+    def __init__(self, path, **kwargs):
+        super(RecordingAdapter, self).__init__(**kwargs)
+        self.path = path
+        self._lock = threading.Lock()
+
+    def send(self, request, **kwargs):
+        # NOTE: The session only sets resp.elapsed once the adapter
+        # returns, so the exchange is timed here.
+        started = time.monotonic()
+        resp = super(RecordingAdapter, self).send(request, **kwargs)
+        content = resp.content
+        elapsed = time.monotonic() - started
+        try:
+            body, encoding = content.decode('utf-8'), 'utf-8'
+        except UnicodeDecodeError:
+            body, encoding = base64.b64encode(content).decode(), 'base64'
+        headers = {}
+        for name, value in resp.headers.items():
+            if name.lower() in _REDACTED_HEADERS:
+                value = REDACTED
+            if name.lower() not in _DROPPED_HEADERS:
+                headers[name] = value
+        line = json.dumps({'method': request.method, 'url': request.url,
+                           'status': resp.status_code, 'reason': resp.reason,
+                           'headers': headers, 'body': body,
+                           'body_encoding': encoding,
+                           'elapsed': elapsed})
+        with self._lock:
+            with open(self.path, 'a') as f:
+                f.write(line + '\n')
+        return resp
+
+
+class ReplayAdapter(adapters.BaseAdapter):
+    """Answer requests with the responses of the cassette at ``path``.
+
+    Requests are matched by method and URL, regardless of the order of
+    the query parameters. Identical requests get the recorded responses in
+    order, the last one being repeated once they are exhausted.
+
+    :param latency: factor applied to the recorded response times, waited
+                    before returning each response; 0 returns them at once
+    :raises exceptions.CassetteMismatch: on a request that was not recorded.
+    """
+
+    def __init__(self, path, latency=0):
+        super(ReplayAdapter, self).__init__()
+        self.latency = latency
+        self._lock = threading.Lock()
+        self._exchanges = collections.defaultdict(collections.deque)
+        with open(path) as f:
+            for line in f:
+                if line.strip():
+                    exchange = json.loads(line)
+                    key = _key(exchange['method'], exchange['url'])
+                    self._exchanges[key].append(exchange)
+
+    def _next(self, request):
+        with self._lock:
+            exchanges = self._exchanges.get(_key(request.method, request.url))
+            if not exchanges:
+                raise exceptions.CassetteMismatch(request.method, request.url)
+            if len(exchanges) > 1:
+                return exchanges.popleft()
+            return exchanges[0]
+
+    def send(self, request, stream=False, timeout=None, verify=True,
+             cert=None, proxies=None):
+        exchange = self._next(request)
+        if self.latency:
+            time.sleep(exchange['elapsed'] * self.latency)
+
+        resp = requests.Response()
+        resp.status_code = exchange['status']
+        resp.reason = exchange['reason']
+        resp.headers = structures.CaseInsensitiveDict(exchange['headers'])
+        resp.encoding = requests.utils.get_encoding_from_headers(resp.headers)
+        if exchange['body_encoding'] == 'base64':
+            resp._content = base64.b64decode(exchange['body'])
+        else:
+            resp._content = exchange['body'].encode('utf-8')
+        resp.url = request.url
+        resp.request = request
+        resp.elapsed = datetime.timedelta(seconds=exchange['elapsed'])
+        resp.connection = self
+        return resp
+
+    def close(self):
+        pass
+
+
+def _http_session(client):
+    """Return the :class:`requests.Session` used by a client."""
+    client = getattr(client, 'client', client)
+    session = getattr(client, 'http_session', None)
+    if session is None:
+        # A SessionClient, sending through a keystoneauth session.
+        session = client.session.session
+    return session
+
+
+def _mount(client, adapter):
+    session = _http_session(client)
+    for prefix in ('https://', 'http://'):
+        session.mount(prefix, adapter)
+
+
+def record(client, path, **kwargs):
+    """Record the exchanges of ``client`` to the cassette at ``path``.
+
+    :param client: a :class:`troveclient.v1.client.Client`, or its
+                   HTTPClient or SessionClient
+    :param kwargs: passed to :class:`requests.adapters.HTTPAdapter`
+    """
+    _mount(client, RecordingAdapter(path, **kwargs))
+
+
+def replay(client, path, latency=0):
+    """Answer the requests of ``client`` from the cassette at ``path``."""
+    _mount(client, ReplayAdapter(path, latency=latency))
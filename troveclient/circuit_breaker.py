@@ -0,0 +1,154 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""
+Fail fast on API endpoints that keep failing.
+"""
+
+import threading
+import time
+
+from keystoneauth1 import exceptions as ks_exceptions
+import requests
+
+from troveclient import exceptions
+from troveclient import utils
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half-open'
+
+_FAILURE_ERRORS = (requests.exceptions.ConnectionError,
+                   requests.exceptions.Timeout,
+                   exceptions.ConnectionRefused,
+                   ks_exceptions.ConnectionError)
+
+
+class _Circuit(object):
+
+    def __init__(self):
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = None
+        self.probes = 0
+
+
+class CircuitBreaker(utils.HookableMixin):
+    """Stop sending requests to an endpoint after repeated failures.
+
+    Each endpoint has its own circuit. It opens after
+    ``failure_threshold`` consecutive failures: connection errors,
+    timeouts, ``429`` or ``5xx`` responses. While open, requests fail at
+    once with :class:`exceptions.CircuitOpen`. After ``reset_timeout``
+    seconds the circuit is half-open and lets up to ``half_open_probes``
+    requests through: it closes again if they succeed and reopens if one
+    of them fails.
+
+    The ``state_change`` hooks are run with the endpoint, the previous and
+    the new state whenever a circuit changes state::
+
+        CircuitBreaker.add_hook('state_change', hook)
+
+    :param failure_threshold: consecutive failures opening a circuit
+    :param reset_timeout: seconds a circuit stays open
+    :param half_open_probes: requests let through a half-open circuit
+    """
+
+    _hooks_map = {}
+
+    def __init__(self, failure_threshold=5, reset_timeout=30,
+                 half_open_probes=1):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.half_open_probes = half_open_probes
+        self._lock = threading.Lock()
+        self._circuits = {}
+
+    def state(self, endpoint):
+        """Return the state of the circuit of ``endpoint``."""
+        with self._lock:
+            circuit = self._circuits.get(endpoint)
+            return circuit.state if circuit else CLOSED
+
+    def _set_state(self, endpoint, circuit, state, changes):
+        changes.append((endpoint, circuit.state, state))
+        circuit.state = state
+        circuit.probes = 0
+        if state == OPEN:
+            circuit.opened_at = time.monotonic()
+
+    def _notify(self, changes):
+        # NOTE: Hooks run outside the lock so they may use the breaker.
+        for endpoint, old, new in changes:
+            self.run_hooks('state_change', endpoint, old, new)
+
+    def before_request(self, endpoint):
+        """Let a request through, or raise if the circuit is open.
+
+        :raises exceptions.CircuitOpen: if the request must not be sent.
+        """
+        changes = []
+        try:
+            with self._lock:
+                circuit = self._circuits.setdefault(endpoint, _Circuit())
+                if circuit.state == OPEN:
+                    retry_at = circuit.opened_at + self.reset_timeout
+                    if time.monotonic() < retry_at:
+                        raise exceptions.CircuitOpen(
+                            endpoint, retry_at - time.monotonic())
+                    self._set_state(endpoint, circuit, HALF_OPEN, changes)
+                if circuit.state == HALF_OPEN:
+                    if circuit.probes >= self.half_open_probes:
+                        raise exceptions.CircuitOpen(endpoint, 0)
+                    circuit.probes += 1
+        finally:
+            self._notify(changes)
+
+    def record(self, endpoint, failed):
+        """Record the outcome of a request let through."""
+        changes = []
+        with self._lock:
+            circuit = self._circuits.setdefault(endpoint, _Circuit())
+            if not failed:
+                circuit.failures = 0
+                if circuit.state != CLOSED:
+                    self._set_state(endpoint, circuit, CLOSED, changes)
+            else:
+                circuit.failures += 1
+                if circuit.state == HALF_OPEN or (
+                        circuit.state == CLOSED and
+                        circuit.failures >= self.failure_threshold):
+                    self._set_state(endpoint, circuit, OPEN, changes)
+        self._notify(changes)
+
+    @staticmethod
+    def is_failure_status(status_code):
+        return status_code == 429 or status_code >= 500
+
+    @classmethod
+    def is_failure(cls, error):
+        """Whether an error raised by a request counts as a failure."""
+        status = getattr(error, 'http_status', None)
+        if status is not None:
+            return cls.is_failure_status(status)
+        return isinstance(error, _FAILURE_ERRORS)
+
+    def call(self, endpoint, func, *args, **kwargs):
+        """Call ``func`` to send a request to ``endpoint``."""
+        self.before_request(endpoint)
+        try:
+            result = func(*args, **kwargs)
+        except Exception as e:
+            self.record(endpoint, self.is_failure(e))
+            raise
+        self.record(endpoint, False)
+        return result
@@ -19,17 +19,24 @@
 OpenStack Client interface. Handles the REST calls and responses.
 """
 
-import json
+import contextlib
+import gzip
 import logging
+import time
 
 from keystoneauth1 import adapter
 from oslo_utils import importutils
+from oslo_utils import timeutils
 import requests
 from urllib import parse as urlparse
 
 from troveclient.apiclient import client
 from troveclient import exceptions
+from troveclient import jsonutils
+from troveclient import metrics as metrics_lib
+from troveclient import retry
 from troveclient import service_catalog
+from troveclient import tracing
 
 try:
     import eventlet as sleep_lib
@@ -38,9 +45,20 @@ except ImportError:
 
 osprofiler_web = importutils.try_import("osprofiler.web")
 
+# Compressed responses are decoded by requests.
+ACCEPT_ENCODING = 'gzip, deflate'
+
 
 class TroveClientMixin(object):
 
+    metrics = None
+
+    def _measure(self, method, url):
+        """Measure the request sent in a ``with`` block, if enabled."""
+        if self.metrics is None:
+            return contextlib.nullcontext(metrics_lib.Measurement())
+        return self.metrics.measure(method, url)
+
     def get_database_api_version_from_endpoint(self):
         magic_tuple = urlparse.urlsplit(self.management_url)
         scheme, netloc, path, query, frag = magic_tuple
@@ -63,7 +81,11 @@ class HTTPClient(TroveClientMixin):
                  endpoint_type='publicURL', service_type=None,
                  service_name=None, database_service_name=None, retries=None,
                  http_log_debug=False, cacert=None, bypass_url=None,
-                 auth_system='keystone', auth_plugin=None):
+                 auth_system='keystone', auth_plugin=None,
+                 pool_connections=None, pool_maxsize=None,
+                 response_cache=None, token_cache=None, retry_policy=None,
+                 circuit_breaker=None, compression_threshold=None,
+                 metrics=None):
 
         if auth_system and auth_system != 'keystone' and not auth_plugin:
             raise exceptions.AuthSystemNotFound(auth_system)
@@ -86,6 +108,9 @@ class HTTPClient(TroveClientMixin):
         self.service_name = service_name
         self.database_service_name = database_service_name
         self.retries = int(retries or 0)
+        if retry_policy is None:
+            retry_policy = retry.RetryPolicy(retries=self.retries)
+        self.retry_policy = retry_policy
         self.http_log_debug = http_log_debug
 
         self.management_url = None
@@ -107,6 +132,27 @@ class HTTPClient(TroveClientMixin):
 
         self.auth_system = auth_system
         self.auth_plugin = auth_plugin
+        self.response_cache = response_cache
+        self.token_cache = token_cache
+        self.circuit_breaker = circuit_breaker
+        self.compression_threshold = compression_threshold
+        self.metrics = metrics
+        self.auth_token_expires = None
+
+        # NOTE: Keep one session for the lifetime of the client so that
+        # retries, re-authentication and manager calls reuse warm
+        # keep-alive connections instead of doing a TCP/TLS handshake for
+        # every request.
+        self.http_session = requests.Session()
+        pool_kwargs = {}
+        if pool_connections:
+            pool_kwargs['pool_connections'] = int(pool_connections)
+        if pool_maxsize:
+            pool_kwargs['pool_maxsize'] = int(pool_maxsize)
+        if pool_kwargs:
+            for prefix in ('https://', 'http://'):
+                self.http_session.mount(
+                    prefix, requests.adapters.HTTPAdapter(**pool_kwargs))
 
         self.LOG = logging.getLogger(__name__)
         if self.http_log_debug and not self.LOG.handlers:
@@ -132,7 +178,12 @@ class HTTPClient(TroveClientMixin):
             string_parts.append(header)
 
         if 'data' in kwargs:
-            string_parts.append(" -d '%s'" % (kwargs['data']))
+            data = kwargs['data']
+            if kwargs['headers'].get('Content-Encoding'):
+                data = '<%d compressed bytes>' % len(data)
+            elif isinstance(data, bytes):
+                data = data.decode('utf-8')
+            string_parts.append(" -d '%s'" % data)
         self.LOG.debug("\nREQ: %s\n", "".join(string_parts))
 
     def http_log_resp(self, resp):
@@ -148,31 +199,43 @@ class HTTPClient(TroveClientMixin):
         kwargs.setdefault('headers', kwargs.get('headers', {}))
         kwargs['headers']['User-Agent'] = self.USER_AGENT
         kwargs['headers']['Accept'] = 'application/json'
+        kwargs['headers']['Accept-Encoding'] = ACCEPT_ENCODING
         if osprofiler_web:
             kwargs['headers'].update(osprofiler_web.get_trace_id_headers())
         if 'body' in kwargs:
             kwargs['headers']['Content-Type'] = 'application/json'
-            kwargs['data'] = json.dumps(kwargs['body'])
+            kwargs['data'] = _compress_body(
+                kwargs['headers'], jsonutils.dumps(kwargs['body']),
+                self.compression_threshold)
             del kwargs['body']
 
         if self.timeout:
             kwargs.setdefault('timeout', self.timeout)
-        self.http_log_req((url, method,), kwargs)
-        resp = requests.request(
-            method,
-            url,
-            verify=self.verify_cert,
-            **kwargs)
-        self.http_log_resp(resp)
-
-        if resp.text:
-            try:
-                body = json.loads(resp.text)
-            except ValueError:
-                pass
-                body = None
+        cache = kwargs.pop('cache', False) and self.response_cache
+        stream_key = kwargs.pop('stream_key', None)
+
+        def send():
+            self.http_log_req((url, method,), kwargs)
+            resp = self.http_session.request(
+                method,
+                url,
+                verify=self.verify_cert,
+                **kwargs)
+            self.http_log_resp(resp)
+            return resp
+
+        if cache and method == 'GET':
+            key = '%s %s' % (self.projectid or self.tenant_id, url)
+            resp = cache.request(key, kwargs['headers'], send)
         else:
-            body = None
+            resp = send()
+
+        if stream_key and resp.status_code == 200 and resp.content:
+            body = jsonutils.ListStream(resp.content, stream_key)
+        else:
+            with tracing.trace('troveclient-json-decode',
+                               size=len(resp.content or b'')):
+                body = _json_body(resp)
 
         if resp.status_code >= 400:
             raise exceptions.from_response(resp, body, url)
@@ -180,38 +243,53 @@ class HTTPClient(TroveClientMixin):
         return resp, body
 
     def _cs_request(self, url, method, **kwargs):
+        try:
+            with self._measure(method, url) as measurement:
+                return self._cs_request_with_retries(url, method,
+                                                     measurement, **kwargs)
+        finally:
+            _clear_response_cache(self.response_cache, method)
+
+    def _cs_request_with_retries(self, url, method, measurement, **kwargs):
         auth_attempts = 0
         attempts = 0
-        backoff = 1
+        started = time.monotonic()
+        self.retry_policy.record_request()
         while True:
             attempts += 1
+            measurement.attempts = attempts
             if not self.management_url or not self.auth_token:
                 self.authenticate()
             kwargs.setdefault('headers', {})['X-Auth-Token'] = self.auth_token
             if self.projectid:
                 kwargs['headers']['X-Auth-Project-Id'] = self.projectid
             try:
-                resp, body = self.request(self.management_url + url, method,
-                                          **kwargs)
+                with tracing.trace('troveclient-request', method=method,
+                                   url=url, attempt=attempts):
+                    if self.circuit_breaker is not None:
+                        resp, body = self.circuit_breaker.call(
+                            self.management_url, self.request,
+                            self.management_url + url, method, **kwargs)
+                    else:
+                        resp, body = self.request(
+                            self.management_url + url, method, **kwargs)
+                measurement.response = resp
                 return resp, body
-            except exceptions.BadRequest:
-                if attempts > self.retries:
-                    raise
             except exceptions.Unauthorized:
                 if auth_attempts > 0:
                     raise
                 self.LOG.debug("Unauthorized, reauthenticating.")
                 self.management_url = self.auth_token = None
+                if self.token_cache is not None:
+                    self.token_cache.delete(self._token_cache_key())
                 # First reauth. Discount this attempt.
                 attempts -= 1
                 auth_attempts += 1
                 continue
             except exceptions.ClientException as e:
-                if attempts > self.retries:
-                    raise
-                if 500 <= e.code <= 599:
-                    pass
-                else:
+                delay = self.retry_policy.get_delay(
+                    attempts, method, e, time.monotonic() - started)
+                if delay is None:
                     raise
             except requests.exceptions.ConnectionError as e:
                 # Catch a connection refused from requests.request
@@ -219,10 +297,15 @@ class HTTPClient(TroveClientMixin):
                 msg = 'Unable to establish connection: %s' % e
                 raise exceptions.ConnectionRefused(msg)
             self.LOG.debug(
-                "Failed attempt(%s of %s), retrying in %s seconds",
-                attempts, self.retries, backoff)
-            sleep_lib.sleep(backoff)
-            backoff *= 2
+                "Failed attempt(%s of %s), retrying in %.2f seconds",
+                attempts, self.retry_policy.retries, delay)
+            sleep_lib.sleep(delay)
+
+    def close(self):
+        """Close the pooled connections held by this client."""
+        self.http_session.close()
+        if self.metrics is not None:
+            self.metrics.flush()
 
     def get(self, url, **kwargs):
         return self._cs_request(url, 'GET', **kwargs)
@@ -253,6 +336,7 @@ class HTTPClient(TroveClientMixin):
 
                 if extract_token:
                     self.auth_token = self.service_catalog.get_token()
+                    self.auth_token_expires = _token_expiry(body)
 
                 management_url = self.service_catalog.url_for(
                     attr='region',
@@ -298,7 +382,42 @@ class HTTPClient(TroveClientMixin):
         return self._extract_service_catalog(url, resp, body,
                                              extract_token=False)
 
+    def _token_cache_key(self):
+        auth_plugin = self.auth_plugin
+        if auth_plugin is not None:
+            auth_plugin = '%s.%s' % (type(auth_plugin).__module__,
+                                     type(auth_plugin).__name__)
+        return self.token_cache.make_key(
+            self.auth_url, self.user, self.projectid, self.tenant_id,
+            self.region_name, self.endpoint_type, self.service_type,
+            self.service_name, self.database_service_name, self.bypass_url,
+            self.auth_system, auth_plugin,
+            self.token_cache.hash_secret(self.password))
+
     def authenticate(self):
+        """Get a token and the database endpoint.
+
+        With a ``token_cache``, a token cached by an earlier client with the
+        same credentials is reused until shortly before it expires, and new
+        tokens are added to the cache.
+        """
+        use_cache = self.token_cache is not None and not self.proxy_token
+        if use_cache:
+            entry = self.token_cache.get(self._token_cache_key())
+            if entry:
+                self.auth_token = entry['token']
+                self.auth_token_expires = entry['expires']
+                self.management_url = entry['management_url']
+                return
+
+        self.auth_token_expires = None
+        self._authenticate_with_auth_service()
+
+        if use_cache and self.auth_token_expires and self.management_url:
+            self.token_cache.set(self._token_cache_key(), self.auth_token,
+                                 self.auth_token_expires, self.management_url)
+
+    def _authenticate_with_auth_service(self):
         magic_tuple = urlparse.urlsplit(self.auth_url)
         scheme, netloc, path, query, frag = magic_tuple
         port = magic_tuple.port
@@ -407,6 +526,11 @@ class SessionClient(adapter.LegacyJsonAdapter, TroveClientMixin):
 
     def __init__(self, session, auth, **kwargs):
         self.database_service_name = kwargs.pop('database_service_name', None)
+        self.response_cache = kwargs.pop('response_cache', None)
+        self.retry_policy = kwargs.pop('retry_policy', None)
+        self.circuit_breaker = kwargs.pop('circuit_breaker', None)
+        self.compression_threshold = kwargs.pop('compression_threshold', None)
+        self.metrics = kwargs.pop('metrics', None)
 
         super(SessionClient, self).__init__(session=session,
                                             auth=auth,
@@ -423,16 +547,90 @@ class SessionClient(adapter.LegacyJsonAdapter, TroveClientMixin):
 
     def request(self, url, method, **kwargs):
         raise_exc = kwargs.pop('raise_exc', True)
-        resp, body = super(SessionClient, self).request(url,
-                                                        method,
-                                                        raise_exc=False,
-                                                        **kwargs)
+        cache = kwargs.pop('cache', False) and self.response_cache
+        # NOTE: keystoneauth decodes the whole response, so listings are
+        # not streamed.
+        kwargs.pop('stream_key', None)
+        headers = kwargs.setdefault('headers', {})
+        headers['Accept-Encoding'] = ACCEPT_ENCODING
+        if 'body' in kwargs:
+            headers['Content-Type'] = 'application/json'
+            kwargs['data'] = _compress_body(
+                headers, jsonutils.dumps(kwargs.pop('body')),
+                self.compression_threshold)
+
+        def send():
+            return self._request_with_retries(url, method, **kwargs)
+
+        if cache and method == 'GET':
+            key = '%s %s' % (self.get_project_id(), self.management_url + url)
+            resp = cache.request(key, kwargs.setdefault('headers', {}),
+                                 lambda: send()[0])
+            body = _json_body(resp)
+        else:
+            try:
+                resp, body = send()
+            finally:
+                _clear_response_cache(self.response_cache, method)
 
         if raise_exc and resp.status_code >= 400:
             raise exceptions.from_response(resp, body, url)
 
         return resp, body
 
+    def _request_with_retries(self, url, method, **kwargs):
+        """Send a request, retrying it as told by ``retry_policy``.
+
+        keystoneauth handles the connection retries and reauthentication;
+        the policy only applies to the error statuses of the API.
+        """
+        policy = self.retry_policy
+        if policy is not None:
+            policy.record_request()
+        attempts = 0
+        started = time.monotonic()
+        with self._measure(method, url) as measurement:
+            while True:
+                attempts += 1
+                measurement.attempts = attempts
+                with tracing.trace('troveclient-request', method=method,
+                                   url=url, attempt=attempts):
+                    resp, body = self._send(url, method, **kwargs)
+                measurement.response = resp
+                if policy is None or resp.status_code < 400:
+                    return resp, body
+                delay = policy.get_delay(
+                    attempts, method,
+                    exceptions.from_response(resp, body, url),
+                    time.monotonic() - started)
+                if delay is None:
+                    return resp, body
+                sleep_lib.sleep(delay)
+
+    def _send(self, url, method, **kwargs):
+        breaker = self.circuit_breaker
+        if breaker is None:
+            return super(SessionClient, self).request(url, method,
+                                                      raise_exc=False,
+                                                      **kwargs)
+        breaker.before_request(self.management_url)
+        try:
+            resp, body = super(SessionClient, self).request(url, method,
+                                                            raise_exc=False,
+                                                            **kwargs)
+        except Exception as e:
+            breaker.record(self.management_url, breaker.is_failure(e))
+            raise
+        breaker.record(self.management_url,
+                       breaker.is_failure_status(resp.status_code))
+        return resp, body
+
+    def close(self):
+        # NOTE: The keystoneauth session is owned by the caller, who is
+        # responsible for closing it.
+        if self.metrics is not None:
+            self.metrics.flush()
+
 
 def _construct_http_client(username=None, password=None, project_id=None,
                            auth_url=None, insecure=False, timeout=None,
@@ -444,8 +642,11 @@ def _construct_http_client(username=None, password=None, project_id=None,
                            http_log_debug=False,
                            auth_system='keystone', auth_plugin=None,
                            cacert=None, bypass_url=None, tenant_id=None,
-                           session=None,
-                           **kwargs):
+                           session=None, pool_connections=None,
+                           pool_maxsize=None, response_cache=None,
+                           token_cache=None, retry_policy=None,
+                           circuit_breaker=None, compression_threshold=None,
+                           metrics=None, **kwargs):
     if session:
         try:
             kwargs.setdefault('interface', endpoint_type)
@@ -458,6 +659,11 @@ def _construct_http_client(username=None, password=None, project_id=None,
                              region_name=region_name,
                              database_service_name=database_service_name,
                              connect_retries=retries,
+                             response_cache=response_cache,
+                             retry_policy=retry_policy,
+                             circuit_breaker=circuit_breaker,
+                             compression_threshold=compression_threshold,
+                             metrics=metrics,
                              **kwargs)
     else:
         return HTTPClient(username,
@@ -480,9 +686,55 @@ def _construct_http_client(username=None, password=None, project_id=None,
                           bypass_url=bypass_url,
                           auth_system=auth_system,
                           auth_plugin=auth_plugin,
+                          pool_connections=pool_connections,
+                          pool_maxsize=pool_maxsize,
+                          response_cache=response_cache,
+                          token_cache=token_cache,
+                          retry_policy=retry_policy,
+                          circuit_breaker=circuit_breaker,
+                          compression_threshold=compression_threshold,
+                          metrics=metrics,
                           )
 
 
+def _compress_body(headers, data, threshold):
+    """Gzip a request body of at least ``threshold`` bytes.
+
+    Disabled when ``threshold`` is None, as the API only accepts compressed
+    bodies when deployed behind a proxy or middleware decompressing them.
+    """
+    if threshold is None or len(data) < threshold:
+        return data
+    headers['Content-Encoding'] = 'gzip'
+    return gzip.compress(data, compresslevel=6)
+
+
+def _token_expiry(body):
+    """Return the expiry timestamp of the token of a v2 auth response."""
+    try:
+        return timeutils.parse_isotime(
+            body['access']['token']['expires']).timestamp()
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+def _clear_response_cache(cache, method):
+    # Any change made through the API may show in the cached listings, so
+    # they are all dropped, whichever manager sent the request.
+    if cache is not None and method not in ('GET', 'HEAD'):
+        cache.clear()
+
+
+def _json_body(resp):
+    """Decode the JSON body of a response, if any."""
+    if not resp.content:
+        return None
+    try:
+        return jsonutils.loads(resp.content)
+    except ValueError:
+        return None
+
+
 def get_version_map():
     return {
         '1.0': 'troveclient.v1.client.Client',
@@ -191,6 +191,8 @@ class TroveHTTPClient(httplib2.Http):
 
     def morph_request(self, kwargs):
         kwargs['headers']['Accept'] = 'application/json'
+        # NOTE: httplib2 decodes compressed responses.
+        kwargs['headers']['Accept-Encoding'] = 'gzip, deflate'
         kwargs['headers']['Content-Type'] = 'application/json'
         if 'body' in kwargs:
             kwargs['body'] = json.dumps(kwargs['body'])
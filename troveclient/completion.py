@@ -0,0 +1,149 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""
+On-disk index of the resource IDs and names offered by bash completion.
+"""
+
+import contextlib
+import hashlib
+import os
+import sqlite3
+
+from troveclient import utils
+
+INDEX_FILENAME = 'completion.db'
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS completion (
+    resource TEXT NOT NULL,
+    cache_type TEXT NOT NULL,
+    value TEXT NOT NULL,
+    obj_id TEXT,
+    PRIMARY KEY (resource, cache_type, value)
+) WITHOUT ROWID
+"""
+
+
+def cache_dir():
+    """Return the completion cache directory of the current user and URL."""
+    base_dir = utils.env('TROVECLIENT_UUID_CACHE_DIR',
+                         default="~/.troveclient")
+
+    # NOTE(sirp): Keep separate UUID caches for each username + endpoint
+    # pair
+    username = utils.env('OS_USERNAME', 'TROVE_USERNAME')
+    url = utils.env('OS_URL', 'NOVA_URL')
+    uniqifier = hashlib.md5(username.encode('utf-8') +
+                            url.encode('utf-8')).hexdigest()
+
+    return os.path.expanduser(os.path.join(base_dir, uniqifier))
+
+
+class CompletionIndex(object):
+    """SQLite store of the completion values of every resource type.
+
+    Values are keyed on ``(resource, cache_type, value)`` so they are never
+    duplicated, and remember the ID of the object they belong to so that
+    deleting the object drops its UUID and human ID alike. Each update runs
+    in a single transaction: readers see either the previous or the new
+    content, and a listing only writes the rows that changed.
+
+    Errors opening or writing the store are ignored, since completion is a
+    convenience that must never make a command fail.
+
+    :param path: file holding the index
+    """
+
+    def __init__(self, path):
+        self.path = path
+
+    @classmethod
+    def default(cls):
+        """Return the index of the current user and URL."""
+        return cls(os.path.join(cache_dir(), INDEX_FILENAME))
+
+    @contextlib.contextmanager
+    def _transaction(self):
+        try:
+            os.makedirs(os.path.dirname(self.path), 0o755)
+        except OSError:
+            # NOTE(kiall): This is typically either permission denied while
+            #              attempting to create the directory, or the directory
+            #              already exists. Either way, don't fail.
+            pass
+        conn = sqlite3.connect(self.path, timeout=5)
+        try:
+            with conn:
+                conn.execute(_SCHEMA)
+                yield conn
+        finally:
+            conn.close()
+
+    def update(self, resource, cache_type, entries, replace=False):
+        """Add ``(value, obj_id)`` entries to a resource's cache.
+
+        :param replace: drop the values of ``resource`` and ``cache_type``
+                        that are not in ``entries``, as after a listing.
+        """
+        entries = dict(entries)
+        if not entries and not replace:
+            return
+        try:
+            with self._transaction() as conn:
+                if replace:
+                    current = set(row[0] for row in conn.execute(
+                        "SELECT value FROM completion "
+                        "WHERE resource = ? AND cache_type = ?",
+                        (resource, cache_type)))
+                    conn.executemany(
+                        "DELETE FROM completion WHERE resource = ? "
+                        "AND cache_type = ? AND value = ?",
+                        [(resource, cache_type, value)
+                         for value in current - set(entries)])
+                conn.executemany(
+                    "INSERT OR REPLACE INTO completion "
+                    "(resource, cache_type, value, obj_id) "
+                    "VALUES (?, ?, ?, ?)",
+                    [(resource, cache_type, value, obj_id)
+                     for value, obj_id in entries.items()])
+        except (sqlite3.Error, OSError):
+            pass
+
+    def remove(self, resource, obj_id):
+        """Drop every value of the ``resource`` object ``obj_id``."""
+        if not os.path.exists(self.path):
+            return
+        try:
+            with self._transaction() as conn:
+                conn.execute(
+                    "DELETE FROM completion WHERE resource = ? "
+                    "AND (obj_id = ? OR value = ?)",
+                    (resource, obj_id, obj_id))
+        except (sqlite3.Error, OSError):
+            pass
+
+    def values(self, resource, cache_type=None):
+        """Return the sorted cached values of ``resource``."""
+        if not os.path.exists(self.path):
+            return []
+        query = "SELECT DISTINCT value FROM completion WHERE resource = ?"
+        params = (resource,)
+        if cache_type:
+            query += " AND cache_type = ?"
+            params += (cache_type,)
+        try:
+            with self._transaction() as conn:
+                return [row[0] for row in conn.execute(
+                    query + " ORDER BY value", params)]
+        except (sqlite3.Error, OSError):
+            return []
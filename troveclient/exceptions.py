@@ -38,3 +38,57 @@ class ResponseFormatError(Exception):
 class GuestLogNotFoundError(Exception):
     """The specified guest log does not exist."""
     pass
+
+
+class WaiterFailed(Exception):
+    """A resource being waited on reached a failed state."""
+
+    def __init__(self, resource_id, status):
+        self.resource_id = resource_id
+        self.status = status
+        super(WaiterFailed, self).__init__(
+            "Resource %s is in %s status." % (resource_id, status))
+
+
+class WaiterTimeout(Exception):
+    """Timed out waiting for resources to reach a target state."""
+
+    def __init__(self, pending, statuses):
+        self.pending = pending
+        self.statuses = statuses
+        super(WaiterTimeout, self).__init__(
+            "Timed out waiting for %s." % ', '.join(
+                "%s (%s)" % (r, statuses.get(r)) for r in pending))
+
+
+class CircuitOpen(ClientException):  # noqa
+    """Requests to an endpoint are stopped after repeated failures."""
+
+    def __init__(self, endpoint, retry_after=0):
+        self.endpoint = endpoint
+        self.retry_after = retry_after
+        super(CircuitOpen, self).__init__(
+            "Too many failed requests to %s, not retrying for %d "
+            "seconds." % (endpoint, retry_after))
+
+
+class CassetteMismatch(Exception):
+    """A replayed request was not recorded in the cassette."""
+
+    def __init__(self, method, url):
+        self.method = method
+        self.url = url
+        super(CassetteMismatch, self).__init__(
+            "No recorded response to %s %s." % (method, url))
+
+
+class LazyLoadError(ClientException):  # noqa
+    """An attribute missing from a resource would have loaded it."""
+
+    def __init__(self, resource, resource_id, attr):
+        self.resource = resource
+        self.resource_id = resource_id
+        self.attr = attr
+        super(LazyLoadError, self).__init__(
+            "Accessing %s of %s %s would load it; hydrate it first."
+            % (attr, resource.lower(), resource_id))
@@ -0,0 +1,149 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""
+JSON encoding and decoding of the API requests and responses.
+
+The fastest JSON library installed is used: orjson, then ujson, then the
+standard library.
+"""
+
+import json
+import re
+
+from oslo_utils import importutils
+
+_BACKENDS = ('orjson', 'ujson', 'json')
+
+_backend = None
+
+
+def set_backend(name=None):
+    """Select the JSON library, or the fastest one installed if not given.
+
+    :raises ImportError: if the library is not installed.
+    """
+    global _backend
+    if name is not None:
+        _backend = importutils.import_module(name)
+        return
+    for name in _BACKENDS:
+        _backend = importutils.try_import(name)
+        if _backend is not None:
+            return
+
+
+def get_backend():
+    """Return the name of the JSON library in use."""
+    return _backend.__name__
+
+
+def dumps(obj):
+    """Encode ``obj`` to UTF-8 encoded JSON."""
+    if _backend is not json:
+        try:
+            data = _backend.dumps(obj)
+        except (TypeError, OverflowError):
+            # NOTE: The fast libraries are stricter than the standard one,
+            # e.g. about non string keys.
+            pass
+        else:
+            return data if isinstance(data, bytes) else data.encode('utf-8')
+    return json.dumps(obj).encode('utf-8')
+
+
+def loads(data):
+    """Decode JSON from bytes, or a string.
+
+    :raises ValueError: if ``data`` is not valid JSON.
+    """
+    if _backend is json and isinstance(data, bytes):
+        # NOTE: The standard library detects the UTF encoding of bytes.
+        return json.loads(data)
+    return _backend.loads(data)
+
+
+set_backend()
+
+
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+_decoder = json.JSONDecoder()
+
+
+class ListStream(object):
+    """Decode the items of a list member of a JSON object one at a time.
+
+    Used for large listings, so that the whole document is never held in
+    memory as Python objects. Iterating over ``stream[key]`` yields the
+    items of the ``key`` member; the other members are decoded on the way
+    and can be read with :meth:`get` once the items are consumed.
+
+    :param data: the JSON document, as bytes or a string
+    :param key: the member holding the list
+    """
+
+    def __init__(self, data, key):
+        if isinstance(data, bytes):
+            data = data.decode('utf-8')
+        self._data = data
+        self.key = key
+        self._members = {}
+        self._items = self._iter_items()
+
+    def __getitem__(self, key):
+        if key != self.key:
+            return self._members[key]
+        return self._items
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def _skip(self, pos):
+        return _WHITESPACE.match(self._data, pos).end()
+
+    def _expect(self, pos, char):
+        pos = self._skip(pos)
+        if self._data[pos:pos + 1] != char:
+            raise json.JSONDecodeError("Expecting '%s'" % char, self._data,
+                                       pos)
+        return self._skip(pos + 1)
+
+    def _decode(self, pos):
+        return _decoder.raw_decode(self._data, pos)
+
+    def _iter_items(self):
+        pos = self._expect(0, '{')
+        found = False
+        while self._data[pos:pos + 1] != '}':
+            if self._members or found:
+                pos = self._expect(pos, ',')
+            name, pos = self._decode(pos)
+            pos = self._expect(pos, ':')
+            if name != self.key:
+                self._members[name], pos = self._decode(pos)
+                pos = self._skip(pos)
+                continue
+
+            found = True
+            pos = self._expect(pos, '[')
+            while self._data[pos:pos + 1] != ']':
+                item, pos = self._decode(pos)
+                yield item
+                pos = self._skip(pos)
+                if self._data[pos:pos + 1] != ']':
+                    pos = self._expect(pos, ',')
+            pos = self._skip(pos + 1)
+        if not found:
+            raise KeyError(self.key)
@@ -0,0 +1,274 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""
+Latency and size metrics of the API requests.
+"""
+
+import bisect
+import collections
+import os
+import re
+import socket
+import tempfile
+import threading
+import time
+from urllib import parse
+
+# Upper bounds, in seconds, of the latency histogram buckets.
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0,
+                   10.0)
+
+# Path segments naming collections and actions rather than resources.
+_LITERALS = frozenset([
+    'accounts', 'action', 'backup_strategies', 'backups', 'clusters',
+    'configuration', 'configurations', 'databases', 'datastore-versions',
+    'datastores', 'detail', 'diagnostics', 'flavors', 'hosts', 'hwinfo',
+    'instances', 'limits', 'log', 'members', 'metadata', 'mgmt', 'modules',
+    'parameters', 'quotas', 'root', 'security-group-rules',
+    'security-groups', 'storage', 'tokens', 'users', 'versions',
+    'volume-types'])
+
+Sample = collections.namedtuple(
+    'Sample', ['method', 'endpoint', 'status', 'elapsed', 'bytes_out',
+               'bytes_in', 'retries'])
+
+
+def endpoint_template(method, url):
+    """Return the endpoint of a request, e.g. ``GET /instances/{id}``.
+
+    The query string and the host are dropped, and the path segments that
+    are not collection or action names are replaced with ``{id}``.
+    """
+    path = parse.urlsplit(url).path
+    segments = [segment if segment in _LITERALS else '{id}'
+                for segment in path.strip('/').split('/') if segment]
+    return '%s /%s' % (method.upper(), '/'.join(segments))
+
+
+class Measurement(object):
+    """Outcome of a request being measured, filled in by the client."""
+
+    def __init__(self):
+        self.attempts = 1
+        self.response = None
+
+
+class RequestMetrics(object):
+    """Aggregate the metrics of the requests made by clients.
+
+    Every request is recorded under its endpoint template, with its
+    latency including retries, the bytes sent and received, its number of
+    retries and its status, 0 when no response was received. Requests are
+    passed to the ``exporters`` as they complete, and :meth:`flush` passes
+    them the aggregated :meth:`snapshot`.
+
+    :param buckets: upper bounds of the latency histogram, in seconds
+    :param exporters: objects with ``export(sample)`` and ``flush(snapshot)``
+                      methods, such as :class:`StatsdExporter` and
+                      :class:`PrometheusExporter`
+    """
+
+    def __init__(self, buckets=DEFAULT_BUCKETS, exporters=()):
+        self.buckets = tuple(sorted(buckets))
+        self.exporters = list(exporters)
+        self._lock = threading.Lock()
+        self._endpoints = {}
+
+    def measure(self, method, url):
+        """Record the request sent in a ``with`` block.
+
+        The block sets the ``response`` and ``attempts`` of the
+        :class:`Measurement` it is given.
+        """
+        return _Measuring(self, method, url)
+
+    def record(self, method, url, status, elapsed, bytes_out=0, bytes_in=0,
+               retries=0):
+        """Record a completed request."""
+        sample = Sample(method.upper(), endpoint_template(method, url),
+                        status or 0, elapsed, bytes_out, bytes_in, retries)
+        with self._lock:
+            stats = self._endpoints.get(sample.endpoint)
+            if stats is None:
+                stats = self._endpoints[sample.endpoint] = {
+                    'count': 0, 'errors': 0, 'retries': 0, 'bytes_out': 0,
+                    'bytes_in': 0, 'latency_sum': 0.0, 'latency_max': 0.0,
+                    'buckets': [0] * (len(self.buckets) + 1),
+                    'statuses': collections.Counter()}
+            stats['count'] += 1
+            if not sample.status or sample.status >= 400:
+                stats['errors'] += 1
+            stats['retries'] += retries
+            stats['bytes_out'] += bytes_out
+            stats['bytes_in'] += bytes_in
+            stats['latency_sum'] += elapsed
+            stats['latency_max'] = max(stats['latency_max'], elapsed)
+            stats['buckets'][bisect.bisect_left(self.buckets, elapsed)] += 1
+            stats['statuses'][sample.status] += 1
+        for exporter in self.exporters:
+            exporter.export(sample)
+        return sample
+
+    def snapshot(self):
+        """Return the metrics aggregated by endpoint template.
+
+        The ``buckets`` of an endpoint map the upper bound of each latency
+        bucket to the number of requests at most that long, the last bound
+        being infinity.
+        """
+        bounds = self.buckets + (float('inf'),)
+        with self._lock:
+            snapshot = {}
+            for endpoint, stats in self._endpoints.items():
+                stats = dict(stats, statuses=dict(stats['statuses']))
+                counts = stats['buckets']
+                stats['buckets'] = collections.OrderedDict(
+                    (bound, sum(counts[:i + 1]))
+                    for i, bound in enumerate(bounds))
+                snapshot[endpoint] = stats
+            return snapshot
+
+    def flush(self):
+        """Pass the current snapshot to the exporters."""
+        snapshot = self.snapshot()
+        for exporter in self.exporters:
+            exporter.flush(snapshot)
+
+    def reset(self):
+        with self._lock:
+            self._endpoints.clear()
+
+
+class _Measuring(object):
+
+    def __init__(self, metrics, method, url):
+        self.metrics = metrics
+        self.method = method
+        self.url = url
+
+    def __enter__(self):
+        self.started = time.monotonic()
+        self.measurement = Measurement()
+        return self.measurement
+
+    def __exit__(self, exc_type, exc, tb):
+        resp = self.measurement.response
+        if resp is None:
+            resp = getattr(exc, 'response', None)
+        status = getattr(resp, 'status_code', None)
+        if status is None:
+            status = getattr(exc, 'http_status', None)
+        # NOTE: Responses served from a cache have no request.
+        sent = getattr(getattr(resp, 'request', None), 'body', None)
+        content = getattr(resp, 'content', None)
+        self.metrics.record(
+            self.method, self.url, status, time.monotonic() - self.started,
+            bytes_out=len(sent) if isinstance(sent, (bytes, str)) else 0,
+            bytes_in=len(content) if isinstance(content, bytes) else 0,
+            retries=max(self.measurement.attempts - 1, 0))
+
+
+def _metric_name(endpoint):
+    return re.sub(r'[^a-zA-Z0-9_]+', '_', endpoint.replace('{id}', 'id')
+                  ).strip('_').lower()
+
+
+class StatsdExporter(object):
+    """Send the metrics of every request to a statsd daemon over UDP.
+
+    For a request to ``GET /instances/{id}`` answered with a 200, sends the
+    ``<prefix>.get_instances_id.latency`` timer and the ``.status.200``,
+    ``.bytes_in``, ``.bytes_out`` and ``.retries`` counters.
+    """
+
+    def __init__(self, host='localhost', port=8125, prefix='troveclient'):
+        self.address = (host, port)
+        self.prefix = prefix
+        self._socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+
+    def export(self, sample):
+        name = '%s.%s' % (self.prefix, _metric_name(sample.endpoint))
+        lines = ['%s.latency:%d|ms' % (name, sample.elapsed * 1000),
+                 '%s.status.%d:1|c' % (name, sample.status),
+                 '%s.bytes_out:%d|c' % (name, sample.bytes_out),
+                 '%s.bytes_in:%d|c' % (name, sample.bytes_in)]
+        if sample.retries:
+            lines.append('%s.retries:%d|c' % (name, sample.retries))
+        try:
+            self._socket.sendto('\n'.join(lines).encode('utf-8'),
+                                self.address)
+        except OSError:
+            # NOTE: Metrics are best effort, they must not fail requests.
+            pass
+
+    def flush(self, snapshot):
+        pass
+
+
+class PrometheusExporter(object):
+    """Write the metrics to a file in the Prometheus text format.
+
+    Meant for the textfile collector of the node exporter. The file is
+    replaced atomically on every :meth:`RequestMetrics.flush`.
+    """
+
+    def __init__(self, path, prefix='troveclient'):
+        self.path = os.path.expanduser(path)
+        self.prefix = prefix
+
+    def export(self, sample):
+        pass
+
+    def format(self, snapshot):
+        """Return ``snapshot`` in the Prometheus text format."""
+        p = self.prefix
+        endpoints = []
+        for endpoint in sorted(snapshot):
+            method, path = endpoint.split(' ', 1)
+            endpoints.append(('method="%s",endpoint="%s"' % (method, path),
+                              snapshot[endpoint]))
+
+        lines = ['# TYPE %s_request_duration_seconds histogram' % p]
+        for labels, stats in endpoints:
+            for bound, count in stats['buckets'].items():
+                le = '+Inf' if bound == float('inf') else repr(bound)
+                lines.append('%s_request_duration_seconds_bucket{%s,le="%s"} '
+                             '%d' % (p, labels, le, count))
+            lines.append('%s_request_duration_seconds_sum{%s} %r'
+                         % (p, labels, stats['latency_sum']))
+            lines.append('%s_request_duration_seconds_count{%s} %d'
+                         % (p, labels, stats['count']))
+
+        lines.append('# TYPE %s_requests_total counter' % p)
+        for labels, stats in endpoints:
+            for status, count in sorted(stats['statuses'].items()):
+                lines.append('%s_requests_total{%s,status="%d"} %d'
+                             % (p, labels, status, count))
+
+        for name in ('retries', 'bytes_out', 'bytes_in'):
+            lines.append('# TYPE %s_request_%s_total counter' % (p, name))
+            for labels, stats in endpoints:
+                lines.append('%s_request_%s_total{%s} %d'
+                             % (p, name, labels, stats[name]))
+        return '\n'.join(lines) + '\n'
+
+    def flush(self, snapshot):
+        directory = os.path.dirname(self.path) or '.'
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+            with os.fdopen(fd, 'w') as f:
+                f.write(self.format(snapshot))
+            os.chmod(tmp_path, 0o644)
+            os.replace(tmp_path, self.path)
+        except OSError:
+            pass
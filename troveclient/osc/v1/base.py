@@ -11,24 +11,151 @@
 #    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 #    See the License for the specific language governing permissions and
 #    limitations under the License.
+import itertools
+
+from cliff import columns as cliff_columns
 from osc_lib.command import command
 from osc_lib import exceptions
 
+from troveclient import exceptions as trove_exceptions
+from troveclient.i18n import _
+from troveclient import table
+from troveclient import utils
+from troveclient import waiters
+
+
+def add_wait_argument(parser):
+    parser.add_argument(
+        '--wait',
+        action='store_true',
+        default=False,
+        help=_('Wait for the operation to complete.')
+    )
+
+
+def wait_for_resources(manager, resources, resource_type, **kwargs):
+    """Wait for resources to be ready, raising CommandError on failure.
+
+    The keyword arguments are passed on to :class:`waiters.Waiter`.
+    Returns a dict mapping each resource ID to its final state.
+    """
+    try:
+        return waiters.wait_for(manager, resources, **kwargs)
+    except (trove_exceptions.WaiterFailed,
+            trove_exceptions.WaiterTimeout) as e:
+        raise exceptions.CommandError(
+            _("Error waiting for %(type)s: %(e)s")
+            % {'type': resource_type, 'e': e})
+
 
 class TroveDeleter(command.Command):
-    def delete_resources(self, ids):
+    def get_parser(self, prog_name):
+        parser = super(TroveDeleter, self).get_parser(prog_name)
+        parser.add_argument(
+            '--parallel',
+            metavar='<N>',
+            type=int,
+            default=1,
+            help=_('Number of delete requests to send concurrently. '
+                   'Default: 1.')
+        )
+        return parser
+
+    def delete_resources(self, ids, parallel=1):
         """Delete one or more resources."""
         failure_flag = False
         success_msg = "Request to delete %s %s has been accepted."
         error_msg = "Unable to delete the specified %s(s)."
 
-        for id in ids:
-            try:
-                self.delete_func(id)
+        for id, error in utils.run_on_many(self.delete_func, ids,
+                                           concurrency=parallel):
+            if error is None:
                 print(success_msg % (self.resource, id))
-            except Exception as e:
+            else:
                 failure_flag = True
-                print(e)
+                print(error)
 
         if failure_flag:
             raise exceptions.CommandError(error_msg % self.resource)
+
+
+class TroveLister(command.Lister):
+    """A Lister whose table can be printed as its rows are produced.
+
+    With ``--stream`` the table formatter prints each row as it is
+    produced, instead of formatting the whole table first. The column
+    widths are those of the first rows, and the rows are only sorted with
+    ``--sort-column``, in bounded memory. The columns are selected and the
+    rows sorted here rather than with the private helpers of
+    ``cliff.display``, which may change with any cliff release.
+    """
+
+    def get_parser(self, prog_name):
+        parser = super(TroveLister, self).get_parser(prog_name)
+        parser.add_argument(
+            '--stream',
+            action='store_true',
+            default=False,
+            help=_('Print the rows as they are received, with the column '
+                   'widths of the first rows (table format only).')
+        )
+        return parser
+
+    def rows(self, parsed_args, rows):
+        """Return the ``rows`` of the listing, lazily when streaming."""
+        if getattr(parsed_args, 'stream', False):
+            return rows
+        return list(rows)
+
+    def produce_output(self, parsed_args, column_names, data):
+        if not (getattr(parsed_args, 'stream', False) and
+                getattr(parsed_args, 'formatter', None) == 'table'):
+            return super(TroveLister, self).produce_output(
+                parsed_args, column_names, data)
+
+        data = iter(data)
+        sort_columns = getattr(parsed_args, 'sort_columns', None)
+        if sort_columns:
+            indexes = [column_names.index(c) for c in sort_columns
+                       if c in column_names]
+            data = table.sort_rows(
+                data,
+                key=lambda row: [(row[i] is None, row[i]) for i in indexes],
+                reverse=getattr(parsed_args, 'sort_direction', None) == 'desc')
+
+        columns = list(column_names)
+        if getattr(parsed_args, 'columns', None):
+            # As cliff, accept e.g. "-c instance_id" for "Instance ID".
+            requested = [_normalize_column(c) for c in parsed_args.columns]
+            columns = [c for c in column_names
+                       if _normalize_column(c) in requested]
+            if not columns:
+                raise ValueError(
+                    _('No recognized column names in %(columns)s. '
+                      'Recognized columns are %(names)s.')
+                    % {'columns': parsed_args.columns,
+                       'names': column_names})
+            selector = [c in columns for c in column_names]
+            data = (itertools.compress(row, selector) for row in data)
+        data = (list(row) for row in data)
+        first = next(data, None)
+        align = None
+        if first is not None:
+            # Numbers are right-aligned, as by the table formatter.
+            align = ['r' if isinstance(cell, (int, float)) else 'l'
+                     for cell in first]
+            data = itertools.chain([first], data)
+        rows = ([_format_cell(cell) for cell in row] for row in data)
+        table.StreamingTable(columns, align=align,
+                             out=self.app.stdout).print_rows(rows)
+        return 0
+
+
+def _normalize_column(name):
+    return name.lower().strip().replace(' ', '_')
+
+
+def _format_cell(cell):
+    if isinstance(cell, cliff_columns.FormattableColumn):
+        cell = cell.human_readable()
+    return str(cell).replace('\r\n', '\n').replace('\r', ' ')
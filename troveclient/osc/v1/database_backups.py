@@ -31,7 +31,7 @@ def set_attributes_for_print_detail(backup):
     return info
 
 
-class ListDatabaseBackups(command.Lister):
+class ListDatabaseBackups(base.TroveLister):
 
     _description = _("List database backups")
     columns = ['ID', 'Instance ID', 'Name', 'Status', 'Parent ID',
@@ -96,31 +96,21 @@ class ListDatabaseBackups(command.Lister):
             instance_id = trove_utils.get_resource_id(instance_mgr,
                                                       instance_id)
 
-        items = database_backups.list(limit=parsed_args.limit,
-                                      datastore=parsed_args.datastore,
-                                      marker=parsed_args.marker,
-                                      instance_id=instance_id,
-                                      all_projects=parsed_args.all_projects,
-                                      project_id=parsed_args.project_id)
+        backups = database_backups.list(limit=parsed_args.limit,
+                                        datastore=parsed_args.datastore,
+                                        marker=parsed_args.marker,
+                                        instance_id=instance_id,
+                                        all_projects=parsed_args.all_projects,
+                                        project_id=parsed_args.project_id,
+                                        all_pages=not parsed_args.limit)
 
-        backups = items
-        while items.next and not parsed_args.limit:
-            items = database_backups.list(
-                marker=items.next,
-                datastore=parsed_args.datastore,
-                instance_id=parsed_args.instance_id,
-                all_projects=parsed_args.all_projects,
-                project_id=parsed_args.project_id
-            )
-            backups += items
+        backups = (osc_utils.get_item_properties(b, self.columns)
+                   for b in backups)
 
-        backups = [osc_utils.get_item_properties(b, self.columns)
-                   for b in backups]
+        return self.columns, self.rows(parsed_args, backups)
 
-        return self.columns, backups
 
-
-class ListDatabaseInstanceBackups(command.Lister):
+class ListDatabaseInstanceBackups(base.TroveLister):
 
     _description = _("Lists available backups for an instance.")
     columns = ['ID', 'Instance ID', 'Name', 'Status', 'Parent ID',
@@ -156,15 +146,12 @@ class ListDatabaseInstanceBackups(command.Lister):
         database_instances = self.app.client_manager.database.instances
         instance = osc_utils.find_resource(database_instances,
                                            parsed_args.instance)
-        items = database_instances.backups(instance, limit=parsed_args.limit,
-                                           marker=parsed_args.marker)
-        backups = items
-        while items.next and not parsed_args.limit:
-            items = database_instances.backups(instance, marker=items.next)
-            backups += items
-        backups = [osc_utils.get_item_properties(b, self.columns)
-                   for b in backups]
-        return self.columns, backups
+        backups = database_instances.backups(
+            instance, limit=parsed_args.limit, marker=parsed_args.marker,
+            all_pages=not parsed_args.limit)
+        backups = (osc_utils.get_item_properties(b, self.columns)
+                   for b in backups)
+        return self.columns, self.rows(parsed_args, backups)
 
 
 class ShowDatabaseBackup(command.ShowOne):
@@ -222,7 +209,7 @@ class DeleteDatabaseBackup(base.TroveDeleter):
 
             ids.append(backup_id)
 
-        self.delete_resources(ids)
+        self.delete_resources(ids, parallel=parsed_args.parallel)
 
 
 class CreateDatabaseBackup(command.ShowOne):
@@ -294,6 +281,7 @@ class CreateDatabaseBackup(command.ShowOne):
                    'It depends on Trove support. '
                    'May conflict with other options.')
         )
+        base.add_wait_argument(parser)
         return parser
 
     def take_action(self, parsed_args):
@@ -325,6 +313,9 @@ class CreateDatabaseBackup(command.ShowOne):
 
         backup = database_backups.create(parsed_args.name, instance_id,
                                          **params)
+        if parsed_args.wait:
+            backup = base.wait_for_resources(
+                database_backups, backup, 'backup')[backup.id]
         backup = set_attributes_for_print_detail(backup)
         return zip(*sorted(backup.items()))
 
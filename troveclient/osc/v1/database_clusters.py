@@ -17,6 +17,7 @@ from osc_lib import exceptions
 from osc_lib import utils
 
 from troveclient.i18n import _
+from troveclient.osc.v1 import base
 from troveclient.v1.shell import _parse_extended_properties
 from troveclient.v1.shell import _parse_instance_options
 from troveclient.v1.shell import EXT_PROPS_HELP
@@ -111,7 +112,7 @@ class ShowDatabaseCluster(command.ShowOne):
         return zip(*sorted(cluster.items()))
 
 
-class DeleteDatabaseCluster(command.Command):
+class DeleteDatabaseCluster(base.TroveDeleter):
 
     _description = _("Deletes a cluster.")
 
@@ -119,21 +120,30 @@ class DeleteDatabaseCluster(command.Command):
         parser = super(DeleteDatabaseCluster, self).get_parser(prog_name)
         parser.add_argument(
             'cluster',
+            nargs='+',
             metavar='<cluster>',
-            help=_('ID or name of the cluster.'),
+            help=_('ID or name of the cluster(s).'),
         )
         return parser
 
     def take_action(self, parsed_args):
         database_clusters = self.app.client_manager.database.clusters
-        try:
-            cluster = utils.find_resource(database_clusters,
-                                          parsed_args.cluster)
-            database_clusters.delete(cluster)
-        except Exception as e:
-            msg = (_("Failed to delete cluster %(cluster)s: %(e)s")
-                   % {'cluster': parsed_args.cluster, 'e': e})
-            raise exceptions.CommandError(msg)
+
+        # Used for batch deletion
+        self.delete_func = database_clusters.delete
+        self.resource = 'database cluster'
+
+        ids = []
+        for cluster_id in parsed_args.cluster:
+            try:
+                cluster = utils.find_resource(database_clusters, cluster_id)
+            except Exception as e:
+                msg = (_("Failed to delete cluster %(cluster)s: %(e)s")
+                       % {'cluster': cluster_id, 'e': e})
+                raise exceptions.CommandError(msg)
+            ids.append(getattr(cluster, 'id', cluster))
+
+        self.delete_resources(ids, parallel=parsed_args.parallel)
 
 
 class CreateDatabaseCluster(command.ShowOne):
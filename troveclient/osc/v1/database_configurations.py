@@ -20,6 +20,7 @@ from oslo_utils import uuidutils
 
 from troveclient import exceptions
 from troveclient.i18n import _
+from troveclient.osc.v1 import base
 
 
 def set_attributes_for_print_detail(configuration):
@@ -182,7 +183,7 @@ class ShowDatabaseConfigurationParameter(command.ShowOne):
         return zip(*sorted(param._info.items()))
 
 
-class DeleteDatabaseConfiguration(command.Command):
+class DeleteDatabaseConfiguration(base.TroveDeleter):
 
     _description = _("Deletes a configuration group.")
 
@@ -190,21 +191,31 @@ class DeleteDatabaseConfiguration(command.Command):
         parser = super(DeleteDatabaseConfiguration, self).get_parser(prog_name)
         parser.add_argument(
             'configuration_group',
+            nargs='+',
             metavar='<configuration_group>',
-            help=_('ID or name of the configuration group'),
+            help=_('ID or name of the configuration group(s)'),
         )
         return parser
 
     def take_action(self, parsed_args):
         db_configurations = self.app.client_manager.database.configurations
-        try:
-            configuration = osc_utils.find_resource(
-                db_configurations, parsed_args.configuration_group)
-            db_configurations.delete(configuration)
-        except Exception as e:
-            msg = (_("Failed to delete configuration %(c_group)s: %(e)s")
-                   % {'c_group': parsed_args.configuration_group, 'e': e})
-            raise exceptions.CommandError(msg)
+
+        # Used for batch deletion
+        self.delete_func = db_configurations.delete
+        self.resource = 'configuration group'
+
+        ids = []
+        for c_group in parsed_args.configuration_group:
+            try:
+                configuration = osc_utils.find_resource(db_configurations,
+                                                        c_group)
+            except Exception as e:
+                msg = (_("Failed to delete configuration %(c_group)s: %(e)s")
+                       % {'c_group': c_group, 'e': e})
+                raise exceptions.CommandError(msg)
+            ids.append(getattr(configuration, 'id', configuration))
+
+        self.delete_resources(ids, parallel=parsed_args.parallel)
 
 
 class CreateDatabaseConfiguration(command.ShowOne):
@@ -22,48 +22,48 @@ from troveclient import exceptions
 from troveclient.i18n import _
 from troveclient.osc.v1 import base
 from troveclient import utils as trove_utils
+from troveclient import waiters
 
 
-def get_instances_info(instances):
-    instances_info = []
+def get_instance_info(instance):
+    # To avoid invoking GET request to trove.
+    instance_info = instance.to_dict()
 
-    for instance in instances:
-        # To avoid invoking GET request to trove.
-        instance_info = instance.to_dict()
+    instance_info['flavor_id'] = instance.flavor['id']
 
-        instance_info['flavor_id'] = instance.flavor['id']
+    instance_info['size'] = '-'
+    if 'volume' in instance_info:
+        instance_info['size'] = instance_info['volume']['size']
 
-        instance_info['size'] = '-'
-        if 'volume' in instance_info:
-            instance_info['size'] = instance_info['volume']['size']
+    instance_info['role'] = ''
+    if 'replica_of' in instance_info:
+        instance_info['role'] = 'replica'
+    if 'replicas' in instance_info:
+        instance_info['role'] = 'primary'
 
-        instance_info['role'] = ''
-        if 'replica_of' in instance_info:
-            instance_info['role'] = 'replica'
-        if 'replicas' in instance_info:
-            instance_info['role'] = 'primary'
+    if 'datastore' in instance_info:
+        if instance.datastore.get('version'):
+            instance_info['datastore_version'] = instance.\
+                datastore['version']
+        instance_info['datastore'] = instance.datastore['type']
 
-        if 'datastore' in instance_info:
-            if instance.datastore.get('version'):
-                instance_info['datastore_version'] = instance.\
-                    datastore['version']
-            instance_info['datastore'] = instance.datastore['type']
+    if 'access' in instance_info:
+        instance_info['public'] = instance_info["access"].get(
+            "is_public", False)
 
-        if 'access' in instance_info:
-            instance_info['public'] = instance_info["access"].get(
-                "is_public", False)
+    if 'addresses' not in instance_info:
+        instance_info['addresses'] = ''
 
-        if 'addresses' not in instance_info:
-            instance_info['addresses'] = ''
+    if 'operating_status' not in instance_info:
+        # In case newer version python-troveclient is talking to older
+        # version trove.
+        instance_info['operating_status'] = ''
 
-        if 'operating_status' not in instance_info:
-            # In case newer version python-troveclient is talking to older
-            # version trove.
-            instance_info['operating_status'] = ''
+    return instance_info
 
-        instances_info.append(instance_info)
 
-    return instances_info
+def get_instances_info(instances):
+    return [get_instance_info(instance) for instance in instances]
 
 
 def set_attributes_for_print_detail(instance):
@@ -105,7 +105,7 @@ def set_attributes_for_print_detail(instance):
     return info
 
 
-class ListDatabaseInstances(command.Lister):
+class ListDatabaseInstances(base.TroveLister):
     _description = _("List database instances")
     columns = ['ID', 'Name', 'Datastore', 'Datastore Version', 'Status',
                'Operating Status', 'Public', 'Addresses', 'Flavor ID',
@@ -170,14 +170,13 @@ class ListDatabaseInstances(command.Lister):
             limit=parsed_args.limit,
             marker=parsed_args.marker,
             include_clustered=parsed_args.include_clustered,
+            all_pages=not parsed_args.limit,
             **extra_params
         )
-        if instances:
-            instances_info = get_instances_info(instances)
-            instances = [osc_utils.get_dict_properties(info, cols)
-                         for info in instances_info]
+        instances = (osc_utils.get_dict_properties(get_instance_info(i), cols)
+                     for i in instances)
 
-        return cols, instances
+        return cols, self.rows(parsed_args, instances)
 
 
 class ShowDatabaseInstance(command.ShowOne):
@@ -241,7 +240,7 @@ class DeleteDatabaseInstance(base.TroveDeleter):
 
             ids.append(instance_id)
 
-        self.delete_resources(ids)
+        self.delete_resources(ids, parallel=parsed_args.parallel)
 
 
 class CreateDatabaseInstance(command.ShowOne):
@@ -387,6 +386,7 @@ class CreateDatabaseInstance(command.ShowOne):
             help="The IP CIDRs that are allowed to access the database "
                  "instance. Repeat for multiple values",
         )
+        base.add_wait_argument(parser)
         return parser
 
     def take_action(self, parsed_args):
@@ -488,6 +488,9 @@ class CreateDatabaseInstance(command.ShowOne):
             region_name=parsed_args.region,
             access=access
         )
+        if parsed_args.wait:
+            instance = base.wait_for_resources(
+                db_instances, instance, 'instance')[instance.id]
         instance = set_attributes_for_print_detail(instance)
         return zip(*sorted(instance.items()))
 
@@ -531,6 +534,7 @@ class ResizeDatabaseInstanceFlavor(command.Command):
             type=str,
             help=_('ID or name of the new flavor.')
         )
+        base.add_wait_argument(parser)
         return parser
 
     def take_action(self, parsed_args):
@@ -545,6 +549,9 @@ class ResizeDatabaseInstanceFlavor(command.Command):
         flavor = osc_utils.find_resource(flavor_mgr, parsed_args.flavor)
 
         instance_mgr.resize_instance(instance_id, flavor.id)
+        if parsed_args.wait:
+            base.wait_for_resources(instance_mgr, instance_id, 'instance',
+                                    leaving=waiters.READY_STATES)
 
 
 class UpgradeDatabaseInstance(command.Command):
@@ -563,6 +570,7 @@ class UpgradeDatabaseInstance(command.Command):
             metavar='<datastore_version>',
             help=_('ID or name of the datastore version.'),
         )
+        base.add_wait_argument(parser)
         return parser
 
     def take_action(self, parsed_args):
@@ -570,6 +578,9 @@ class UpgradeDatabaseInstance(command.Command):
         instance = osc_utils.find_resource(db_instances,
                                            parsed_args.instance)
         db_instances.upgrade(instance, parsed_args.datastore_version)
+        if parsed_args.wait:
+            base.wait_for_resources(db_instances, instance, 'instance',
+                                    leaving=waiters.READY_STATES)
 
 
 class ResizeDatabaseInstanceVolume(command.Command):
@@ -592,6 +603,7 @@ class ResizeDatabaseInstanceVolume(command.Command):
             default=None,
             help=_('New size of the instance disk volume in GB.')
         )
+        base.add_wait_argument(parser)
         return parser
 
     def take_action(self, parsed_args):
@@ -599,6 +611,9 @@ class ResizeDatabaseInstanceVolume(command.Command):
         instance = osc_utils.find_resource(db_instances,
                                            parsed_args.instance)
         db_instances.resize_volume(instance, parsed_args.size)
+        if parsed_args.wait:
+            base.wait_for_resources(db_instances, instance, 'instance',
+                                    leaving=waiters.READY_STATES)
 
 
 class ForceDeleteDatabaseInstance(command.Command):
@@ -662,6 +677,7 @@ class RestartDatabaseInstance(command.Command):
             type=str,
             help=_('ID or name of the instance.')
         )
+        base.add_wait_argument(parser)
         return parser
 
     def take_action(self, parsed_args):
@@ -669,6 +685,9 @@ class RestartDatabaseInstance(command.Command):
         instance = osc_utils.find_resource(db_instances,
                                            parsed_args.instance)
         db_instances.restart(instance)
+        if parsed_args.wait:
+            base.wait_for_resources(db_instances, instance, 'instance',
+                                    leaving=waiters.READY_STATES)
 
 
 class EjectDatabaseInstanceReplicaSource(command.Command):
@@ -156,6 +156,12 @@ class ShowDatabaseInstanceLogContents(command.Command):
             '--lines', default=50, type=int,
             help="The number of log lines can be shown in batch.",
         )
+        parser.add_argument(
+            '--follow',
+            action='store_true',
+            default=False,
+            help=_('Keep displaying new log entries as they are published.')
+        )
 
         return parser
 
@@ -167,9 +173,12 @@ class ShowDatabaseInstanceLogContents(command.Command):
         try:
             log_gen = db_instances.log_generator(instance,
                                                  parsed_args.log_name,
-                                                 lines=parsed_args.lines)
+                                                 lines=parsed_args.lines,
+                                                 follow=parsed_args.follow)
             for log_part in log_gen():
-                print(log_part, end="")
+                print(log_part, end="", flush=parsed_args.follow)
+        except KeyboardInterrupt:
+            pass
         except exceptions.GuestLogNotFoundError:
             print(
                 "ERROR: No published '%(log_name)s' log was found for "
@@ -202,6 +211,14 @@ class SaveDatabaseInstanceLog(command.Command):
             '--file',
             help="Path of file to save log to for instance.",
         )
+        parser.add_argument(
+            '--parallel',
+            metavar='<N>',
+            type=int,
+            default=1,
+            help=_('Number of log parts to download concurrently. '
+                   'Default: 1.')
+        )
 
         return parser
 
@@ -213,7 +230,8 @@ class SaveDatabaseInstanceLog(command.Command):
         try:
             filepath = db_instances.log_save(instance,
                                              parsed_args.log_name,
-                                             filename=parsed_args.file)
+                                             filename=parsed_args.file,
+                                             concurrency=parsed_args.parallel)
             print(_('Log "%(log_name)s" written to %(file_name)s')
                   % {'log_name': parsed_args.log_name,
                      'file_name': filepath})
@@ -86,11 +86,7 @@ class ListDatabaseUsers(command.Lister):
         db_users = manager.users
         instance = utils.find_resource(manager.instances,
                                        parsed_args.instance)
-        items = db_users.list(instance)
-        users = items
-        while (items.next):
-            items = db_users.list(parsed_args.instance, marker=items.next)
-            users += items
+        users = list(db_users.list(instance, all_pages=True))
         for user in users:
             db_names = [db['name'] for db in user.databases]
             user.databases = ', '.join(db_names)
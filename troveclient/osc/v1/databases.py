@@ -77,11 +77,7 @@ class ListDatabases(command.Lister):
         manager = self.app.client_manager.database
         databases = manager.databases
         instance = utils.find_resource(manager.instances, parsed_args.instance)
-        items = databases.list(instance)
-        dbs = items
-        while items.next:
-            items = databases.list(instance, marker=items.next)
-            dbs += items
+        dbs = databases.list(instance, all_pages=True)
         dbs = [utils.get_item_properties(db, self.columns) for db in dbs]
         return self.columns, dbs
 
@@ -0,0 +1,217 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""
+Caches of GET responses for the read-mostly endpoints of the API.
+"""
+
+import collections
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+
+import requests
+
+
+class ResponseCache(object):
+    """Base class of the caches of GET responses.
+
+    A cached response is returned without contacting the server for ``ttl``
+    seconds. After that, a response carrying an ``ETag`` is revalidated
+    with ``If-None-Match`` and reused if the server answers
+    ``304 Not Modified``; other responses are dropped and fetched again.
+    At most ``maxsize`` responses are kept, the least recently used ones
+    being evicted first.
+
+    Only the requests of the managers that opt in, by setting
+    ``cache_responses``, go through the cache.
+
+    :param ttl: number of seconds a response is used without revalidation
+    :param maxsize: maximum number of cached responses
+    """
+
+    def __init__(self, ttl=300, maxsize=256):
+        self.ttl = ttl
+        self.maxsize = maxsize
+
+    def _load(self, key):
+        raise NotImplementedError()
+
+    def _save(self, key, entry):
+        raise NotImplementedError()
+
+    def _delete(self, key):
+        raise NotImplementedError()
+
+    def clear(self):
+        """Drop every cached response."""
+        raise NotImplementedError()
+
+    def request(self, key, headers, send):
+        """Return the response to a GET, from the cache if possible.
+
+        :param key: identifies the request, usually its URL
+        :param headers: headers of the request, updated with
+                        ``If-None-Match`` when revalidating
+        :param send: callable sending the request and returning the
+                     :class:`requests.Response`
+        """
+        entry = self._load(key)
+        now = time.time()
+        if entry is not None:
+            if now - entry['stored'] < self.ttl:
+                return _build_response(entry)
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            else:
+                self._delete(key)
+                entry = None
+
+        resp = send()
+        if resp.status_code == 304 and entry is not None:
+            entry['stored'] = now
+            self._save(key, entry)
+            return _build_response(entry)
+        if resp.status_code == 200:
+            self._save(key, {'stored': now,
+                             'etag': resp.headers.get('ETag'),
+                             'status_code': resp.status_code,
+                             'headers': dict(resp.headers),
+                             'text': resp.text})
+        return resp
+
+
+class MemoryCache(ResponseCache):
+    """Keep responses in memory for the lifetime of the client."""
+
+    def __init__(self, ttl=300, maxsize=256):
+        super(MemoryCache, self).__init__(ttl=ttl, maxsize=maxsize)
+        self._lock = threading.Lock()
+        self._entries = collections.OrderedDict()
+
+    def _load(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                entry = dict(entry)
+            return entry
+
+    def _save(self, key, entry):
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def _delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class FileCache(ResponseCache):
+    """Keep responses in files, to share them between processes.
+
+    Every response is a JSON file only readable by its owner, replaced
+    atomically when updated. The modification time of the files records
+    their last use, for LRU eviction.
+
+    :param directory: where the responses are stored, by default
+                      ``~/.troveclient/response-cache``
+    """
+
+    def __init__(self, directory=None, ttl=300, maxsize=256):
+        super(FileCache, self).__init__(ttl=ttl, maxsize=maxsize)
+        self.directory = os.path.expanduser(
+            directory or os.path.join('~', '.troveclient', 'response-cache'))
+
+    def _path(self, key):
+        name = hashlib.sha256(key.encode('utf-8')).hexdigest()
+        return os.path.join(self.directory, name + '.json')
+
+    def _load(self, key):
+        path = self._path(key)
+        try:
+            with open(path) as f:
+                entry = json.load(f)
+            os.utime(path)
+        except (OSError, ValueError):
+            return None
+        return entry
+
+    def _save(self, key, entry):
+        try:
+            os.makedirs(self.directory, 0o700, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory,
+                                            suffix='.tmp')
+            with os.fdopen(fd, 'w') as f:
+                json.dump(entry, f)
+            os.replace(tmp_path, self._path(key))
+        except OSError:
+            # NOTE: Caching is an optimisation, failing to write the cache
+            # must not fail the request.
+            return
+        self._evict()
+
+    def _entries(self):
+        try:
+            names = os.listdir(self.directory)
+        except OSError:
+            return []
+        return [os.path.join(self.directory, name) for name in names
+                if name.endswith('.json')]
+
+    def _evict(self):
+        paths = self._entries()
+        if len(paths) <= self.maxsize:
+            return
+
+        def last_used(path):
+            try:
+                return os.path.getmtime(path)
+            except OSError:
+                return 0
+
+        paths.sort(key=last_used)
+        for path in paths[:len(paths) - self.maxsize]:
+            self._remove(path)
+
+    @staticmethod
+    def _remove(path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def _delete(self, key):
+        self._remove(self._path(key))
+
+    def clear(self):
+        for path in self._entries():
+            self._remove(path)
+
+
+def _build_response(entry):
+    """Rebuild a :class:`requests.Response` from a cache entry."""
+    resp = requests.Response()
+    resp.status_code = entry['status_code']
+    resp.headers.update(entry['headers'])
+    resp.encoding = 'utf-8'
+    resp._content = entry['text'].encode('utf-8')
+    return resp
@@ -0,0 +1,165 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""
+Policies deciding when and how failed API requests are retried.
+"""
+
+import email.utils
+import random
+import threading
+import time
+
+IDEMPOTENT_METHODS = frozenset(['GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE'])
+RETRY_STATUSES = frozenset([413, 429, 500, 502, 503, 504])
+# Statuses whose Retry-After header tells when to try again.
+RETRY_AFTER_STATUSES = frozenset([413, 429, 503])
+
+
+class RetryBudget(object):
+    """Limit retries to a fraction of the requests made.
+
+    Every request deposits ``ratio`` tokens and every retry withdraws one,
+    so that when the API fails most requests, clients stop multiplying the
+    load with retries. ``min_per_second`` tokens are added every second so
+    that a client making few requests can still retry. At most
+    ``max_tokens`` tokens are kept.
+
+    A single budget, :data:`DEFAULT_BUDGET`, is shared by default by every
+    client of the process.
+    """
+
+    def __init__(self, ratio=0.2, min_per_second=1.0, max_tokens=10.0):
+        self.ratio = ratio
+        self.min_per_second = min_per_second
+        self.max_tokens = max_tokens
+        self._tokens = max_tokens
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, amount):
+        now = time.monotonic()
+        amount += (now - self._updated) * self.min_per_second
+        self._updated = now
+        self._tokens = min(self.max_tokens, self._tokens + amount)
+
+    def deposit(self):
+        """Record a request."""
+        with self._lock:
+            self._refill(self.ratio)
+
+    def withdraw(self):
+        """Take the token needed for a retry.
+
+        :returns: False if the budget is exhausted.
+        """
+        with self._lock:
+            self._refill(0)
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            return True
+
+
+DEFAULT_BUDGET = RetryBudget()
+
+
+class RetryPolicy(object):
+    """Decide whether a failed request is retried, and after how long.
+
+    A request is retried at most ``retries`` times if its method is one of
+    ``methods`` and it failed with one of ``statuses``. The n-th retry waits
+    a random time between 0 and ``backoff * 2 ** (n - 1)`` seconds, capped
+    to ``max_backoff`` (full jitter), or exactly that bound if ``jitter``
+    is False. A ``Retry-After`` header sent with 413, 429 and 503 responses
+    sets the minimum wait. No retry is made once ``max_elapsed`` seconds
+    would be exceeded, or when ``budget`` is exhausted.
+
+    :param retries: maximum number of retries of a request
+    :param statuses: HTTP statuses that are retried
+    :param methods: HTTP methods that are retried, by default the
+                    idempotent ones
+    :param backoff: base wait, in seconds
+    :param max_backoff: maximum wait between two attempts, in seconds
+    :param max_elapsed: give up retrying after this many seconds since the
+                        first attempt, or never if None
+    :param jitter: randomise the waits
+    :param budget: the :class:`RetryBudget` retries are taken from, or None
+                   for no limit
+    """
+
+    def __init__(self, retries=3, statuses=RETRY_STATUSES,
+                 methods=IDEMPOTENT_METHODS, backoff=1.0, max_backoff=30.0,
+                 max_elapsed=None, jitter=True, budget=DEFAULT_BUDGET):
+        self.retries = retries
+        self.statuses = frozenset(statuses)
+        self.methods = frozenset(m.upper() for m in methods)
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.max_elapsed = max_elapsed
+        self.jitter = jitter
+        self.budget = budget
+
+    def record_request(self):
+        """Account for a new request in the retry budget."""
+        if self.budget is not None:
+            self.budget.deposit()
+
+    def get_delay(self, attempt, method, error, elapsed):
+        """Return how long to wait before retrying a failed request.
+
+        :param attempt: number of attempts made so far
+        :param method: HTTP method of the request
+        :param error: the :class:`exceptions.HttpError` it failed with
+        :param elapsed: seconds since the first attempt
+        :returns: the delay in seconds, or None to give up.
+        """
+        status = getattr(error, 'http_status', None)
+        if (attempt > self.retries or method.upper() not in self.methods or
+                status not in self.statuses):
+            return None
+
+        delay = min(self.max_backoff, self.backoff * 2 ** (attempt - 1))
+        if self.jitter:
+            delay = random.uniform(0, delay)
+        if status in RETRY_AFTER_STATUSES:
+            retry_after = get_retry_after(error)
+            if retry_after is not None:
+                delay = max(delay, retry_after)
+
+        if self.max_elapsed is not None and (
+                elapsed + delay > self.max_elapsed):
+            return None
+        if self.budget is not None and not self.budget.withdraw():
+            return None
+        return delay
+
+
+def get_retry_after(error):
+    """Return the seconds to wait given by the Retry-After of an error.
+
+    The header holds either a number of seconds or an HTTP date.
+    """
+    response = getattr(error, 'response', None)
+    headers = getattr(response, 'headers', None) or {}
+    value = headers.get('Retry-After')
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        date = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, date.timestamp() - time.time())
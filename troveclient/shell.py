@@ -33,6 +33,7 @@ from keystoneauth1.identity.generic import token
 from keystoneauth1 import loading
 from oslo_utils import encodeutils
 from oslo_utils import importutils
+from oslo_utils import strutils
 import stevedore
 
 
@@ -180,6 +181,56 @@ class OpenStackTroveShell(object):
                             default=0,
                             help=_('Number of retries.'))
 
+        parser.add_argument('--response-cache-ttl',
+                            metavar='<seconds>',
+                            type=int,
+                            default=utils.env('TROVE_RESPONSE_CACHE_TTL',
+                                              default=0),
+                            help=_('Cache the flavor, volume type, datastore '
+                                   'and configuration parameter listings on '
+                                   'disk for this many seconds, then '
+                                   'revalidate them. Defaults to '
+                                   'env[TROVE_RESPONSE_CACHE_TTL], or 0 to '
+                                   'disable the cache.'))
+
+        parser.add_argument('--token-cache',
+                            action='store_true',
+                            default=strutils.bool_from_string(
+                                utils.env('TROVE_TOKEN_CACHE')),
+                            help=_('Reuse the token and endpoint of earlier '
+                                   'commands until the token expires, when '
+                                   'not authenticating with a keystone '
+                                   'session. Defaults to '
+                                   'env[TROVE_TOKEN_CACHE].'))
+
+        parser.add_argument('--circuit-breaker-threshold',
+                            metavar='<failures>',
+                            type=int,
+                            default=utils.env(
+                                'TROVE_CIRCUIT_BREAKER_THRESHOLD', default=0),
+                            help=_('Stop sending requests to the database '
+                                   'service for a while after this many '
+                                   'consecutive connection failures, '
+                                   'timeouts or server errors. Defaults to '
+                                   'env[TROVE_CIRCUIT_BREAKER_THRESHOLD] or '
+                                   '0, which disables it.'))
+
+        parser.add_argument('--metrics-file',
+                            metavar='<path>',
+                            default=utils.env('TROVE_METRICS_FILE'),
+                            help=_('Write the latency, size and retries of '
+                                   'the API requests to this file in the '
+                                   'Prometheus text format. Defaults to '
+                                   'env[TROVE_METRICS_FILE].'))
+
+        parser.add_argument('--statsd-host',
+                            metavar='<host>',
+                            default=utils.env('TROVE_STATSD_HOST'),
+                            help=_('Send the metrics of the API requests to '
+                                   'the statsd daemon on this host, port '
+                                   '8125. Defaults to '
+                                   'env[TROVE_STATSD_HOST].'))
+
         parser.add_argument('--json', '--os-json-output',
                             dest='json',
                             action='store_true',
@@ -188,6 +239,37 @@ class OpenStackTroveShell(object):
                             help=_('Output JSON instead of prettyprint. '
                                    'Defaults to env[OS_JSON_OUTPUT].'))
 
+        parser.add_argument('--stream',
+                            action='store_true',
+                            default=utils.env('TROVE_STREAM_OUTPUT',
+                                              default=False),
+                            help=_('Print the rows of the lists as they '
+                                   'are received, with the column widths '
+                                   'of the first rows. Lists are then only '
+                                   'sorted on an explicit order. Defaults '
+                                   'to env[TROVE_STREAM_OUTPUT].'))
+
+        parser.add_argument('--format',
+                            dest='output_format',
+                            metavar='<format>',
+                            choices=['table', 'json', 'jsonl', 'csv'],
+                            default=utils.env('TROVE_OUTPUT_FORMAT',
+                                              default='table'),
+                            help=_('Output format, one of table, json, '
+                                   'jsonl or csv. jsonl and csv write one '
+                                   'record per line as the resources are '
+                                   'received. Defaults to '
+                                   'env[TROVE_OUTPUT_FORMAT] or table.'))
+
+        parser.add_argument('--fields',
+                            metavar='<field,field,...>',
+                            type=lambda fields: [
+                                field.strip() for field in fields.split(',')
+                                if field.strip()],
+                            default=None,
+                            help=_('Comma separated fields of the records '
+                                   'output as json, jsonl or csv.'))
+
         if osprofiler_profiler:
             parser.add_argument('--profile',
                                 metavar='HMAC_KEY',
@@ -334,6 +416,9 @@ class OpenStackTroveShell(object):
             'bash_completion',
             add_help=False,
             formatter_class=OpenStackHelpFormatter)
+        subparser.add_argument(
+            'resource', metavar='<resource>', nargs='?',
+            help=_('Print the cached IDs and names of this resource type.'))
 
         self.subcommands['bash_completion'] = subparser
         subparser.set_defaults(func=self.do_bash_completion)
@@ -517,6 +602,41 @@ class OpenStackTroveShell(object):
         if profile:
             osprofiler_profiler.init(options.profile)
 
+        # NOTE: The modules of the optional features are only imported
+        # when they are enabled, to keep the startup of every command short.
+        response_cache = None
+        if options.response_cache_ttl:
+            from troveclient import response_cache as response_cache_lib
+
+            response_cache = response_cache_lib.FileCache(
+                ttl=options.response_cache_ttl)
+
+        token_cache = None
+        if options.token_cache:
+            from troveclient import token_cache as token_cache_lib
+
+            token_cache = token_cache_lib.TokenCache()
+
+        metrics = None
+        if options.metrics_file or options.statsd_host:
+            from troveclient import metrics as metrics_lib
+
+            exporters = []
+            if options.metrics_file:
+                exporters.append(metrics_lib.PrometheusExporter(
+                    options.metrics_file))
+            if options.statsd_host:
+                exporters.append(metrics_lib.StatsdExporter(
+                    options.statsd_host))
+            metrics = metrics_lib.RequestMetrics(exporters=exporters)
+
+        circuit_breaker = None
+        if options.circuit_breaker_threshold:
+            from troveclient import circuit_breaker as circuit_breaker_lib
+
+            circuit_breaker = circuit_breaker_lib.CircuitBreaker(
+                failure_threshold=options.circuit_breaker_threshold)
+
         self.cs = client.Client(options.os_database_api_version, os_username,
                                 os_password, os_project_name, os_auth_url,
                                 insecure, region_name=os_region_name,
@@ -533,7 +653,11 @@ class OpenStackTroveShell(object):
                                 auth_system=os_auth_system,
                                 auth_plugin=auth_plugin,
                                 session=ks_session,
-                                auth=keystone_auth)
+                                auth=keystone_auth,
+                                response_cache=response_cache,
+                                token_cache=token_cache,
+                                circuit_breaker=circuit_breaker,
+                                metrics=metrics)
 
         try:
             if not utils.isunauthenticated(args.func):
@@ -559,14 +683,19 @@ class OpenStackTroveShell(object):
             raise exc.UnsupportedVersion(msg)
 
         # Override printing to json output
-        if args.json:
+        if args.json or args.output_format == 'json':
             utils.json_output = True
         else:
             utils.json_output = False
+        utils.stream_output = bool(args.stream)
+        utils.output_format = args.output_format
+        utils.output_fields = args.fields
 
         try:
             args.func(self.cs, args)
         finally:
+            if metrics is not None:
+                metrics.flush()
             if profile:
                 trace_id = osprofiler_profiler.get().get_base_id()
                 print(_("Trace ID: %(trace_id)s") % {'trace_id': trace_id})
@@ -584,7 +713,18 @@ class OpenStackTroveShell(object):
 
         Prints all of the commands and options to stdout so that the
         trove.bash_completion script doesn't have to hard code them.
+
+        Given a resource type such as ``instance``, prints the UUIDs and
+        human IDs of that type found in the completion cache instead,
+        without calling the API.
         """
+        if getattr(args, 'resource', None):
+            from troveclient import completion
+
+            print(' '.join(completion.CompletionIndex.default().values(
+                args.resource.lower())))
+            return
+
         commands = set()
         options = set()
         for sc_str, sc in list(self.subcommands.items()):
@@ -0,0 +1,133 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""
+Tables printed row by row, as the rows are produced.
+
+The tables look like those of prettytable, but the column widths are set
+up front, either given or measured on the first rows, so that each row is
+printed as soon as it is produced. A cell wider than its column is printed
+whole, pushing the rest of its row to the right.
+"""
+
+import heapq
+import itertools
+import pickle
+import sys
+import tempfile
+
+# Number of rows the column widths are measured on.
+SAMPLE_SIZE = 100
+# Number of rows sorted in memory; longer tables are sorted in runs of this
+# many rows spilled to temporary files, then merged.
+SORT_BUFFER_SIZE = 10000
+
+
+class StreamingTable(object):
+    """Print a table with one row per line as the rows are produced.
+
+    :param labels: the column headers
+    :param align: the alignment of each column, ``l`` or ``r``; left by
+                  default
+    :param widths: the width of each column; if not given, the widths are
+                   measured on the first ``sample_size`` rows
+    :param out: the file the table is written to, stdout by default
+    """
+
+    def __init__(self, labels, align=None, widths=None,
+                 sample_size=SAMPLE_SIZE, out=None):
+        self.labels = list(labels)
+        self.align = list(align or ['l'] * len(self.labels))
+        self.widths = widths
+        self.sample_size = sample_size
+        self.out = out
+
+    def print_rows(self, rows):
+        """Print the table of ``rows``, sequences of strings."""
+        out = self.out or sys.stdout
+        rows = iter(rows)
+        sample = []
+        if self.widths is None:
+            sample = list(itertools.islice(rows, self.sample_size))
+            widths = [0] * len(self.labels)
+        else:
+            widths = list(self.widths)
+        for row in [self.labels] + sample:
+            for i, cell in enumerate(row):
+                widths[i] = max(widths[i], *_cell_widths(cell))
+
+        border = '+%s+' % '+'.join('-' * (width + 2) for width in widths)
+        out.write(border + '\n')
+        out.write(self._format(self.labels, widths, self.align))
+        out.write(border + '\n')
+        for row in itertools.chain(sample, rows):
+            out.write(self._format(row, widths, self.align))
+        out.write(border + '\n')
+
+    @staticmethod
+    def _format(row, widths, align):
+        cells = [str(cell).split('\n') for cell in row]
+        lines = []
+        for n in range(max(len(cell) for cell in cells)):
+            line = []
+            for cell, width, how in zip(cells, widths, align):
+                text = cell[n] if n < len(cell) else ''
+                line.append(' %s ' % _justify(text, width, how))
+            lines.append('|%s|\n' % '|'.join(line))
+        return ''.join(lines)
+
+
+def _cell_widths(cell):
+    return [len(line) for line in str(cell).split('\n')]
+
+
+def _justify(text, width, how):
+    if how == 'r':
+        return text.rjust(width)
+    return text.ljust(width)
+
+
+def sort_rows(rows, key=None, reverse=False, buffer_size=SORT_BUFFER_SIZE):
+    """Yield ``rows`` sorted, holding at most ``buffer_size`` in memory.
+
+    The rows are sorted in runs of ``buffer_size``, and when there are more
+    the runs are pickled to temporary files and merged. The sort is stable.
+    """
+    rows = iter(rows)
+    runs = []
+    try:
+        while True:
+            run = list(itertools.islice(rows, buffer_size))
+            run.sort(key=key, reverse=reverse)
+            if len(run) < buffer_size:
+                break
+            spool = tempfile.TemporaryFile()
+            runs.append(spool)
+            for row in run:
+                pickle.dump(row, spool, pickle.HIGHEST_PROTOCOL)
+            spool.seek(0)
+        if not runs:
+            yield from run
+            return
+        yield from heapq.merge(*([_unpickle(spool) for spool in runs] +
+                                 [run]), key=key, reverse=reverse)
+    finally:
+        for spool in runs:
+            spool.close()
+
+
+def _unpickle(spool):
+    while True:
+        try:
+            yield pickle.load(spool)
+        except EOFError:
+            return
@@ -19,6 +19,7 @@ from oslo_utils import uuidutils
 from troveclient import common
 from troveclient.osc.v1 import database_backups
 from troveclient.tests.osc.v1 import fakes
+from troveclient.v1 import backups
 
 
 class TestBackups(fakes.TestDatabasev1):
@@ -53,7 +54,8 @@ class TestBackupList(TestBackups):
             'marker': None,
             'instance_id': None,
             'all_projects': False,
-            'project_id': None
+            'project_id': None,
+            'all_pages': True
         }
 
         self.backup_client.list.assert_called_once_with(**params)
@@ -74,7 +76,8 @@ class TestBackupList(TestBackups):
             'marker': None,
             'instance_id': 'fake_uuid',
             'all_projects': False,
-            'project_id': None
+            'project_id': None,
+            'all_pages': True
         }
 
         self.backup_client.list.assert_called_once_with(**params)
@@ -93,7 +96,8 @@ class TestBackupList(TestBackups):
             'marker': None,
             'instance_id': 'fake_uuid',
             'all_projects': False,
-            'project_id': None
+            'project_id': None,
+            'all_pages': True
         }
 
         self.backup_client.list.assert_called_once_with(**params)
@@ -110,7 +114,8 @@ class TestBackupList(TestBackups):
             'marker': None,
             'instance_id': None,
             'all_projects': True,
-            'project_id': None
+            'project_id': None,
+            'all_pages': True
         }
 
         self.backup_client.list.assert_called_once_with(**params)
@@ -126,17 +131,32 @@ class TestBackupList(TestBackups):
             'marker': None,
             'instance_id': None,
             'all_projects': False,
-            'project_id': 'fake_id'
+            'project_id': 'fake_id',
+            'all_pages': True
         }
 
         self.backup_client.list.assert_called_once_with(**params)
 
+    def test_backup_list_stream(self):
+        parsed_args = self.check_parser(
+            self.cmd, ['--stream', '--sort-column', 'Name', '-c', 'ID',
+                       '-c', 'Name', '-c', 'Parent ID'],
+            [('stream', True)])
+        self.cmd.run(parsed_args)
+        self.assertEqual('+---------+-------+-----------+\n'
+                         '| ID      | Name  | Parent ID |\n'
+                         '+---------+-------+-----------+\n'
+                         '| bk-1234 | bkp_1 | None      |\n'
+                         '+---------+-------+-----------+\n',
+                         self.app.stdout.make_string())
+
 
 class TestBackupListInstance(TestBackups):
 
     defaults = {
         'limit': None,
-        'marker': None
+        'marker': None,
+        'all_pages': True
     }
 
     columns = database_backups.ListDatabaseInstanceBackups.columns
@@ -277,6 +297,19 @@ class TestBackupCreate(TestBackups):
         self.assertEqual(self.columns, columns)
         self.assertEqual(self.values, data)
 
+    @mock.patch('time.sleep')
+    def test_backup_create_wait(self, mock_sleep):
+        building = backups.Backup(None, dict(self.data._info,
+                                             status='BUILDING'))
+        self.backup_client.get.side_effect = [building, self.data]
+        args = ['bk-1234', '--instance', self.random_uuid(), '--wait']
+        parsed_args = self.check_parser(self.cmd, args, [('wait', True)])
+        columns, data = self.cmd.take_action(parsed_args)
+        self.backup_client.get.assert_called_with('bk-1234')
+        self.assertEqual(2, self.backup_client.get.call_count)
+        self.assertEqual(self.columns, columns)
+        self.assertEqual(self.values, data)
+
     @mock.patch('troveclient.utils.get_resource_id_by_name')
     def test_backup_create(self, mock_find):
         args = ['bk-1234-1', '--instance', '1234']
@@ -100,6 +100,15 @@ class TestDatabaseClusterDelete(TestClusters):
         self.cluster_client.delete.assert_called_with('cluster1')
         self.assertIsNone(result)
 
+    @mock.patch.object(utils, 'find_resource')
+    def test_cluster_bulk_delete(self, mock_find):
+        mock_find.side_effect = ['cluster1', 'cluster2']
+        args = ['cluster1', 'cluster2', '--parallel', '2']
+        parsed_args = self.check_parser(self.cmd, args, [])
+        self.cmd.take_action(parsed_args)
+        self.cluster_client.delete.assert_has_calls(
+            [mock.call('cluster1'), mock.call('cluster2')], any_order=True)
+
     @mock.patch.object(utils, 'find_resource')
     def test_cluster_delete_with_exception(self, mock_find):
         args = ['fakecluster']
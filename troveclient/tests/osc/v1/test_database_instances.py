@@ -12,6 +12,7 @@
 
 from unittest import mock
 
+from osc_lib import exceptions as osc_exceptions
 from osc_lib import utils
 from oslo_utils import uuidutils
 
@@ -35,7 +36,8 @@ class TestInstanceList(TestInstances):
     defaults = {
         'include_clustered': False,
         'limit': None,
-        'marker': None
+        'marker': None,
+        'all_pages': True
     }
 
     def setUp(self):
@@ -186,10 +188,38 @@ class TestInstanceList(TestInstances):
             'include_clustered': False,
             'limit': None,
             'marker': None,
+            'all_pages': True,
             'project_id': tenant_id
         }
         self.mgmt_client.list.assert_called_once_with(**expected_params)
 
+    def test_instance_list_stream(self):
+        insts = [{'id': 'i-%d' % n, 'name': 'db%d' % n, 'status': 'ACTIVE',
+                  'flavor': {'id': '02'}} for n in (2, 1)]
+        listed = []
+
+        def list_instances(**kwargs):
+            for inst in insts:
+                listed.append(inst['id'])
+                yield instances.Instance(mock.MagicMock(), inst)
+
+        self.instance_client.list.side_effect = list_instances
+        parsed_args = self.check_parser(
+            self.cmd, ['--stream', '-c', 'id', '-c', 'Name',
+                       '--sort-column', 'Name'],
+            [('stream', True)])
+        columns, data = self.cmd.take_action(parsed_args)
+        # Nothing is fetched before the table is printed.
+        self.assertEqual([], listed)
+        self.cmd.produce_output(parsed_args, columns, data)
+        self.assertEqual('+-----+------+\n'
+                         '| ID  | Name |\n'
+                         '+-----+------+\n'
+                         '| i-1 | db1  |\n'
+                         '| i-2 | db2  |\n'
+                         '+-----+------+\n',
+                         self.app.stdout.make_string())
+
 
 class TestInstanceShow(TestInstances):
     def setUp(self):
@@ -307,6 +337,19 @@ class TestDatabaseInstanceDelete(TestInstances):
         mock_getid.assert_called_once_with(self.instance_client, "instance1")
         self.instance_client.force_delete.assert_called_with('fake_uuid')
 
+    def test_instance_bulk_delete_parallel(self):
+        instance_1 = uuidutils.generate_uuid()
+        instance_2 = uuidutils.generate_uuid()
+        self.instance_client.delete.side_effect = [
+            None, exceptions.CommandError]
+
+        args = [instance_1, instance_2, '--parallel', '2']
+        parsed_args = self.check_parser(self.cmd, args, [('parallel', 2)])
+        self.assertRaises(osc_exceptions.CommandError,
+                          self.cmd.take_action,
+                          parsed_args)
+        self.assertEqual(2, self.instance_client.delete.call_count)
+
 
 class TestDatabaseInstanceCreate(TestInstances):
 
@@ -631,6 +674,44 @@ class TestDatabaseInstanceRestart(TestInstances):
         self.instance_client.restart.assert_called_with('instance1')
         self.assertIsNone(result)
 
+    @mock.patch('time.sleep')
+    @mock.patch.object(utils, 'find_resource')
+    def test_instance_restart_wait(self, mock_find, mock_sleep):
+        mock_find.return_value = 'instance1'
+        self.instance_client.get.side_effect = [
+            instances.Instance(None, {'id': 'instance1', 'status': s})
+            for s in ('REBOOT', 'ACTIVE')]
+        parsed_args = self.check_parser(self.cmd, ['instance1', '--wait'],
+                                        [('wait', True)])
+        self.cmd.take_action(parsed_args)
+        self.instance_client.restart.assert_called_with('instance1')
+        self.assertEqual(2, self.instance_client.get.call_count)
+        self.assertEqual(1, mock_sleep.call_count)
+
+    @mock.patch('time.sleep')
+    @mock.patch.object(utils, 'find_resource')
+    def test_instance_restart_wait_for_reboot(self, mock_find, mock_sleep):
+        mock_find.return_value = 'instance1'
+        self.instance_client.get.side_effect = [
+            instances.Instance(None, {'id': 'instance1', 'status': s})
+            for s in ('ACTIVE', 'REBOOT', 'ACTIVE')]
+        parsed_args = self.check_parser(self.cmd, ['instance1', '--wait'],
+                                        [('wait', True)])
+        self.cmd.take_action(parsed_args)
+        # The instance is still active when the restart is accepted.
+        self.assertEqual(3, self.instance_client.get.call_count)
+
+    @mock.patch('time.sleep')
+    @mock.patch.object(utils, 'find_resource')
+    def test_instance_restart_wait_error(self, mock_find, mock_sleep):
+        mock_find.return_value = 'instance1'
+        self.instance_client.get.return_value = instances.Instance(
+            None, {'id': 'instance1', 'status': 'ERROR'})
+        parsed_args = self.check_parser(self.cmd, ['instance1', '--wait'],
+                                        [('wait', True)])
+        self.assertRaises(osc_exceptions.CommandError,
+                          self.cmd.take_action, parsed_args)
+
 
 class TestDatabaseInstanceEjectReplicaSource(TestInstances):
 
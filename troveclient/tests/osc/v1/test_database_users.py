@@ -74,7 +74,8 @@ class TestUserList(TestUsers):
         mock_find.return_value = args[0]
         parsed_args = self.check_parser(self.cmd, args, [])
         columns, data = self.cmd.take_action(parsed_args)
-        self.user_client.list.assert_called_once_with(*args)
+        self.user_client.list.assert_called_once_with(*args,
+                                                      all_pages=True)
         self.assertEqual(self.columns, columns)
         self.assertEqual([self.values], data)
 
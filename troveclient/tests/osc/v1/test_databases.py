@@ -77,7 +77,8 @@ class TestDatabaseList(TestDatabases):
         mock_find.return_value = args[0]
         parsed_args = self.check_parser(self.cmd, args, [])
         columns, data = self.cmd.take_action(parsed_args)
-        self.database_client.list.assert_called_once_with(args[0])
+        self.database_client.list.assert_called_once_with(args[0],
+                                                          all_pages=True)
         self.assertEqual(self.columns, columns)
         self.assertEqual([tuple(self.values)], data)
 
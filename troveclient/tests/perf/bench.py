@@ -0,0 +1,343 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Benchmark the client side hot paths against a stub Trove API.
+
+Every case runs in its own process, so that its peak RSS is its own, while
+the stub server runs in this one. For each case prints the throughput, the
+median and 99th percentile of the run times, the peak RSS and the peak of
+the memory allocated by a run::
+
+    python -m troveclient.tests.perf.bench --instances 5000 --repeat 20
+
+``--compact`` runs the cases with compact resources.
+
+With ``--save`` the results are written as JSON, and ``--compare`` exits
+with a non-zero status when a case got slower than in a saved run by more
+than the ``--tolerance``.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import math
+import resource
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+
+from troveclient.tests.perf import stub_server
+
+
+def percentile(timings, percent):
+    """Return the ``percent`` percentile of ``timings``, by nearest rank."""
+    ordered = sorted(timings)
+    rank = int(math.ceil(percent / 100.0 * len(ordered)))
+    return ordered[max(rank, 1) - 1]
+
+
+def peak_rss(who=resource.RUSAGE_SELF):
+    """Return the peak resident set size, in bytes."""
+    maxrss = resource.getrusage(who).ru_maxrss
+    # NOTE: ru_maxrss is in kilobytes, but in bytes on macOS.
+    return maxrss if sys.platform == 'darwin' else maxrss * 1024
+
+
+def _client(url, args):
+    return stub_server.make_client(url, compact_resources=args.compact)
+
+
+def _instances(cs):
+    return list(cs.instances.list(all_pages=True))
+
+
+def case_paginate(url, args):
+    """List every instance, backup and module, page by page."""
+    cs = _client(url, args)
+
+    def run():
+        count = 0
+        for manager in (cs.instances, cs.backups, cs.modules):
+            for _item in manager.list(all_pages=True):
+                count += 1
+        return count
+    return run, 'items'
+
+
+def case_resources(url, args):
+    """Build instances from an already decoded listing."""
+    manager = _client(url, args).instances
+    data = [stub_server.make_instance(i) for i in range(args.instances)]
+
+    def run():
+        resources = [manager.resource_class(manager, info, loaded=True)
+                     for info in data]
+        return len(resources)
+    return run, 'resources'
+
+
+def case_find_resource(url, args):
+    """Find instances by name, as the shell does with its arguments."""
+    from troveclient import utils
+
+    cs = _client(url, args)
+    step = max(args.instances // args.lookups, 1)
+    names = ['instance-%d' % i for i in range(0, args.instances, step)]
+
+    def run():
+        for name in names:
+            utils.find_resource(cs.instances, name)
+        return len(names)
+    return run, 'lookups'
+
+
+def case_print_list(url, args):
+    """Render the instance listing of ``trove list``."""
+    from troveclient import utils
+
+    instances = _instances(_client(url, args))
+    fields = ['id', 'name', 'status', 'flavor', 'volume', 'region']
+
+    def run():
+        with contextlib.redirect_stdout(io.StringIO()):
+            utils.print_list(instances, fields)
+        return len(instances)
+    return run, 'rows'
+
+
+def case_instances_info(url, args):
+    """Prepare the instance listing of ``openstack database instance list``.
+    """
+    from troveclient.osc.v1 import database_instances
+
+    instances = _instances(_client(url, args))
+
+    def run():
+        database_instances.get_instances_info(instances)
+        return len(instances)
+    return run, 'rows'
+
+
+def case_log_generator(url, args):
+    """Download a whole guest log from the object store."""
+    cs = _client(url, args)
+    instance = stub_server.make_instance_id(0)
+
+    def run():
+        log = cs.instances.log_generator(
+            instance, stub_server.LOG_NAME, lines=0,
+            swift=stub_server.make_swift(url))
+        return sum(len(text) for text in log())
+    return run, 'chars'
+
+
+def _trove(url, *argv):
+    return [sys.executable, '-m', 'troveclient.shell',
+            '--os-auth-url', url + '/v2.0', '--os-username', 'user',
+            '--os-password', 'password',
+            '--os-project-name', stub_server.TENANT,
+            '--bypass-url', '%s/v1.0/%s' % (url, stub_server.TENANT)
+            ] + list(argv)
+
+
+def case_cli_startup(url, args):
+    """Start the shell, up to showing its version."""
+    command = [sys.executable, '-m', 'troveclient.shell', '--version']
+
+    def run():
+        subprocess.run(command, check=True, stdout=subprocess.DEVNULL,
+                       stderr=subprocess.DEVNULL)
+        return 1
+    return run, 'runs'
+
+
+def case_cli_list(url, args):
+    """Run ``trove list`` on the first page of instances."""
+    command = _trove(url, 'list')
+
+    def run():
+        subprocess.run(command, check=True, stdout=subprocess.DEVNULL)
+        return 1
+    return run, 'runs'
+
+
+CASES = {
+    'paginate': case_paginate,
+    'resources': case_resources,
+    'find_resource': case_find_resource,
+    'print_list': case_print_list,
+    'instances_info': case_instances_info,
+    'log_generator': case_log_generator,
+    'cli_startup': case_cli_startup,
+    'cli_list': case_cli_list,
+}
+
+
+def run_case(name, url, args):
+    """Time ``args.repeat`` runs of a case, after a warm up run.
+
+    :returns: a dict of the throughput in units per second, the median and
+              99th percentile run times in seconds, the peak RSS and the
+              peak of the memory allocated by a run, in bytes.
+    """
+    run, unit = CASES[name](url, args)
+    run()
+    timings = []
+    units = 0
+    for _i in range(args.repeat):
+        started = time.perf_counter()
+        units += run()
+        timings.append(time.perf_counter() - started)
+    rss = peak_rss()
+    if name.startswith('cli_'):
+        rss = peak_rss(resource.RUSAGE_CHILDREN)
+
+    # The memory allocated by a run, measured apart as tracing the
+    # allocations slows it down.
+    tracemalloc.start()
+    try:
+        run()
+        allocated = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return {'case': name, 'unit': unit,
+            'throughput': units / sum(timings),
+            'p50': statistics.median(timings),
+            'p99': percentile(timings, 99),
+            'peak_rss': rss,
+            'allocated': allocated}
+
+
+def run_isolated(name, url, args):
+    """Run a case in a new process, and return its results."""
+    command = [sys.executable, '-m', 'troveclient.tests.perf.bench',
+               '--child', name, '--url', url] + _scale_argv(args)
+    output = subprocess.run(command, check=True, stdout=subprocess.PIPE,
+                            universal_newlines=True).stdout
+    return json.loads(output.splitlines()[-1])
+
+
+def _scale_argv(args):
+    argv = ['--instances', str(args.instances),
+            '--lookups', str(args.lookups), '--repeat', str(args.repeat)]
+    if args.compact:
+        argv.append('--compact')
+    return argv
+
+
+def compare(results, baseline, tolerance):
+    """Return the cases whose median is slower than in ``baseline``."""
+    before = {result['case']: result for result in baseline}
+    regressions = []
+    for result in results:
+        old = before.get(result['case'])
+        if old and result['p50'] > old['p50'] * (1 + tolerance):
+            regressions.append((result['case'], old['p50'], result['p50']))
+    return regressions
+
+
+def format_results(results):
+    lines = ['%-16s %-26s %10s %10s %10s %10s' % (
+        'case', 'throughput', 'p50 ms', 'p99 ms', 'rss MiB', 'alloc MiB')]
+    for result in results:
+        lines.append('%-16s %12.1f %-13s %10.2f %10.2f %10.1f %10.2f' % (
+            result['case'], result['throughput'], result['unit'] + '/s',
+            result['p50'] * 1000, result['p99'] * 1000,
+            result['peak_rss'] / 1048576.0,
+            result['allocated'] / 1048576.0))
+    return '\n'.join(lines)
+
+
+def get_parser():
+    parser = argparse.ArgumentParser(
+        prog='python -m troveclient.tests.perf.bench',
+        description=__doc__.splitlines()[0])
+    parser.add_argument('cases', nargs='*', metavar='<case>',
+                        help='cases to run, among %s; all by default'
+                             % ', '.join(CASES))
+    parser.add_argument('--instances', type=int, default=1000,
+                        help='number of instances, backups and guest logs')
+    parser.add_argument('--modules', type=int, default=100,
+                        help='number of modules')
+    parser.add_argument('--log-parts', type=int, default=10,
+                        help='number of objects of each guest log')
+    parser.add_argument('--log-lines', type=int, default=1000,
+                        help='number of lines of each guest log object')
+    parser.add_argument('--page-size', type=int, default=20,
+                        help='default page size of the stub server')
+    parser.add_argument('--latency', type=float, default=0,
+                        help='seconds the stub server waits before '
+                             'answering each request')
+    parser.add_argument('--lookups', type=int, default=20,
+                        help='number of lookups of the find_resource case')
+    parser.add_argument('--repeat', type=int, default=10,
+                        help='number of timed runs of each case')
+    parser.add_argument('--compact', action='store_true',
+                        help='use compact resources')
+    parser.add_argument('--in-process', action='store_true',
+                        help='run the cases in this process; the peak RSS '
+                             'then includes the server and earlier cases')
+    parser.add_argument('--save', metavar='<file>',
+                        help='write the results as JSON to <file>')
+    parser.add_argument('--compare', metavar='<file>',
+                        help='compare the results with those saved in '
+                             '<file>')
+    parser.add_argument('--tolerance', type=float, default=0.1,
+                        help='slow down of the median tolerated by '
+                             '--compare, as a fraction')
+    parser.add_argument('--child', help=argparse.SUPPRESS)
+    parser.add_argument('--url', help=argparse.SUPPRESS)
+    return parser
+
+
+def main(argv=None):
+    args = get_parser().parse_args(argv)
+    if args.child:
+        print(json.dumps(run_case(args.child, args.url, args)))
+        return 0
+
+    unknown = set(args.cases) - set(CASES)
+    if unknown:
+        get_parser().error('unknown cases: %s' % ', '.join(sorted(unknown)))
+
+    server = stub_server.StubTroveServer(
+        instances=args.instances, backups=args.instances,
+        modules=args.modules, log_parts=args.log_parts,
+        log_lines=args.log_lines, page_size=args.page_size,
+        latency=args.latency)
+    results = []
+    with server:
+        for name in args.cases or CASES:
+            if args.in_process:
+                results.append(run_case(name, server.url, args))
+            else:
+                results.append(run_isolated(name, server.url, args))
+    print(format_results(results))
+
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump(results, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for case, before, after in regressions:
+            print('%s: median went from %.2f to %.2f ms'
+                  % (case, before * 1000, after * 1000), file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
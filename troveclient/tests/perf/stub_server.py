@@ -0,0 +1,354 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""
+An in-process stub of the Trove API, for benchmarking the client.
+
+Serves synthetic instances, backups and modules, the guest log of every
+instance from a Swift-like object store, and a keystone v2.0 token, at a
+configurable scale and latency::
+
+    with stub_server.StubTroveServer(instances=5000, latency=0.01) as server:
+        cs = server.client()
+        cs.instances.list(all_pages=True)
+
+The collections are paginated like the Trove API, with a ``next`` link
+carrying the marker of the following page.
+"""
+
+import gzip
+import http.server
+import json
+import threading
+import time
+from urllib import parse
+
+TENANT = 'a1b2c3d4e5f60718293a4b5c6d7e8f90'
+TOKEN = 'stub-token'
+LOG_NAME = 'general'
+LOG_CONTAINER = 'database_logs'
+
+
+def make_instance_id(i):
+    return '%08x-0000-4000-8000-000000000000' % i
+
+
+def make_instance(i, tenant=TENANT):
+    instance_id = make_instance_id(i)
+    instance = {
+        'id': instance_id,
+        'name': 'instance-%d' % i,
+        'status': 'ACTIVE',
+        'tenant_id': tenant,
+        'flavor': {'id': 'm1.medium', 'links': []},
+        'volume': {'size': 10 + i % 90},
+        'datastore': {'type': 'mysql', 'version': '5.7.29'},
+        'region': 'RegionOne',
+        'ip': ['10.0.%d.%d' % (i // 250 % 250, i % 250 + 1)],
+        'created': '2020-01-01T00:00:00',
+        'updated': '2020-01-02T00:00:00',
+        'links': [{'rel': 'self',
+                   'href': 'https://trove:8779/v1.0/%s/instances/%s'
+                           % (tenant, instance_id)}],
+    }
+    if i % 10 == 1:
+        instance['replica_of'] = {'id': make_instance_id(i - 1)}
+    return instance
+
+
+def make_backup(i, instances):
+    return {
+        'id': '%08x-1111-4000-8000-000000000000' % i,
+        'name': 'backup-%d' % i,
+        'description': None,
+        'status': 'COMPLETED',
+        'instance_id': make_instance_id(i % max(instances, 1)),
+        'locationRef': 'https://swift:8080/v1/AUTH_%s/database_backups/%d.xbs'
+                       % (TENANT, i),
+        'size': 0.12 + i % 7,
+        'parent_id': None,
+        'datastore': {'type': 'mysql', 'version': '5.7.29',
+                      'version_id': 'b00000b0-00b0-0b00-00b0-000b000000bb'},
+        'created': '2020-01-01T00:00:00',
+        'updated': '2020-01-02T00:00:00',
+    }
+
+
+def make_module(i):
+    return {
+        'id': '%08x-2222-4000-8000-000000000000' % i,
+        'name': 'module-%d' % i,
+        'type': 'ping',
+        'datastore': 'all',
+        'datastore_version': 'all',
+        'auto_apply': False,
+        'priority_apply': False,
+        'apply_order': 5,
+        'is_admin': False,
+        'tenant': TENANT,
+        'visible': True,
+        'live_update': False,
+        'md5': '7b1cc35bfd3c5df8fa6e76ac4b1ab6a6',
+        'created': '2020-01-01T00:00:00',
+        'updated': '2020-01-02T00:00:00',
+    }
+
+
+def make_log_part(part, lines):
+    return ''.join('2020-01-01T00:%02d:%02d.000000Z %d [Note] log part %d, '
+                   'line %d of the synthetic guest log\n'
+                   % (line // 60 % 60, line % 60, line, part, line)
+                   for line in range(lines)).encode('utf-8')
+
+
+def make_client(url, **kwargs):
+    """Return a v1 client authenticated against the stub server at ``url``.
+
+    :param kwargs: passed to :class:`troveclient.v1.client.Client`
+    """
+    from troveclient.v1 import client
+
+    cs = client.Client('user', 'password', project_id=TENANT,
+                       auth_url=url + '/v2.0', **kwargs)
+    cs.client.management_url = '%s/v1.0/%s' % (url, TENANT)
+    cs.client.auth_token = TOKEN
+    return cs
+
+
+def make_swift(url):
+    """Return a swiftclient connection to the stub server at ``url``."""
+    from swiftclient import client as swift_client
+
+    return swift_client.Connection(
+        preauthurl='%s/swift/v1/AUTH_%s' % (url, TENANT),
+        preauthtoken=TOKEN, retries=0)
+
+
+class StubTroveServer(http.server.ThreadingHTTPServer):
+    """Serve synthetic Trove resources on a local port.
+
+    :param instances: number of instances, and of guest logs
+    :param backups: number of backups
+    :param modules: number of modules
+    :param log_parts: number of objects each guest log is split into
+    :param log_lines: number of lines of each log part
+    :param page_size: default number of items of a page
+    :param latency: seconds waited before answering each request
+    :param compress: gzip the responses for the clients accepting it
+    """
+
+    daemon_threads = True
+
+    def __init__(self, instances=1000, backups=1000, modules=100,
+                 log_parts=10, log_lines=1000, page_size=20, latency=0,
+                 compress=False):
+        super(StubTroveServer, self).__init__(('127.0.0.1', 0), StubHandler)
+        self.page_size = page_size
+        self.latency = latency
+        self.compress = compress
+        self.requests = 0
+        self._lock = threading.Lock()
+        self.collections = {
+            'instances': [make_instance(i) for i in range(instances)],
+            'backups': [make_backup(i, instances) for i in range(backups)],
+            'modules': [make_module(i) for i in range(modules)],
+        }
+        self.indexes = {
+            name: {item['id']: i for i, item in enumerate(items)}
+            for name, items in self.collections.items()}
+        self.log_part = make_log_part(0, log_lines)
+        self.log_parts = log_parts
+        self.log_lines = log_lines
+        self._thread = None
+
+    @property
+    def url(self):
+        return 'http://127.0.0.1:%d' % self.server_address[1]
+
+    @property
+    def auth_url(self):
+        return self.url + '/v2.0'
+
+    @property
+    def management_url(self):
+        return '%s/v1.0/%s' % (self.url, TENANT)
+
+    @property
+    def swift_url(self):
+        return '%s/swift/v1/AUTH_%s' % (self.url, TENANT)
+
+    def start(self):
+        self._thread = threading.Thread(target=self.serve_forever,
+                                        daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+        self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+    def client(self, **kwargs):
+        return make_client(self.url, **kwargs)
+
+    def swift(self):
+        return make_swift(self.url)
+
+    def page(self, name, query):
+        """Return the page of a collection selected by ``query``."""
+        items = self.collections[name]
+        start = 0
+        marker = query.get('marker')
+        if marker is not None:
+            start = self.indexes[name].get(marker, len(items) - 1) + 1
+        limit = int(query.get('limit') or self.page_size)
+        page = items[start:start + limit]
+        body = {name: page}
+        if start + limit < len(items):
+            next_query = dict(query, marker=page[-1]['id'], limit=limit)
+            body['links'] = [{'rel': 'next', 'href': '%s/%s?%s' % (
+                self.management_url, name, parse.urlencode(next_query))}]
+        return body
+
+    def log_listing(self, prefix):
+        return [{'name': '%s%04d.log' % (prefix, part),
+                 'bytes': len(self.log_part),
+                 'hash': 'd41d8cd98f00b204e9800998ecf8427e',
+                 'content_type': 'text/plain',
+                 'last_modified': '2020-01-01T00:%02d:00.000000' % part}
+                for part in range(self.log_parts)]
+
+
+class StubHandler(http.server.BaseHTTPRequestHandler):
+
+    protocol_version = 'HTTP/1.1'
+    # NOTE: The headers and the body are written separately; without this
+    # delayed ACKs would add tens of milliseconds to every response.
+    disable_nagle_algorithm = True
+
+    def log_message(self, *args):
+        pass
+
+    def _reply(self, status, body=None, headers=None, head=False):
+        if isinstance(body, (dict, list)):
+            body = json.dumps(body).encode('utf-8')
+            headers = dict(headers or {}, **{
+                'Content-Type': 'application/json'})
+        body = body or b''
+        headers = headers or {}
+        if (self.server.compress and len(body) > 1024 and
+                'gzip' in self.headers.get('Accept-Encoding', '')):
+            body = gzip.compress(body, compresslevel=6)
+            headers['Content-Encoding'] = 'gzip'
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        if not head:
+            self.wfile.write(body)
+
+    def _not_found(self):
+        self._reply(404, {'itemNotFound': {'code': 404,
+                                           'message': 'Not found.'}})
+
+    def _route(self, method):
+        server = self.server
+        with server._lock:
+            server.requests += 1
+        if server.latency:
+            time.sleep(server.latency)
+
+        url = parse.urlsplit(self.path)
+        query = dict(parse.parse_qsl(url.query))
+        length = int(self.headers.get('Content-Length') or 0)
+        if length:
+            self.rfile.read(length)
+        segments = [s for s in url.path.split('/') if s]
+
+        if segments[:2] == ['v2.0', 'tokens'] and method == 'POST':
+            return self._token()
+        if segments[:3] == ['swift', 'v1', 'AUTH_' + TENANT]:
+            return self._swift(method, segments[3:], query)
+        if segments[:2] != ['v1.0', TENANT]:
+            return self._not_found()
+        segments = segments[2:]
+
+        if (len(segments) == 1 or segments[1:] == ['detail']) and \
+                segments[0] in server.collections and method == 'GET':
+            return self._reply(200, server.page(segments[0], query))
+        if len(segments) < 2 or segments[0] not in server.collections:
+            return self._not_found()
+        name, item_id = segments[:2]
+        index = server.indexes[name].get(item_id)
+        if index is None:
+            return self._not_found()
+        item = server.collections[name][index]
+        if len(segments) == 2 and method == 'GET':
+            return self._reply(200, {name[:-1]: item})
+        if segments[2:] == ['log'] and method == 'POST' and \
+                name == 'instances':
+            return self._reply(200, {'log': {
+                'name': LOG_NAME, 'type': 'USER', 'status': 'Published',
+                'published': len(server.log_part) * server.log_parts,
+                'pending': 0, 'container': LOG_CONTAINER,
+                'prefix': '%s/mysql-%s/' % (item_id, LOG_NAME),
+                'metafile': '%s/mysql-%s_metafile' % (item_id, LOG_NAME)}})
+        if segments[2:] == ['backups'] and method == 'GET' and \
+                name == 'instances':
+            return self._reply(200, server.page('backups', query))
+        return self._not_found()
+
+    def _token(self):
+        self._reply(200, {'access': {
+            'token': {'id': TOKEN, 'expires': '2999-01-01T00:00:00Z'},
+            'serviceCatalog': [{
+                'type': 'database', 'name': 'trove',
+                'endpoints': [{'region': 'RegionOne',
+                               'publicURL': self.server.management_url}]}]}})
+
+    def _swift(self, method, segments, query):
+        server = self.server
+        if segments == [LOG_CONTAINER] and method == 'GET':
+            prefix = query.get('prefix', '')
+            listing = server.log_listing(prefix)
+            marker = query.get('marker')
+            if marker:
+                listing = [obj for obj in listing if obj['name'] > marker]
+            return self._reply(200, listing)
+        if len(segments) < 2 or segments[0] != LOG_CONTAINER:
+            return self._not_found()
+        if method == 'HEAD':
+            return self._reply(200, headers={
+                'X-Object-Meta-Lines': str(server.log_lines),
+                'Content-Type': 'text/plain',
+                'Etag': 'd41d8cd98f00b204e9800998ecf8427e'}, head=True)
+        if method == 'GET':
+            return self._reply(200, server.log_part, headers={
+                'Content-Type': 'text/plain',
+                'Etag': 'd41d8cd98f00b204e9800998ecf8427e'})
+        return self._not_found()
+
+    def do_GET(self):
+        self._route('GET')
+
+    def do_HEAD(self):
+        self._route('HEAD')
+
+    def do_POST(self):
+        self._route('POST')
@@ -0,0 +1,107 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import argparse
+
+import fixtures
+import testtools
+
+from troveclient import exceptions
+from troveclient.tests.perf import bench
+from troveclient.tests.perf import stub_server
+
+
+class StubServerTest(testtools.TestCase):
+
+    def setUp(self):
+        super(StubServerTest, self).setUp()
+        self.useFixture(fixtures.EnvironmentVariable(
+            'TROVECLIENT_UUID_CACHE_DIR',
+            self.useFixture(fixtures.TempDir()).path))
+        self.server = stub_server.StubTroveServer(
+            instances=45, backups=7, modules=3, log_parts=3, log_lines=5,
+            page_size=10).start()
+        self.addCleanup(self.server.stop)
+        self.cs = self.server.client()
+
+    def test_paginate(self):
+        page = self.cs.instances.list()
+        self.assertEqual(10, len(page))
+        self.assertEqual(stub_server.make_instance_id(9), page.next)
+
+        instances = list(self.cs.instances.list(all_pages=True, limit=20))
+        self.assertEqual([stub_server.make_instance_id(i)
+                          for i in range(45)],
+                         [instance.id for instance in instances])
+        self.assertEqual(7, len(self.cs.backups.list()))
+
+    def test_get(self):
+        instance = self.cs.instances.get(stub_server.make_instance_id(3))
+        self.assertEqual('instance-3', instance.name)
+        self.assertRaises(exceptions.NotFound, self.cs.instances.get,
+                          'missing')
+
+    def test_log_generator(self):
+        log = self.cs.instances.log_generator(
+            stub_server.make_instance_id(0), stub_server.LOG_NAME, lines=7,
+            swift=self.server.swift())
+        lines = ''.join(log()).splitlines()
+        self.assertEqual(7, len(lines))
+        self.assertIn('line 4 of the synthetic guest log', lines[-1])
+
+
+class BenchTest(testtools.TestCase):
+
+    def setUp(self):
+        super(BenchTest, self).setUp()
+        self.useFixture(fixtures.EnvironmentVariable(
+            'TROVECLIENT_UUID_CACHE_DIR',
+            self.useFixture(fixtures.TempDir()).path))
+        self.server = stub_server.StubTroveServer(
+            instances=30, backups=30, modules=5, log_parts=2, log_lines=10
+        ).start()
+        self.addCleanup(self.server.stop)
+        self.args = argparse.Namespace(instances=30, lookups=3, repeat=2,
+                                       compact=False)
+
+    def _test_cases(self):
+        for name in bench.CASES:
+            if name.startswith('cli_'):
+                continue
+            result = bench.run_case(name, self.server.url, self.args)
+            self.assertEqual(name, result['case'])
+            self.assertGreater(result['throughput'], 0)
+            self.assertLessEqual(result['p50'], result['p99'])
+            self.assertGreater(result['peak_rss'], 0)
+            self.assertGreater(result['allocated'], 0)
+
+    def test_cases(self):
+        self._test_cases()
+
+    def test_cases_compact(self):
+        self.args.compact = True
+        self._test_cases()
+
+    def test_percentile(self):
+        timings = list(range(1, 101))
+        self.assertEqual(50, bench.percentile(timings, 50))
+        self.assertEqual(99, bench.percentile(timings, 99))
+        self.assertEqual(3, bench.percentile([3], 99))
+
+    def test_compare(self):
+        baseline = [{'case': 'paginate', 'p50': 1.0},
+                    {'case': 'resources', 'p50': 1.0}]
+        results = [{'case': 'paginate', 'p50': 1.05},
+                   {'case': 'resources', 'p50': 1.2},
+                   {'case': 'print_list', 'p50': 9.0}]
+        self.assertEqual([('resources', 1.0, 1.2)],
+                         bench.compare(results, baseline, 0.1))
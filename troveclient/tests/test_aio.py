@@ -0,0 +1,255 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import asyncio
+import inspect
+import json
+import os
+import shutil
+import tempfile
+from unittest import mock
+
+import testtools
+
+from troveclient import exceptions
+from troveclient import utils
+from troveclient.v1 import aio
+from troveclient.v1 import instances
+
+ENDPOINT = 'http://trove:8779/v1.0/tenant'
+
+
+class FakeResponse(object):
+
+    def __init__(self, status, body=None):
+        self.status = status
+        self.headers = {'Content-Type': 'application/json'}
+        self._text = json.dumps(body) if body is not None else ''
+
+    async def text(self):
+        return self._text
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        pass
+
+
+class FakeHTTPSession(object):
+    """Answer requests from a dict of (method, path) to responses."""
+
+    def __init__(self, routes):
+        self.routes = routes
+        self.calls = []
+
+    def request(self, method, url, **kwargs):
+        path = url[len(ENDPOINT):]
+        kwargs['headers'] = dict(kwargs['headers'])
+        self.calls.append((method, path, kwargs))
+        responses = self.routes[(method, path)]
+        if isinstance(responses, list):
+            return responses.pop(0)
+        return responses
+
+    async def close(self):
+        pass
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+class AsyncClientTest(testtools.TestCase):
+
+    def _client(self, routes, **kwargs):
+        self.http = FakeHTTPSession(routes)
+        kwargs.setdefault('endpoint', ENDPOINT)
+        kwargs.setdefault('token', 'token')
+        return aio.Client(http_session=self.http, **kwargs)
+
+    def test_get(self):
+        client = self._client({
+            ('GET', '/instances/1'): FakeResponse(
+                200, {'instance': {'id': '1', 'status': 'ACTIVE'}})})
+        instance = run(client.instances.get('1'))
+        self.assertIsInstance(instance, instances.Instance)
+        self.assertTrue(instance.is_loaded)
+        self.assertEqual('ACTIVE', instance.status)
+        headers = self.http.calls[0][2]['headers']
+        self.assertEqual('token', headers['X-Auth-Token'])
+
+    def test_list_all_pages(self):
+        next_link = [{'rel': 'next', 'href': ENDPOINT + '/instances?marker=2'}]
+        client = self._client({
+            ('GET', '/instances?include_clustered=False'): FakeResponse(
+                200, {'instances': [{'id': '1'}, {'id': '2'}],
+                      'links': next_link}),
+            ('GET', '/instances?marker=2&include_clustered=False'):
+                FakeResponse(200, {'instances': [{'id': '3'}]}),
+        })
+
+        async def collect(prefetch):
+            return [i.id async for i in client.instances.list(
+                all_pages=True, prefetch=prefetch)]
+
+        self.assertEqual(['1', '2', '3'], run(collect(False)))
+        self.assertEqual(['1', '2', '3'], run(collect(True)))
+        page = run(client.instances.list())
+        self.assertEqual('2', page.next)
+
+    def test_create_and_action(self):
+        client = self._client({
+            ('POST', '/instances'): FakeResponse(
+                200, {'instance': {'id': '1', 'name': 'db'}}),
+            ('POST', '/instances/1/action'): FakeResponse(202),
+        })
+        instance = run(client.instances.create('db', flavor_id='2'))
+        self.assertEqual('db', instance.name)
+        self.assertIsNone(run(client.instances.restart(instance)))
+        method, path, kwargs = self.http.calls[1]
+        self.assertEqual({'restart': {}}, json.loads(kwargs['data']))
+
+    def test_update_bodies(self):
+        client = self._client({
+            ('PUT', '/instances/1'): FakeResponse(202),
+            ('PATCH', '/configurations/c1'): FakeResponse(200),
+        })
+        run(client.instances.update('1', name='new', is_public=True))
+        run(client.configurations.edit('c1', '{"max_connections": 10}'))
+        self.assertEqual(
+            [instances.Instances._update_body(name='new', is_public=True),
+             {'configuration': {'values': {'max_connections': 10}}}],
+            [json.loads(kwargs['data']) for m, p, kwargs in self.http.calls])
+
+    def test_inherited_instance_methods(self):
+        module = {'id': 'm1', 'name': 'mod', 'datastore': 'mysql',
+                  'datastore_version': '5.7',
+                  'contents': utils.encode_data(b'data')}
+        log = {'name': 'general', 'container': 'logs', 'prefix': 'p/',
+               'metafile': 'p/meta'}
+        client = self._client({
+            ('GET', '/instances/1/backups'): FakeResponse(
+                200, {'backups': [{'id': 'b1'}]}),
+            ('GET', '/instances/1/configuration'): FakeResponse(
+                200, {'instance': {'configuration': {}}}),
+            ('GET', '/instances/1/modules'): FakeResponse(
+                200, {'modules': [module]}),
+            ('GET', '/instances/1/modules?from_guest=True'): FakeResponse(
+                200, {'modules': [module]}),
+            ('GET', '/instances/1/modules?from_guest=True'
+                    '&include_contents=True'): FakeResponse(
+                200, {'modules': [module]}),
+            ('POST', '/instances/1/log'): FakeResponse(200, {'log': log}),
+        })
+        instance = instances.Instance(None, {'id': '1'}, loaded=True)
+        manager = client.instances
+        self.assertEqual(['b1'],
+                         [b.id for b in run(manager.backups(instance))])
+        self.assertEqual({}, run(manager.configuration(instance))
+                         .configuration)
+        self.assertEqual('mod', run(manager.modules(instance))[0].name)
+        self.assertEqual('mod', run(manager.module_query(instance))[0].name)
+        self.assertEqual('logs',
+                         run(manager.log_show(instance, 'general')).container)
+
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        saved = run(manager.module_retrieve(instance, directory=directory))
+        with open(saved['mod'], 'rb') as f:
+            self.assertEqual(b'data', f.read())
+
+        swift = mock.Mock()
+        swift.get_container.return_value = (
+            {}, [{'name': 'p/1', 'last_modified': '1'}])
+        swift.head_object.return_value = {'x-object-meta-lines': '1'}
+        swift.get_object.side_effect = lambda *args, **kwargs: (
+            {}, [b'line\n'])
+        log_gen = run(manager.log_generator(instance, 'general', swift=swift))
+        self.assertEqual('line\n', ''.join(log_gen()))
+        swift.get_container.assert_called_with('logs', prefix='p/')
+
+        manager._get_swift_client = mock.Mock(return_value=swift)
+        filename = os.path.join(directory, 'general.log')
+        self.assertEqual(filename, run(manager.log_save(
+            instance, 'general', filename=filename)))
+        with open(filename) as f:
+            self.assertEqual('line\n', f.read())
+
+    def test_no_untested_inherited_instance_methods(self):
+        # The synchronous methods inherited as is must return the result of
+        # a request helper, see test_inherited_instance_methods.
+        inherited = set(
+            name for name, value in vars(instances.Instances).items()
+            if not name.startswith('_') and inspect.isfunction(value) and
+            name not in vars(aio.instances.Instances))
+        self.assertEqual(
+            set(['backups', 'configuration', 'create', 'get', 'list',
+                 'log_show', 'module_query', 'modules']), inherited)
+
+    def test_error_mapping(self):
+        client = self._client({
+            ('GET', '/instances/1'): FakeResponse(
+                404, {'itemNotFound': {'message': 'gone', 'code': 404}})})
+        e = self.assertRaises(exceptions.NotFound, run,
+                              client.instances.get('1'))
+        self.assertEqual('gone', e.message)
+
+    @mock.patch('asyncio.sleep')
+    def test_retry_server_error(self, mock_sleep):
+        client = self._client({
+            ('GET', '/flavors/1'): [
+                FakeResponse(503),
+                FakeResponse(200, {'flavor': {'id': '1'}})]}, retries=1)
+        self.assertEqual('1', run(client.flavors.get('1')).id)
+        mock_sleep.assert_called_once_with(1)
+
+    def test_session_reauthenticates_once(self):
+        session = mock.Mock()
+        session.get_token.side_effect = ['old', 'new']
+        session.get_endpoint.return_value = ENDPOINT
+        client = self._client({
+            ('GET', '/instances/1'): [
+                FakeResponse(401),
+                FakeResponse(200, {'instance': {'id': '1'}})]},
+            endpoint=None, token=None, session=session)
+
+        run(client.instances.get('1'))
+        session.invalidate.assert_called_once_with(None)
+        self.assertEqual(['old', 'new'],
+                         [c[2]['headers']['X-Auth-Token']
+                          for c in self.http.calls])
+
+    def test_concurrent_requests(self):
+        ids = [str(i) for i in range(20)]
+        client = self._client(dict(
+            (('GET', '/instances/%s' % i),
+             FakeResponse(200, {'instance': {'id': i}})) for i in ids))
+
+        async def get_all():
+            return await asyncio.gather(
+                *[client.instances.get(i) for i in ids])
+
+        self.assertEqual(ids, [i.id for i in run(get_all())])
+
+    def test_find(self):
+        client = self._client({
+            ('GET', '/backups'): FakeResponse(
+                200, {'backups': [{'id': '1', 'name': 'a'},
+                                  {'id': '2', 'name': 'b'}]})})
+        self.assertEqual('2', run(client.backups.find(name='b')).id)
+        self.assertRaises(exceptions.NotFound, run,
+                          client.backups.find(name='c'))
+
+    def test_requires_endpoint_or_session(self):
+        self.assertRaises(exceptions.CommandError, aio.Client,
+                          http_session=mock.Mock())
@@ -49,3 +49,14 @@ class ExceptionsTestCase(test_utils.TestCase):
         # are in the response body.
         body = {'message': 'Fake message.', 'code': 503}
         self._test_from_response(body)
+
+    def test_from_response_retry_after(self):
+        for status, cls in ((503, exceptions.ServiceUnavailable),
+                            (413, exceptions.RequestEntityTooLarge)):
+            response = test_utils.TestResponse({
+                'status_code': status,
+                'headers': {'retry-after': '5'},
+                'text': ''})
+            error = exceptions.from_response(response, 'GET', '/instances')
+            self.assertIsInstance(error, cls)
+        self.assertEqual(5, error.retry_after)
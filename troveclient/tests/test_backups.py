@@ -103,7 +103,8 @@ class BackupManagerTest(testtools.TestCase):
         limit = "test-limit"
         marker = "test-marker"
         self.backups.list(limit, marker)
-        page_mock.assert_called_with("/backups", "backups", limit, marker, {})
+        page_mock.assert_called_with("/backups", "backups", limit, marker, {},
+                                     all_pages=False, prefetch=False)
 
     def test_list_by_datastore(self):
         page_mock = mock.Mock()
@@ -113,7 +114,8 @@ class BackupManagerTest(testtools.TestCase):
         datastore = "test-mysql"
         self.backups.list(limit, marker, datastore)
         page_mock.assert_called_with("/backups", "backups", limit, marker,
-                                     {'datastore': datastore})
+                                     {'datastore': datastore},
+                                     all_pages=False, prefetch=False)
 
     def test_list_by_instance(self):
         page_mock = mock.Mock()
@@ -123,7 +125,8 @@ class BackupManagerTest(testtools.TestCase):
         self.backups.list(instance_id=instance_id)
 
         page_mock.assert_called_with("/backups", "backups", None, None,
-                                     {'instance_id': instance_id})
+                                     {'instance_id': instance_id},
+                                     all_pages=False, prefetch=False)
 
     def test_list_by_all_projects(self):
         page_mock = mock.Mock()
@@ -133,7 +136,8 @@ class BackupManagerTest(testtools.TestCase):
         self.backups.list(all_projects=all_projects)
 
         page_mock.assert_called_with("/backups", "backups", None, None,
-                                     {'all_projects': all_projects})
+                                     {'all_projects': all_projects},
+                                     all_pages=False, prefetch=False)
 
     def test_get(self):
         get_mock = mock.Mock()
@@ -161,7 +165,7 @@ class BackupManagerTest(testtools.TestCase):
         self.backups.api.client.delete = mock.Mock(return_value=(resp, None))
         self.assertRaises(Exception, self.backups.delete, 'backup1')
 
-    @patch('troveclient.v1.backups.mistral_client')
+    @patch('mistralclient.api.client.client')
     def test_auth_mistral_client(self, mistral_client):
         with patch.object(self.backups.api.client, 'auth') as auth:
             self.backups._get_mistral_client()
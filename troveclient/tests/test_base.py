@@ -16,14 +16,18 @@
 #    under the License.
 
 import contextlib
+from concurrent import futures
 import os
+import threading
 from unittest import mock
 
+import fixtures
 import testtools
 
 from troveclient.apiclient import exceptions
 from troveclient import base
 from troveclient import common
+from troveclient import exceptions as trove_exceptions
 from troveclient import utils
 
 """
@@ -87,10 +91,11 @@ class ManagerTest(testtools.TestCase):
 
         # no cache object, nothing should happen
         manager.write_to_completion_cache("non-exist", "val")
-        manager._mock_cache = mock.Mock()
-        manager._mock_cache.write = mock.Mock(return_value=None)
+        manager._mock_cache = []
         manager.write_to_completion_cache("mock", "val")
-        self.assertEqual(1, manager._mock_cache.write.call_count)
+        manager.write_to_completion_cache("mock", "name", obj_id="val")
+        self.assertEqual([("val", None), ("name", "val")],
+                         manager._mock_cache)
 
     def _get_mock(self):
         manager = base.Manager()
@@ -310,6 +315,43 @@ class MangerPaginationTests(ManagerTest):
         self.assertRaises(Exception, self.manager._paginated,
                           self.url, self.response_key)
 
+    def _mock_pages(self):
+        def side_effect(url, **kwargs):
+            if 'marker=%s' % self.marker in url:
+                return None, self.next_body
+            return None, self.body
+
+        self.manager.api.client.get = mock.Mock(side_effect=side_effect)
+
+    def test_pagination_all_pages(self):
+        self._mock_pages()
+        resp = self.manager._paginated(self.url, self.response_key,
+                                       all_pages=True)
+        self.assertNotIsInstance(resp, common.Paginated)
+        self.assertEqual(0, self.manager.api.client.get.call_count)
+        self.assertEqual(['p1', 'p2', 'p3', 'p4'], [r.foo for r in resp])
+        self.assertEqual(2, self.manager.api.client.get.call_count)
+
+    def test_pagination_all_pages_prefetch(self):
+        self._mock_pages()
+        resp = self.manager._paginated(self.url, self.response_key,
+                                       all_pages=True, prefetch=True)
+        self.assertEqual(['p1', 'p2', 'p3', 'p4'], [r.foo for r in resp])
+        self.assertEqual(2, self.manager.api.client.get.call_count)
+
+    def test_pagination_all_pages_repeated_marker(self):
+        self.next_body['links'] = self.links
+        self._mock_pages()
+        resp = self.manager._paginated(self.url, self.response_key,
+                                       all_pages=True)
+        self.assertEqual(['p1', 'p2', 'p3', 'p4'], [r.foo for r in resp])
+
+    def test_iter_all(self):
+        self.manager.list = mock.Mock(return_value=iter([]))
+        self.manager.iter_all('instance', prefetch=True)
+        self.manager.list.assert_called_once_with('instance', all_pages=True,
+                                                  prefetch=True)
+
 
 class FakeResource(object):
     def __init__(self, _id, properties):
@@ -380,6 +422,178 @@ class FindResourceTestCase(testtools.TestCase):
         self.assertEqual(self.manager.get('5678'), output)
 
 
+class ResolutionIndexTest(testtools.TestCase):
+    def setUp(self):
+        super(ResolutionIndexTest, self).setUp()
+        self.api = mock.Mock()
+        self.api.resolution_index = base.ResolutionIndex(ttl=30)
+        self.manager = FakeManager(self.api)
+        self.manager.list = mock.Mock(return_value=FakeManager.resources)
+
+    def test_single_listing_for_chained_finds(self):
+        output = utils.find_resource(self.manager, 'entity_three')
+        self.assertEqual('4242', output.id)
+        utils.find_resource(self.manager, 'entity_one')
+        self.manager.list.assert_called_once_with()
+
+    def test_findall_does_not_get_matches(self):
+        with mock.patch.object(self.manager, 'get') as mock_get:
+            found = self.manager.findall(name='entity_one')
+            self.assertEqual(['1234'], [r.id for r in found])
+            mock_get.assert_not_called()
+
+    def test_findall_unindexed_attribute(self):
+        found = self.manager.findall(id='1234', name='entity_one')
+        self.assertEqual(['1234'], [r.id for r in found])
+        self.assertEqual([], self.manager.findall(name='entity_one',
+                                                  id='4242'))
+
+    def test_find_fetches_unloaded_match(self):
+        unloaded = base.Resource(self.manager, {'id': '1', 'name': 'foo'})
+        self.manager.list.return_value = [unloaded]
+        self.manager.get = mock.Mock(return_value='loaded')
+        self.assertEqual('loaded', self.manager.find(name='foo'))
+        self.manager.get.assert_called_once_with('1')
+
+    def test_expired(self):
+        self.api.resolution_index.ttl = 0
+        self.manager.find(name='entity_one')
+        self.manager.find(name='entity_two')
+        self.assertEqual(2, self.manager.list.call_count)
+
+    def test_invalidated_by_create_and_delete(self):
+        self.manager.find(name='entity_one')
+        self.api.client.delete = mock.Mock(return_value=(None, None))
+        self.manager._delete('/fake/1234')
+        self.manager.find(name='entity_two')
+        self.assertEqual(2, self.manager.list.call_count)
+        self.api.client.post = mock.Mock(return_value=(None, None))
+        self.manager._create('/fake', {}, 'fake')
+        self.manager.find(name='entity_two')
+        self.assertEqual(3, self.manager.list.call_count)
+
+    def test_all_pages_listing(self):
+        def list_all(all_pages=False):
+            pass
+
+        with mock.patch.object(self.manager, 'list', autospec=list_all,
+                               return_value=iter(FakeManager.resources)):
+            self.manager.find(name='entity_one')
+            self.manager.list.assert_called_once_with(all_pages=True)
+
+
+class RequestCoalescerTest(testtools.TestCase):
+    def setUp(self):
+        super(RequestCoalescerTest, self).setUp()
+        self.api = mock.Mock()
+        self.api.request_coalescer = base.RequestCoalescer()
+        self.manager = base.Manager(self.api)
+        self.manager.resource_class = base.Resource
+        self.sent = threading.Event()
+        self.release = threading.Event()
+
+    def _slow_get(self, body):
+        def get(url):
+            self.sent.set()
+            self.release.wait(10)
+            if isinstance(body, Exception):
+                raise body
+            return None, body
+        return get
+
+    def _get_concurrently(self, count):
+        waiting = threading.Semaphore(0)
+
+        class Future(futures.Future):
+            def result(self, timeout=None):
+                waiting.release()
+                return super(Future, self).result(timeout)
+
+        self.useFixture(fixtures.MockPatch('troveclient.base.futures.Future',
+                                           Future))
+        executor = futures.ThreadPoolExecutor(max_workers=count)
+        self.addCleanup(executor.shutdown)
+        calls = [executor.submit(self.manager._get, '/flavors/1', 'flavor')]
+        self.sent.wait(10)
+        calls += [executor.submit(self.manager._get, '/flavors/1', 'flavor')
+                  for _i in range(count - 1)]
+        # Let the other threads join the request in flight.
+        for _i in range(count - 1):
+            waiting.acquire(timeout=10)
+        return calls
+
+    def test_concurrent_gets_share_a_request(self):
+        body = {'flavor': {'id': '1', 'links': [{'rel': 'self'}]}}
+        self.api.client.get = mock.Mock(side_effect=self._slow_get(body))
+        calls = self._get_concurrently(3)
+        self.release.set()
+        flavors = [call.result(10) for call in calls]
+
+        self.api.client.get.assert_called_once_with('/flavors/1')
+        self.assertEqual(3, len(set(map(id, flavors))))
+        self.assertEqual([[{'rel': 'self'}]] * 3,
+                         [flavor.links for flavor in flavors])
+        self.assertIsNot(flavors[0].links, flavors[1].links)
+
+        # Later requests are sent again.
+        self.api.client.get = mock.Mock(return_value=(None, body))
+        self.manager._get('/flavors/1', 'flavor')
+        self.api.client.get.assert_called_once_with('/flavors/1')
+
+    def test_error_is_shared(self):
+        error = exceptions.NotFound()
+        self.api.client.get = mock.Mock(side_effect=self._slow_get(error))
+        calls = self._get_concurrently(2)
+        self.release.set()
+        for call in calls:
+            self.assertIs(error, call.exception(10))
+        self.api.client.get.assert_called_once_with('/flavors/1')
+
+    def test_streamed_pages_are_coalesced(self):
+        self.api.client.get = mock.Mock(
+            return_value=(None, {'flavors': [{'id': '1'}]}))
+        coalescer = self.api.request_coalescer
+        with mock.patch.object(coalescer, 'request',
+                               wraps=coalescer.request) as request:
+            flavors = list(self.manager._paginated('/flavors', 'flavors',
+                                                   all_pages=True))
+        self.assertEqual(['1'], [flavor.id for flavor in flavors])
+        request.assert_called_once_with('/flavors', mock.ANY)
+        # The body is shared, so it is not streamed.
+        self.api.client.get.assert_called_once_with('/flavors')
+
+    def test_forget(self):
+        coalescer = base.RequestCoalescer()
+        coalescer._calls['key'] = futures.Future()
+        coalescer.forget()
+        self.assertEqual(('resp', 'sent'),
+                         coalescer.request('key', lambda: ('resp', 'sent')))
+        self.assertEqual({}, coalescer._calls)
+
+    def test_leader_changes_do_not_reach_followers(self):
+        coalescer = base.RequestCoalescer()
+        joined = threading.Event()
+        body = {'flavor': {'name': 'small'}}
+
+        def send():
+            self.sent.set()
+            joined.wait(10)
+            return 'resp', body
+
+        executor = futures.ThreadPoolExecutor(max_workers=2)
+        self.addCleanup(executor.shutdown)
+        leader = executor.submit(coalescer.request, 'key', send)
+        self.sent.wait(10)
+        follower = executor.submit(coalescer.request, 'key', None)
+        while coalescer._calls['key'].followers < 1:
+            joined.wait(0.01)
+        joined.set()
+        self.assertIs(body, leader.result(10)[1])
+        body['flavor']['name'] = 'changed'
+        self.assertEqual(('resp', {'flavor': {'name': 'small'}}),
+                         follower.result(10))
+
+
 class ResourceTest(testtools.TestCase):
     def setUp(self):
         super(ResourceTest, self).setUp()
@@ -514,3 +728,147 @@ class ResourceTest(testtools.TestCase):
 
         robj._loaded = False
         self.assertFalse(robj.is_loaded)
+
+
+class FakeCompactResource(base.CompactResource):
+    RESOURCE_NAME = 'Resource'
+    FIELDS = ('id', 'name')
+
+
+class CompactResourceTest(testtools.TestCase):
+    def setUp(self):
+        super(CompactResourceTest, self).setUp()
+        self.manager = mock.Mock()
+        self.info = {'id': 'rid', 'name': 'res', 'flavor': {'id': '1'}}
+
+    def test_attributes(self):
+        robj = FakeCompactResource(self.manager, self.info, loaded=True)
+        self.assertEqual('rid', robj.id)
+        self.assertEqual({'id': '1'}, robj.flavor)
+        self.assertIs(self.info['flavor'], robj.flavor)
+        self.assertNotIn('flavor', vars(robj))
+        self.assertIn('name', dir(robj))
+        self.assertFalse(hasattr(robj, 'volume'))
+
+    def test_set_attribute(self):
+        robj = FakeCompactResource(self.manager, self.info, loaded=True)
+        robj.name = 'new'
+        robj.size = 2
+        self.assertEqual('new', robj.name)
+        self.assertEqual(2, robj.size)
+        self.assertEqual('res', self.info['name'])
+
+    def test_lazy_load(self):
+        new = mock.Mock(_info={'id': 'rid', 'volume': {'size': 1}})
+        self.manager.get.return_value = new
+        robj = FakeCompactResource(self.manager, self.info)
+        self.assertEqual({'size': 1}, robj.volume)
+        self.manager.get.assert_called_once_with('rid')
+        self.assertRaises(AttributeError, getattr, robj, 'missing')
+        self.assertEqual(1, self.manager.get.call_count)
+
+    def test_to_dict(self):
+        robj = FakeCompactResource(self.manager, self.info, loaded=True)
+        info = robj.to_dict()
+        info['size'] = 2
+        info['name'] = 'new'
+        del info['flavor']
+        self.assertEqual({'id': 'rid', 'name': 'new', 'size': 2}, info)
+        self.assertEqual({'id': 'rid', 'name': 'res', 'flavor': {'id': '1'}},
+                         self.info)
+        self.assertRaises(KeyError, info.__delitem__, 'flavor')
+        self.assertIsNone(info.pop('flavor', None))
+        self.assertEqual(dict(info), info.copy())
+
+    def test_repr(self):
+        robj = FakeCompactResource(self.manager, {'id': 'rid'}, loaded=True)
+        robj.size = 2
+        self.assertEqual('<Resource id=rid, size=2>', repr(robj))
+
+    def test_find(self):
+        manager = FakeManager(None)
+        resources = [FakeCompactResource(manager, {'id': str(i),
+                                                   'name': 'res%d' % i})
+                     for i in range(3)]
+        manager.list = mock.Mock(return_value=resources)
+        manager.get = mock.Mock()
+        self.assertEqual([resources[1]], manager.findall(name='res1'))
+        self.assertEqual([], manager.findall(volume=1))
+        self.assertFalse(manager.get.called)
+
+    def test_manager(self):
+        class Manager(base.Manager):
+            resource_class = base.Resource
+            compact_resource_class = FakeCompactResource
+
+        self.assertIs(base.Resource, Manager(mock.Mock()).resource_class)
+        api = mock.Mock(compact_resources=True)
+        self.assertIs(FakeCompactResource, Manager(api).resource_class)
+
+
+class HydrateTest(testtools.TestCase):
+    def setUp(self):
+        super(HydrateTest, self).setUp()
+
+        class Manager(base.ManagerWithFind):
+            resource_class = base.Resource
+
+            def get(manager, resource_id):
+                self.gets.append(resource_id)
+                if resource_id == 'gone':
+                    raise exceptions.NotFound(404)
+                return base.Resource(manager, {'id': resource_id,
+                                               'volume': {'size': 1}},
+                                     loaded=True)
+
+            def list(manager):
+                return []
+
+        self.gets = []
+        self.api = mock.Mock(lazy_loads=base.LazyLoads())
+        self.manager = Manager(self.api)
+
+    def _resources(self, *ids):
+        return [base.Resource(self.manager, {'id': resource_id})
+                for resource_id in ids]
+
+    def test_lazy_load(self):
+        resources = self._resources('1', '2')
+        self.assertEqual([1, 1], [r.volume['size'] for r in resources])
+        self.assertEqual(['1', '2'], self.gets)
+        self.assertEqual({('Resource', 'volume'): 2},
+                         dict(self.api.lazy_loads.counts))
+        self.assertEqual(2, self.api.lazy_loads.total)
+
+    def test_strict(self):
+        self.api.lazy_loads = base.LazyLoads(strict=True)
+        resource = self._resources('1')[0]
+        self.assertRaises(trove_exceptions.LazyLoadError, getattr, resource,
+                          'volume')
+        self.assertEqual([], self.gets)
+        self.assertEqual(1, self.api.lazy_loads.total)
+
+    def test_hydrate(self):
+        self.api.lazy_loads = base.LazyLoads(strict=True)
+        loaded = base.Resource(self.manager, {'id': '3'}, loaded=True)
+        resources = self._resources('1', '2') + [loaded]
+        self.assertEqual(resources, self.manager.hydrate(iter(resources),
+                                                         concurrency=2))
+        self.assertEqual(['1', '2'], sorted(self.gets))
+        self.assertEqual([1, 1], [r.volume['size'] for r in resources[:2]])
+        self.assertTrue(all(r.is_loaded for r in resources))
+        self.assertEqual(0, self.api.lazy_loads.total)
+
+    def test_hydrate_compact(self):
+        resources = [FakeCompactResource(self.manager, {'id': '1'})]
+        self.manager.hydrate(resources, concurrency=1)
+        self.assertEqual({'id': '1', 'volume': {'size': 1}},
+                         resources[0]._info)
+        self.assertEqual(0, self.api.lazy_loads.total)
+
+    def test_hydrate_error(self):
+        resources = self._resources('1', 'gone', '2')
+        self.assertRaises(exceptions.NotFound, self.manager.hydrate,
+                          resources)
+        self.assertEqual(['1', '2', 'gone'], sorted(self.gets))
+        self.assertTrue(resources[2].is_loaded)
@@ -0,0 +1,148 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import datetime
+import http.server
+import json
+import os
+import threading
+import time
+from unittest import mock
+
+import fixtures
+import requests
+from requests import adapters
+import testtools
+
+from troveclient import cassette
+from troveclient import exceptions
+from troveclient.v1 import client
+
+URL = 'http://trove/v1.0/project'
+
+
+def make_response(request, status, body, headers=None, elapsed=0.5):
+    resp = requests.Response()
+    resp.status_code = status
+    resp.reason = 'OK'
+    resp.headers.update(headers or {})
+    resp._content = body
+    resp.url = request.url
+    resp.request = request
+    resp.elapsed = datetime.timedelta(seconds=elapsed)
+    return resp
+
+
+class CassetteTest(testtools.TestCase):
+
+    def setUp(self):
+        super(CassetteTest, self).setUp()
+        self.path = os.path.join(self.useFixture(fixtures.TempDir()).path,
+                                 'test.cassette')
+        self.cs = client.Client(auth_url='http://auth')
+        self.cs.client.management_url = URL
+        self.cs.client.auth_token = 'secret'
+
+    def _record(self):
+        def send(adapter, request, **kwargs):
+            if '/flavors' in request.url:
+                return make_response(
+                    request, 200, b'{"flavors": [{"id": "1"}]}',
+                    {'Content-Type': 'application/json',
+                     'Content-Length': '26', 'X-Auth-Token': 'secret'})
+            if request.method == 'DELETE':
+                return make_response(request, 202, b'')
+            return make_response(request, 404, b'\xff')
+
+        self.useFixture(fixtures.MockPatchObject(
+            adapters.HTTPAdapter, 'send', autospec=True, side_effect=send))
+        cassette.record(self.cs, self.path)
+        self.cs.client.get('/flavors?b=2&a=1')
+        self.cs.client.delete('/instances/1')
+        self.assertRaises(exceptions.NotFound, self.cs.client.get,
+                          '/instances/2')
+        # Restore the default adapters.
+        self.cs.client.http_session.mount('http://', adapters.HTTPAdapter())
+
+    def test_record(self):
+        self._record()
+        with open(self.path) as f:
+            exchanges = [json.loads(line) for line in f]
+        self.assertEqual(3, len(exchanges))
+        self.assertEqual(
+            {'method': 'GET', 'url': URL + '/flavors?b=2&a=1', 'status': 200,
+             'reason': 'OK',
+             'headers': {'Content-Type': 'application/json',
+                         'X-Auth-Token': 'REDACTED'},
+             'body': '{"flavors": [{"id": "1"}]}', 'body_encoding': 'utf-8',
+             'elapsed': mock.ANY},
+            exchanges[0])
+        self.assertGreaterEqual(exchanges[0]['elapsed'], 0)
+        self.assertEqual('base64', exchanges[2]['body_encoding'])
+        self.assertNotIn('secret', json.dumps(exchanges))
+
+    def test_replay(self):
+        self._record()
+        cassette.replay(self.cs, self.path)
+        with mock.patch.object(adapters.HTTPAdapter, 'send') as m_send:
+            # Query parameters match in any order, and the last response
+            # is replayed again.
+            for _i in range(2):
+                resp, body = self.cs.client.get('/flavors?a=1&b=2')
+                self.assertEqual({'flavors': [{'id': '1'}]}, body)
+            m_send.assert_not_called()
+        self.assertEqual(202, self.cs.client.delete('/instances/1')[0]
+                         .status_code)
+        e = self.assertRaises(exceptions.NotFound, self.cs.client.get,
+                              '/instances/2')
+        self.assertEqual(b'\xff', e.response.content)
+        self.assertRaises(exceptions.CassetteMismatch, self.cs.client.get,
+                          '/instances/3')
+
+    def test_replay_latency(self):
+        server = http.server.ThreadingHTTPServer(('127.0.0.1', 0),
+                                                 SlowHandler)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        self.addCleanup(thread.join)
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        self.cs.client.management_url = 'http://127.0.0.1:%d/v1.0' % (
+            server.server_address[1])
+
+        cassette.record(self.cs, self.path)
+        self.cs.client.get('/flavors')
+        with open(self.path) as f:
+            elapsed = json.loads(f.readline())['elapsed']
+        self.assertGreaterEqual(elapsed, SlowHandler.delay)
+
+        cassette.replay(self.cs, self.path, latency=2)
+        with mock.patch('time.sleep') as m_sleep:
+            self.cs.client.get('/flavors')
+        m_sleep.assert_called_once_with(elapsed * 2)
+
+
+class SlowHandler(http.server.BaseHTTPRequestHandler):
+
+    delay = 0.2
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        time.sleep(self.delay)
+        body = b'{"flavors": []}'
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
@@ -0,0 +1,139 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from unittest import mock
+
+import fixtures
+import requests
+import testtools
+
+from troveclient import circuit_breaker
+from troveclient import client
+from troveclient import exceptions
+
+ENDPOINT = 'http://trove/v1.0/project'
+
+
+def make_error(status):
+    response = requests.Response()
+    response.status_code = status
+    return exceptions.from_response(response, 'GET', '/instances')
+
+
+class CircuitBreakerTest(testtools.TestCase):
+
+    def setUp(self):
+        super(CircuitBreakerTest, self).setUp()
+        self.now = self.useFixture(fixtures.MockPatch(
+            'time.monotonic', return_value=100)).mock
+        self.useFixture(fixtures.MockPatchObject(
+            circuit_breaker.CircuitBreaker, '_hooks_map', {}))
+        self.changes = []
+        circuit_breaker.CircuitBreaker.add_hook(
+            'state_change', lambda *args: self.changes.append(args))
+        self.breaker = circuit_breaker.CircuitBreaker(failure_threshold=2,
+                                                      reset_timeout=10)
+
+    def _fail_with(self, error):
+        def request():
+            raise error
+        self.assertRaises(type(error), self.breaker.call, ENDPOINT, request)
+
+    def test_opens_after_consecutive_failures(self):
+        self._fail_with(make_error(503))
+        self.breaker.call(ENDPOINT, mock.Mock())
+        self._fail_with(requests.exceptions.ConnectionError())
+        self.assertEqual(circuit_breaker.CLOSED, self.breaker.state(ENDPOINT))
+        self._fail_with(requests.exceptions.ReadTimeout())
+        self.assertEqual(circuit_breaker.OPEN, self.breaker.state(ENDPOINT))
+        self.assertEqual([(ENDPOINT, 'closed', 'open')], self.changes)
+
+        request = mock.Mock()
+        e = self.assertRaises(exceptions.CircuitOpen, self.breaker.call,
+                              ENDPOINT, request)
+        self.assertEqual(ENDPOINT, e.endpoint)
+        self.assertEqual(10, e.retry_after)
+        request.assert_not_called()
+        # Other endpoints are not affected.
+        self.breaker.call('http://other', request)
+        request.assert_called_once_with()
+
+    def test_client_errors_are_not_failures(self):
+        for _i in range(3):
+            self._fail_with(make_error(404))
+        self.assertEqual(circuit_breaker.CLOSED, self.breaker.state(ENDPOINT))
+        self._fail_with(make_error(429))
+        self._fail_with(make_error(500))
+        self.assertEqual(circuit_breaker.OPEN, self.breaker.state(ENDPOINT))
+
+    def test_half_open(self):
+        self._fail_with(make_error(500))
+        self._fail_with(make_error(500))
+        self.now.return_value = 110
+        self.breaker.before_request(ENDPOINT)
+        self.assertEqual(circuit_breaker.HALF_OPEN,
+                         self.breaker.state(ENDPOINT))
+        # Only one probe at a time.
+        self.assertRaises(exceptions.CircuitOpen,
+                          self.breaker.before_request, ENDPOINT)
+        self.breaker.record(ENDPOINT, True)
+        self.assertEqual(circuit_breaker.OPEN, self.breaker.state(ENDPOINT))
+
+        self.now.return_value = 120
+        self.breaker.call(ENDPOINT, mock.Mock())
+        self.assertEqual(circuit_breaker.CLOSED, self.breaker.state(ENDPOINT))
+        self.assertEqual([(ENDPOINT, 'closed', 'open'),
+                          (ENDPOINT, 'open', 'half-open'),
+                          (ENDPOINT, 'half-open', 'open'),
+                          (ENDPOINT, 'open', 'half-open'),
+                          (ENDPOINT, 'half-open', 'closed')], self.changes)
+
+
+class HTTPClientCircuitBreakerTest(testtools.TestCase):
+
+    def setUp(self):
+        super(HTTPClientCircuitBreakerTest, self).setUp()
+        self.useFixture(fixtures.MockPatch(
+            'troveclient.client.sleep_lib.sleep'))
+        self.breaker = circuit_breaker.CircuitBreaker(failure_threshold=2)
+        self.http_client = client.HTTPClient(
+            'user', 'password', 'project', 'http://auth', retries=5,
+            circuit_breaker=self.breaker)
+        self.http_client.management_url = ENDPOINT
+        self.http_client.auth_token = 'token'
+        self.http_client.request = mock.Mock(side_effect=make_error(503))
+
+    def test_fails_fast(self):
+        self.assertRaises(exceptions.CircuitOpen,
+                          self.http_client.get, '/instances')
+        self.assertEqual(2, self.http_client.request.call_count)
+        self.assertRaises(exceptions.CircuitOpen,
+                          self.http_client.delete, '/instances/1')
+        self.assertEqual(2, self.http_client.request.call_count)
+
+
+class SessionClientCircuitBreakerTest(testtools.TestCase):
+
+    def test_fails_fast(self):
+        breaker = circuit_breaker.CircuitBreaker(failure_threshold=1)
+        session = mock.Mock()
+        session.get_endpoint.return_value = ENDPOINT
+        response = requests.Response()
+        response.status_code = 502
+        session.request.return_value = response
+        session_client = client.SessionClient(session, mock.Mock(),
+                                              circuit_breaker=breaker)
+        self.assertRaises(exceptions.BadGateway,
+                          session_client.get, '/instances')
+        self.assertRaises(exceptions.CircuitOpen,
+                          session_client.get, '/instances')
+        self.assertEqual(1, session.request.call_count)
@@ -15,13 +15,18 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import gzip
+import json
 from unittest import mock
 
 import fixtures
 from keystoneauth1 import adapter
 import logging
 import requests
+import subprocess
+import sys
 import testtools
+from testtools import content
 
 from troveclient.apiclient import client
 from troveclient import client as other_client
@@ -75,12 +80,73 @@ class ClientTest(testtools.TestCase):
             'x-server-management-url': 'blah.com',
             'x-auth-token': 'blah',
         }
-        with mock.patch('requests.request', mock_request):
+        with mock.patch('requests.Session.request', mock_request):
             instance.authenticate()
-            requests.request.assert_called_with(
+            mock_request.assert_called_with(
                 mock.ANY, mock.ANY, timeout=2, headers=mock.ANY,
                 verify=mock.ANY)
 
+    def test_client_reuses_session(self):
+        instance = other_client.HTTPClient(user='user',
+                                           password='password',
+                                           projectid='project',
+                                           auth_url="http://www.blah.com")
+        instance.auth_token = 'foobar'
+        instance.management_url = 'http://example.com'
+        mock_request = mock.Mock()
+        mock_request.return_value = requests.Response()
+        mock_request.return_value.status_code = 200
+        with mock.patch('requests.Session.request', mock_request):
+            session = instance.http_session
+            instance.get('/instances')
+            instance.get('/backups')
+            self.assertEqual(2, mock_request.call_count)
+            self.assertIs(session, instance.http_session)
+
+    def test_client_connection_pool_size(self):
+        instance = other_client.HTTPClient(user='user',
+                                           password='password',
+                                           projectid='project',
+                                           auth_url="http://www.blah.com",
+                                           pool_connections=4,
+                                           pool_maxsize=32)
+        for prefix in ('http://', 'https://'):
+            http_adapter = instance.http_session.get_adapter(prefix + 'a.b')
+            self.assertEqual(4, http_adapter._pool_connections)
+            self.assertEqual(32, http_adapter._pool_maxsize)
+
+    def test_client_compresses_large_bodies(self):
+        instance = other_client.HTTPClient(user='user',
+                                           password='password',
+                                           projectid='project',
+                                           auth_url="http://www.blah.com",
+                                           compression_threshold=100)
+        instance.management_url = 'http://trove/v1.0/project'
+        instance.auth_token = 'token'
+        mock_request = mock.Mock(return_value=requests.Response())
+        mock_request.return_value.status_code = 202
+        with mock.patch.object(instance.http_session, 'request',
+                               mock_request):
+            instance.post('/modules', body={'contents': 'x' * 100})
+            kwargs = mock_request.call_args[1]
+            self.assertEqual('gzip', kwargs['headers']['Content-Encoding'])
+            self.assertEqual('gzip, deflate',
+                             kwargs['headers']['Accept-Encoding'])
+            self.assertEqual({'contents': 'x' * 100},
+                             json.loads(gzip.decompress(kwargs['data'])))
+
+            instance.post('/modules', body={'contents': 'x'})
+            kwargs = mock_request.call_args[1]
+            self.assertNotIn('Content-Encoding', kwargs['headers'])
+            self.assertEqual({'contents': 'x'}, json.loads(kwargs['data']))
+
+    def test_client_close(self):
+        cs = troveclient.v1.client.Client(auth_url="http://www.blah.com")
+        with mock.patch.object(cs.client.http_session, 'close') as m_close:
+            with cs:
+                pass
+            m_close.assert_called_once_with()
+
     def test_client_unauthorized(self):
         instance = other_client.HTTPClient(user='user',
                                            password='password',
@@ -94,7 +160,7 @@ class ClientTest(testtools.TestCase):
         instance.version = 'v2.0'
         mock_request = mock.Mock()
         mock_request.side_effect = other_client.exceptions.Unauthorized(401)
-        with mock.patch('requests.request', mock_request):
+        with mock.patch('requests.Session.request', mock_request):
             self.assertRaises(
                 exceptions.Unauthorized, instance.get, '/instances')
 
@@ -110,7 +176,7 @@ class ClientTest(testtools.TestCase):
         instance.version = 'v2.0'
         mock_request = mock.Mock()
         mock_request.side_effect = other_client.exceptions.BadRequest()
-        with mock.patch('requests.request', mock_request):
+        with mock.patch('requests.Session.request', mock_request):
             self.assertRaises(
                 exceptions.BadRequest, instance.get, '/instances')
 
@@ -129,7 +195,7 @@ class ClientTest(testtools.TestCase):
         mock_request.side_effect = other_client.exceptions.ClientException()
         type(mock_request.side_effect).code = mock.PropertyMock(
             side_effect=[501, 111])
-        with mock.patch('requests.request', mock_request):
+        with mock.patch('requests.Session.request', mock_request):
             self.assertRaises(
                 exceptions.ClientException, instance.get, '/instances')
 
@@ -147,7 +213,7 @@ class ClientTest(testtools.TestCase):
         mock_request = mock.Mock()
         mock_request.side_effect = requests.exceptions.ConnectionError(
             'connection refused')
-        with mock.patch('requests.request', mock_request):
+        with mock.patch('requests.Session.request', mock_request):
             self.assertRaisesRegex(
                 exceptions.ClientException,
                 'Unable to establish connection: connection refused',
@@ -248,12 +314,13 @@ class ClientTest(testtools.TestCase):
             'x-auth-token': 'blah',
         }
 
-        with mock.patch('requests.request', mock_request):
+        with mock.patch('requests.Session.request', mock_request):
             instance.authenticate()
             mock_request.assert_called_with(
                 'GET', auth_url + '/tokens/foobar?belongsTo=user',
                 headers={'User-Agent': 'python-troveclient',
                          'Accept': 'application/json',
+                         'Accept-Encoding': 'gzip, deflate',
                          'X-Auth-Token': proxy_token},
                 timeout=2, verify=True)
 
@@ -284,7 +351,7 @@ class ClientTest(testtools.TestCase):
             'x-auth-token': 'blah',
         }
 
-        with mock.patch('requests.request', mock_request):
+        with mock.patch('requests.Session.request', mock_request):
             self.assertRaises(exceptions.AuthorizationFailure,
                               instance.authenticate)
 
@@ -315,7 +382,7 @@ class ClientTest(testtools.TestCase):
             'x-auth-token': 'blah',
         }
 
-        with mock.patch('requests.request', mock_request):
+        with mock.patch('requests.Session.request', mock_request):
             self.assertRaises(exceptions.EndpointNotFound,
                               instance.authenticate)
 
@@ -345,7 +412,7 @@ class ClientTest(testtools.TestCase):
             'x-auth-token': 'blah',
         }
 
-        with mock.patch('requests.request', mock_request):
+        with mock.patch('requests.Session.request', mock_request):
             self.assertRaises(exceptions.NoTokenLookupException,
                               instance.authenticate)
 
@@ -371,8 +438,9 @@ class ClientTest(testtools.TestCase):
         }
         headers = {'Content-Type': 'application/json',
                    'Accept': 'application/json',
+                   'Accept-Encoding': 'gzip, deflate',
                    'User-Agent': 'python-troveclient'}
-        with mock.patch('requests.request', mock_request):
+        with mock.patch('requests.Session.request', mock_request):
             instance.authenticate()
             called_args, called_kwargs = mock_request.call_args
             self.assertEqual(('POST', 'http://www.blah.com/v2.0/tokens'),
@@ -480,10 +548,65 @@ class ClientTest(testtools.TestCase):
             'x-server-management-url': 'blah.com',
             'x-auth-token': 'blah',
         }
-        with mock.patch('requests.request', mock_request):
+        with mock.patch('requests.Session.request', mock_request):
             self.assertIsInstance(other_client._construct_http_client(),
                                   other_client.HTTPClient)
             self.assertIsInstance(
                 other_client._construct_http_client(session=mock.Mock(),
                                                     auth=mock.Mock()),
                 other_client.SessionClient)
+
+
+class ImportTimeTest(testtools.TestCase):
+    """Check what importing and using the v1 client costs at startup."""
+
+    HEAVY_MODULES = ('swiftclient', 'mistralclient', 'openstackclient',
+                     'troveclient.v1.instances', 'troveclient.v1.backups')
+
+    def _run(self, code):
+        """Run ``code`` in a fresh interpreter with import timing on.
+
+        :returns: the lines printed by ``code`` and the time in
+                  microseconds spent importing each top-level module.
+        """
+        proc = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', code],
+            stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+            universal_newlines=True, check=True)
+        timings = {}
+        for line in proc.stderr.splitlines():
+            if not line.startswith('import time:'):
+                continue
+            self_us, cumulative, name = line[len('import time:'):].split('|')
+            if cumulative.strip().isdigit():
+                timings[name.strip()] = int(cumulative)
+        return proc.stdout.split(), timings
+
+    def test_import_is_lazy(self):
+        loaded, timings = self._run(
+            'import sys\n'
+            'import troveclient.v1.client\n'
+            'print(" ".join(m for m in %r if m in sys.modules))'
+            % (self.HEAVY_MODULES,))
+        self.addDetail('import-time-us', content.text_content(
+            str(timings['troveclient.v1.client'])))
+        self.assertEqual([], loaded)
+
+    def test_shell_import_is_lazy(self):
+        loaded, _timings = self._run(
+            'import sys\n'
+            'import troveclient.shell\n'
+            'print(" ".join(m for m in %r if m in sys.modules))'
+            % (('troveclient.circuit_breaker', 'troveclient.response_cache',
+                'troveclient.token_cache'),))
+        self.assertEqual([], loaded)
+
+    def test_manager_import_on_access(self):
+        loaded, _timings = self._run(
+            'import sys\n'
+            'from troveclient.v1 import client\n'
+            'cs = client.Client(auth_url="http://www.blah.com")\n'
+            'assert cs.instances is cs.instances\n'
+            'print(" ".join(m for m in %r if m in sys.modules))'
+            % (self.HEAVY_MODULES,))
+        self.assertEqual(['troveclient.v1.instances'], loaded)
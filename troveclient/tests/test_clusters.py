@@ -104,7 +104,8 @@ class ClustersTest(testtools.TestCase):
         limit = "test-limit"
         marker = "test-marker"
         clusters_test.list(limit, marker)
-        page_mock.assert_called_with("/clusters", "clusters", limit, marker)
+        page_mock.assert_called_with("/clusters", "clusters", limit, marker,
+                                     all_pages=False, prefetch=False)
 
     @mock.patch.object(base, 'getid', return_value="cluster1")
     def test_get(self, mock_id):
@@ -0,0 +1,111 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import os
+from unittest import mock
+
+import fixtures
+import testtools
+
+from troveclient import base
+from troveclient import completion
+
+UUID1 = '8e8ec658-c7b0-4243-bdf8-6f7f2952c0d0'
+UUID2 = '2c4bb1a3-92d6-4ba1-b2b1-6c8b8e2d64f7'
+
+
+class Instance(base.Resource):
+    HUMAN_ID = True
+
+
+class CompletionIndexTest(testtools.TestCase):
+
+    def setUp(self):
+        super(CompletionIndexTest, self).setUp()
+        self.path = os.path.join(
+            self.useFixture(fixtures.TempDir()).path, 'cache', 'index.db')
+        self.index = completion.CompletionIndex(self.path)
+
+    def test_values_without_store(self):
+        self.assertEqual([], self.index.values('instance'))
+        self.index.remove('instance', UUID1)
+        self.assertFalse(os.path.exists(self.path))
+
+    def test_update(self):
+        self.index.update('instance', 'uuid', [(UUID1, UUID1)])
+        self.index.update('instance', 'uuid', [(UUID1, UUID1)])
+        self.index.update('instance', 'human_id', [('db-1', UUID1)])
+        self.index.update('backup', 'uuid', [(UUID2, UUID2)])
+        self.assertEqual(sorted(['db-1', UUID1]),
+                         self.index.values('instance'))
+        self.assertEqual([UUID1], self.index.values('instance', 'uuid'))
+
+        self.index.update('instance', 'uuid', [(UUID2, UUID2)],
+                          replace=True)
+        self.assertEqual([UUID2], self.index.values('instance', 'uuid'))
+        self.assertEqual(['db-1'], self.index.values('instance', 'human_id'))
+        self.assertEqual([UUID2], self.index.values('backup'))
+
+    def test_remove(self):
+        self.index.update('instance', 'uuid',
+                          [(UUID1, UUID1), (UUID2, UUID2)])
+        self.index.update('instance', 'human_id',
+                          [('db-1', UUID1), ('db-2', UUID2)])
+        self.index.remove('instance', UUID1)
+        self.assertEqual(sorted(['db-2', UUID2]),
+                         self.index.values('instance'))
+
+    def test_unwritable_store(self):
+        self.useFixture(fixtures.MonkeyPatch(
+            'sqlite3.connect', mock.Mock(side_effect=OSError)))
+        self.index.update('instance', 'uuid', [(UUID1, UUID1)])
+        self.assertEqual([], self.index.values('instance'))
+
+
+class ManagerCompletionCacheTest(testtools.TestCase):
+
+    def setUp(self):
+        super(ManagerCompletionCacheTest, self).setUp()
+        self.useFixture(fixtures.EnvironmentVariable(
+            'TROVECLIENT_UUID_CACHE_DIR',
+            self.useFixture(fixtures.TempDir()).path))
+        self.index = completion.CompletionIndex.default()
+        self.manager = base.Manager(mock.Mock())
+        self.manager.resource_class = Instance
+
+    def _list(self, *names):
+        self.manager.api.client.get.return_value = (None, {'instances': [
+            {'id': UUID1 if name == 'db-1' else UUID2, 'name': name}
+            for name in names]})
+        return self.manager._list('/instances', 'instances')
+
+    def test_list_replaces_cache(self):
+        self._list('db-1', 'db-2')
+        self.assertEqual(sorted(['db-1', 'db-2', UUID1, UUID2]),
+                         self.index.values('instance'))
+        self._list('db-2')
+        self.assertEqual(sorted(['db-2', UUID2]),
+                         self.index.values('instance'))
+
+    def test_failed_list_keeps_cache(self):
+        self._list('db-1')
+        self.manager.api.client.get.side_effect = RuntimeError
+        self.assertRaises(RuntimeError, self._list)
+        self.assertEqual(sorted(['db-1', UUID1]),
+                         self.index.values('instance'))
+
+    def test_delete_removes_entries(self):
+        self._list('db-1', 'db-2')
+        self.manager.api.client.delete.return_value = (None, None)
+        self.manager._delete('/instances/%s' % UUID1)
+        self.assertEqual(sorted(['db-2', UUID2]),
+                         self.index.values('instance'))
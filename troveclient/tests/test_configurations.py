@@ -102,7 +102,8 @@ class ConfigurationsTest(testtools.TestCase):
         marker = "test-marker"
         self.configurations.list(limit, marker)
         page_mock.assert_called_with("/configurations", "configurations",
-                                     limit, marker)
+                                     limit, marker,
+                                     all_pages=False, prefetch=False)
 
     def test_get(self):
         def side_effect_func(path, config):
@@ -88,9 +88,11 @@ class DatabasesTest(testtools.TestCase):
         self.databases._paginated = page_mock
         self.databases.list('instance1')
         page_mock.assert_called_with('/instances/instance1/databases',
-                                     'databases', None, None)
+                                     'databases', None, None,
+                                     all_pages=False, prefetch=False)
         limit = 'test-limit'
         marker = 'test-marker'
         self.databases.list('instance1', limit, marker)
         page_mock.assert_called_with('/instances/instance1/databases',
-                                     'databases', limit, marker)
+                                     'databases', limit, marker,
+                                     all_pages=False, prefetch=False)
@@ -72,9 +72,11 @@ class DatastoresTest(testtools.TestCase):
         marker = "test-marker"
         self.datastores.list(limit, marker)
         page_mock.assert_called_with("/datastores", "datastores",
-                                     limit, marker)
+                                     limit, marker,
+                                     all_pages=False, prefetch=False)
         self.datastores.list()
-        page_mock.assert_called_with("/datastores", "datastores", None, None)
+        page_mock.assert_called_with("/datastores", "datastores", None, None,
+                                     all_pages=False, prefetch=False)
 
     def test_get(self):
         def side_effect_func(path, inst):
@@ -113,7 +115,8 @@ class DatastoreVersionsTest(testtools.TestCase):
         marker = "test-marker"
         self.datastore_versions.list("datastore1", limit, marker)
         page_mock.assert_called_with("/datastores/datastore1/versions",
-                                     "versions", limit, marker)
+                                     "versions", limit, marker,
+                                     all_pages=False, prefetch=False)
 
     def test_get(self):
         def side_effect_func(path, inst):
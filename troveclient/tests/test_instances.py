@@ -15,11 +15,14 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import threading
 from unittest import mock
 
+import fixtures
 import testtools
 
 from troveclient import base
+from troveclient import exceptions
 from troveclient.v1 import instances
 
 """
@@ -125,7 +128,8 @@ class InstancesTest(testtools.TestCase):
         include_clustered = {'include_clustered': False}
         self.instances.list(limit, marker)
         page_mock.assert_called_with("/instances", "instances", limit, marker,
-                                     include_clustered)
+                                     include_clustered,
+                                     all_pages=False, prefetch=False)
 
     def test_detailed_list(self):
         page_mock = mock.Mock()
@@ -135,7 +139,8 @@ class InstancesTest(testtools.TestCase):
         include_clustered = {'include_clustered': False}
         self.instances.list(limit, marker, detailed=True)
         page_mock.assert_called_with("/instances/detail", "instances", limit,
-                                     marker, include_clustered)
+                                     marker, include_clustered,
+                                     all_pages=False, prefetch=False)
 
     def test_get(self):
         def side_effect_func(path, inst):
@@ -293,6 +298,124 @@ class InstancesTest(testtools.TestCase):
                          self.instances.configuration('instance1'))
 
 
+class FakeSwift(object):
+    """In-memory Swift container holding the parts of a guest log."""
+
+    def __init__(self, parts):
+        # parts: list of (name, content) in chronological order
+        self.parts = dict(parts)
+        self.listing = [{'name': name, 'last_modified': '2020-01-%02d' % i}
+                        for i, (name, content) in enumerate(parts)]
+        self.chunk_sizes = []
+        self.ranges = []
+        self.threads = set()
+
+    def add(self, name, content):
+        if name not in self.parts:
+            self.listing.append({'name': name, 'last_modified': '2020-02-%s'
+                                 % name})
+        self.parts[name] = self.parts.get(name, b'') + content
+
+    def get_container(self, container, prefix=None, marker=None):
+        return {}, [obj for obj in self.listing
+                    if marker is None or obj['name'] > marker]
+
+    def head_object(self, container, name):
+        lines = len(self.parts[name].splitlines())
+        return {'x-object-meta-lines': str(lines),
+                'content-length': str(len(self.parts[name]))}
+
+    def get_object(self, container, name, resp_chunk_size=None,
+                   headers=None):
+        self.threads.add(threading.current_thread().name)
+        self.chunk_sizes.append(resp_chunk_size)
+        self.ranges.append((headers or {}).get('Range'))
+        data = self.parts[name]
+        if headers:
+            data = data[int(headers['Range'][6:-1]):]
+        return {}, (data[i:i + resp_chunk_size]
+                    for i in range(0, len(data), resp_chunk_size))
+
+
+class InstanceLogGeneratorTest(testtools.TestCase):
+
+    def setUp(self):
+        super(InstanceLogGeneratorTest, self).setUp()
+        self.instances = instances.Instances(mock.Mock())
+        self.instances.log_show = mock.Mock(return_value=mock.Mock(
+            container='logs', prefix='p', metafile='meta'))
+        self.instances._clone_swift_client = lambda swift: swift
+        # 'é' is two bytes long, so chunks split characters apart.
+        self.swift = FakeSwift([
+            ('p-1', 'one\ntwo\nthré\n'.encode('utf-8')),
+            ('p-2', 'four\nfivé\n'.encode('utf-8')),
+            ('p-3', 'six\nseven\n'.encode('utf-8')),
+        ])
+
+    def _log(self, **kwargs):
+        gen = self.instances.log_generator('inst', 'general',
+                                           swift=self.swift, **kwargs)
+        return ''.join(gen())
+
+    def test_all_lines(self):
+        self.assertEqual('one\ntwo\nthré\nfour\nfivé\nsix\nseven\n',
+                         self._log(lines=0, chunk_size=3))
+        self.assertEqual([3, 3, 3], self.swift.chunk_sizes)
+
+    def test_last_lines(self):
+        self.assertEqual('fivé\nsix\nseven\n',
+                         self._log(lines=3, chunk_size=3))
+        self.assertEqual('thré\nfour\nfivé\nsix\nseven\n',
+                         self._log(lines=5, chunk_size=4))
+        self.assertEqual('one\ntwo\nthré\nfour\nfivé\nsix\nseven\n',
+                         self._log(lines=50))
+
+    def test_parallel_keeps_order(self):
+        self.assertEqual('one\ntwo\nthré\nfour\nfivé\nsix\nseven\n',
+                         self._log(lines=0, chunk_size=2, concurrency=3))
+        self.assertEqual('thré\nfour\nfivé\nsix\nseven\n',
+                         self._log(lines=5, chunk_size=2, concurrency=2))
+        self.assertNotIn(threading.current_thread().name, self.swift.threads)
+
+    def test_log_save(self):
+        path = self.useFixture(fixtures.TempDir()).path + '/log'
+        self.instances._get_swift_client = mock.Mock(return_value=self.swift)
+        self.instances.log_save(mock.Mock(id='1'), 'general', filename=path,
+                                concurrency=2)
+        with open(path) as f:
+            self.assertEqual(
+                'one\ntwo\nthré\nfour\nfivé\nsix\nseven\n', f.read())
+
+    @mock.patch('time.sleep')
+    def test_follow(self, mock_sleep):
+        updates = [
+            # The latest part grows.
+            lambda: self.swift.add('p-3', b'eight\nni'),
+            # Nothing changes.
+            lambda: None,
+            # The latest part grows and a new part is published.
+            lambda: (self.swift.add('p-3', b'ne\n'),
+                     self.swift.add('p-4', b'ten\n')),
+        ]
+        mock_sleep.side_effect = lambda interval: updates.pop(0)()
+        gen = self.instances.log_generator('inst', 'general', lines=2,
+                                           swift=self.swift, follow=True,
+                                           follow_interval=7)()
+        output = ''
+        while updates:
+            output += next(gen)
+        output += next(gen)
+        self.assertEqual('six\nseven\neight\nnine\nten\n', output)
+        mock_sleep.assert_called_with(7)
+        # Only the appended bytes of the latest part are fetched again.
+        self.assertEqual([None, 'bytes=10-', 'bytes=18-', None],
+                         self.swift.ranges)
+
+    def test_tail_lines(self):
+        self.assertEqual(['b', '', 'c'],
+                         instances._tail_lines(['a\r', '\nb\n\r', '\nc'], 3))
+
+
 class InstanceStatusTest(testtools.TestCase):
 
     def test_constants(self):
@@ -305,3 +428,43 @@ class InstanceStatusTest(testtools.TestCase):
         self.assertEqual("SHUTDOWN", instances.InstanceStatus.SHUTDOWN)
         self.assertEqual("RESTART_REQUIRED",
                          instances.InstanceStatus.RESTART_REQUIRED)
+
+
+class InstancesResolutionTest(testtools.TestCase):
+
+    def setUp(self):
+        super(InstancesResolutionTest, self).setUp()
+        self.api = mock.Mock()
+        self.api.resolution_index = base.ResolutionIndex(ttl=30)
+        self.api.request_coalescer = None
+        self.api.compact_resources = False
+        self.instance = {'id': 'i1', 'name': 'old'}
+        self.listings = 0
+        self.api.client.get.side_effect = self._get
+        self.api.client.put.side_effect = self._put
+        self.api.client.patch.return_value = (
+            mock.Mock(status_code=202), None)
+        self.instances = instances.Instances(self.api)
+
+    def _get(self, url, **kwargs):
+        if url.startswith('/instances/'):
+            return None, {'instance': dict(self.instance)}
+        self.listings += 1
+        return None, {'instances': [dict(self.instance)]}
+
+    def _put(self, url, body=None):
+        self.instance.update(body['instance'])
+        return mock.Mock(status_code=202), None
+
+    def test_find_after_rename(self):
+        self.assertEqual('i1', self.instances.find(name='old').id)
+        self.instances.update('i1', name='new')
+        self.assertEqual('i1', self.instances.find(name='new').id)
+        self.assertRaises(exceptions.NotFound, self.instances.find,
+                          name='old')
+
+    def test_upgrade_invalidates(self):
+        self.instances.find(name='old')
+        self.instances.upgrade('i1', 'v2')
+        self.instances.find(name='old')
+        self.assertEqual(2, self.listings)
@@ -0,0 +1,96 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import json
+from unittest import mock
+
+import requests
+import testtools
+
+from troveclient import client
+from troveclient import jsonutils
+
+
+class JsonUtilsTest(testtools.TestCase):
+
+    def setUp(self):
+        super(JsonUtilsTest, self).setUp()
+        self.addCleanup(jsonutils.set_backend, jsonutils.get_backend())
+
+    def test_backends(self):
+        for backend in ('json', jsonutils.get_backend()):
+            jsonutils.set_backend(backend)
+            data = jsonutils.dumps({'name': 'café', 'size': 1})
+            self.assertIsInstance(data, bytes)
+            self.assertEqual({'name': 'café', 'size': 1},
+                             jsonutils.loads(data))
+            self.assertEqual([1], jsonutils.loads('[1]'))
+            self.assertRaises(ValueError, jsonutils.loads, b'{')
+            # Only the standard library accepts non string keys.
+            self.assertEqual({'1': 'one'},
+                             jsonutils.loads(jsonutils.dumps({1: 'one'})))
+
+    def test_missing_backend(self):
+        self.assertRaises(ImportError, jsonutils.set_backend, 'nojson')
+
+
+class ListStreamTest(testtools.TestCase):
+
+    def test_items_and_members(self):
+        body = {'links': [{'rel': 'next'}],
+                'instances': [{'id': '1', 'tags': ['a, b]']}, {'id': '2'}],
+                'count': 2}
+        for data in (json.dumps(body).encode('utf-8'),
+                     json.dumps(body, indent=4)):
+            stream = jsonutils.ListStream(data, 'instances')
+            items = stream['instances']
+            self.assertEqual({'id': '1', 'tags': ['a, b]']}, next(items))
+            self.assertEqual([{'id': '2'}], list(items))
+            self.assertEqual(body['links'], stream.get('links'))
+            self.assertEqual(2, stream['count'])
+            self.assertIsNone(stream.get('missing'))
+
+    def test_empty_list(self):
+        stream = jsonutils.ListStream(b'{"instances": [ ]}', 'instances')
+        self.assertEqual([], list(stream['instances']))
+
+    def test_missing_key(self):
+        stream = jsonutils.ListStream(b'{"flavors": []}', 'instances')
+        self.assertRaises(KeyError, list, stream['instances'])
+
+    def test_invalid(self):
+        for data in (b'[]', b'{"instances": {}}', b'{"instances": [1, 2',
+                     b'{"instances": [1 2]}'):
+            stream = jsonutils.ListStream(data, 'instances')
+            self.assertRaises(ValueError, list, stream['instances'])
+
+
+class HTTPClientStreamTest(testtools.TestCase):
+
+    def test_stream_key(self):
+        http_client = client.HTTPClient('user', 'password', 'project',
+                                        'http://auth')
+        http_client.management_url = 'http://trove/v1.0/project'
+        http_client.auth_token = 'token'
+        resp = requests.Response()
+        resp.status_code = 200
+        resp._content = b'{"instances": [{"id": "1"}], "links": []}'
+        with mock.patch.object(http_client.http_session, 'request',
+                               return_value=resp):
+            _resp, body = http_client.get('/instances',
+                                          stream_key='instances')
+            self.assertIsInstance(body, jsonutils.ListStream)
+            self.assertEqual([{'id': '1'}], list(body['instances']))
+
+            _resp, body = http_client.get('/instances')
+            self.assertEqual({'instances': [{'id': '1'}], 'links': []},
+                             body)
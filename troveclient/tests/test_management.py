@@ -79,11 +79,13 @@ class ManagementTest(testtools.TestCase):
 
         self.management.list(deleted=True)
         page_mock.assert_called_with('/mgmt/instances', 'instances', None,
-                                     None, query_strings={'deleted': True})
+                                     None, query_strings={'deleted': True},
+                                     all_pages=False, prefetch=False)
 
         self.management.list(deleted=False, limit=10, marker="foo")
         page_mock.assert_called_with('/mgmt/instances', 'instances', 10, "foo",
-                                     query_strings={"deleted": False})
+                                     query_strings={"deleted": False},
+                                     all_pages=False, prefetch=False)
 
     def test_index(self):
         """index() is just wrapper for list()"""
@@ -92,11 +94,13 @@ class ManagementTest(testtools.TestCase):
 
         self.management.index(deleted=True)
         page_mock.assert_called_with('/mgmt/instances', 'instances', None,
-                                     None, query_strings={'deleted': True})
+                                     None, query_strings={'deleted': True},
+                                     all_pages=False, prefetch=False)
 
         self.management.index(deleted=False, limit=10, marker="foo")
         page_mock.assert_called_with('/mgmt/instances', 'instances', 10, "foo",
-                                     query_strings={"deleted": False})
+                                     query_strings={"deleted": False},
+                                     all_pages=False, prefetch=False)
 
     def test_root_enabled_history(self):
         self.management.api.client.get = mock.Mock(return_value=('resp', None))
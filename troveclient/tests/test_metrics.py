@@ -0,0 +1,169 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import os
+import socket
+from unittest import mock
+
+import fixtures
+import requests
+import testtools
+
+from troveclient import client
+from troveclient import exceptions
+from troveclient import metrics
+from troveclient import retry
+
+
+def make_response(status, content=b'', sent=None):
+    resp = requests.Response()
+    resp.status_code = status
+    resp._content = content
+    resp.request = requests.PreparedRequest()
+    resp.request.body = sent
+    return resp
+
+
+class EndpointTemplateTest(testtools.TestCase):
+
+    def test_endpoint_template(self):
+        for method, url, expected in (
+                ('get', '/instances', 'GET /instances'),
+                ('GET', 'http://trove/v1.0/instances/1234?limit=1',
+                 'GET /{id}/instances/{id}'),
+                ('POST', '/instances/1234/action',
+                 'POST /instances/{id}/action'),
+                ('DELETE', '/instances/1/users/bob/databases/db',
+                 'DELETE /instances/{id}/users/{id}/databases/{id}'),
+                ('GET', '/datastores/versions/5.7/parameters',
+                 'GET /datastores/versions/{id}/parameters')):
+            self.assertEqual(expected,
+                             metrics.endpoint_template(method, url))
+
+
+class RequestMetricsTest(testtools.TestCase):
+
+    def test_snapshot(self):
+        exporter = mock.Mock()
+        recorder = metrics.RequestMetrics(buckets=(0.1, 1),
+                                          exporters=[exporter])
+        recorder.record('GET', '/instances/1', 200, 0.05, bytes_in=10)
+        recorder.record('GET', '/instances/2', 503, 0.5, bytes_out=2,
+                        retries=2)
+        recorder.record('GET', '/instances/3', None, 5)
+        recorder.record('GET', '/flavors', 200, 1)
+
+        snapshot = recorder.snapshot()
+        self.assertEqual(['GET /flavors', 'GET /instances/{id}'],
+                         sorted(snapshot))
+        stats = snapshot['GET /instances/{id}']
+        self.assertEqual(3, stats['count'])
+        self.assertEqual(2, stats['errors'])
+        self.assertEqual(2, stats['retries'])
+        self.assertEqual(2, stats['bytes_out'])
+        self.assertEqual(10, stats['bytes_in'])
+        self.assertEqual(5.55, stats['latency_sum'])
+        self.assertEqual(5, stats['latency_max'])
+        self.assertEqual({0.1: 1, 1: 2, float('inf'): 3}, stats['buckets'])
+        self.assertEqual({200: 1, 503: 1, 0: 1}, stats['statuses'])
+        self.assertEqual({1: 1, float('inf'): 1},
+                         {k: v for k, v in
+                          snapshot['GET /flavors']['buckets'].items() if v})
+
+        self.assertEqual(4, exporter.export.call_count)
+        sample = exporter.export.call_args_list[1][0][0]
+        self.assertEqual(('GET', 'GET /instances/{id}', 503, 0.5, 2, 0, 2),
+                         tuple(sample))
+        recorder.flush()
+        exporter.flush.assert_called_once_with(snapshot)
+
+    def test_prometheus_exporter(self):
+        path = os.path.join(self.useFixture(fixtures.TempDir()).path,
+                            'trove.prom')
+        exporter = metrics.PrometheusExporter(path)
+        recorder = metrics.RequestMetrics(buckets=(1,), exporters=[exporter])
+        recorder.record('GET', '/instances/1', 200, 0.5, bytes_in=10)
+        recorder.flush()
+        with open(path) as f:
+            text = f.read()
+        labels = 'method="GET",endpoint="/instances/{id}"'
+        for line in (
+                '# TYPE troveclient_request_duration_seconds histogram',
+                'troveclient_request_duration_seconds_bucket{%s,le="1"} 1',
+                'troveclient_request_duration_seconds_bucket{%s,le="+Inf"} 1',
+                'troveclient_request_duration_seconds_sum{%s} 0.5',
+                'troveclient_requests_total{%s,status="200"} 1',
+                'troveclient_request_bytes_in_total{%s} 10'):
+            self.assertIn(line.replace('%s', labels), text.splitlines())
+
+    def test_statsd_exporter(self):
+        server = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.addCleanup(server.close)
+        server.bind(('127.0.0.1', 0))
+        server.settimeout(5)
+        exporter = metrics.StatsdExporter('127.0.0.1',
+                                          server.getsockname()[1])
+        exporter.export(metrics.Sample('GET', 'GET /instances/{id}', 200,
+                                       0.25, 0, 10, 1))
+        self.assertEqual(
+            [b'troveclient.get_instances_id.latency:250|ms',
+             b'troveclient.get_instances_id.status.200:1|c',
+             b'troveclient.get_instances_id.bytes_out:0|c',
+             b'troveclient.get_instances_id.bytes_in:10|c',
+             b'troveclient.get_instances_id.retries:1|c'],
+            server.recv(4096).split(b'\n'))
+
+
+class HTTPClientMetricsTest(testtools.TestCase):
+
+    def setUp(self):
+        super(HTTPClientMetricsTest, self).setUp()
+        self.useFixture(fixtures.MockPatch(
+            'troveclient.client.sleep_lib.sleep'))
+        self.metrics = metrics.RequestMetrics()
+        self.http_client = client.HTTPClient(
+            'user', 'password', 'project', 'http://auth',
+            retry_policy=retry.RetryPolicy(retries=2, budget=None),
+            metrics=self.metrics)
+        self.http_client.management_url = 'http://trove/v1.0/project'
+        self.http_client.auth_token = 'token'
+        self.send = self.useFixture(fixtures.MockPatchObject(
+            self.http_client.http_session, 'request')).mock
+
+    def test_retried_request(self):
+        self.send.side_effect = [
+            make_response(503),
+            make_response(200, b'{"instance": {}}', sent=b'{"a": 1}')]
+        self.http_client.put('/instances/1234', body={'a': 1})
+        stats = self.metrics.snapshot()['PUT /instances/{id}']
+        self.assertEqual(1, stats['count'])
+        self.assertEqual(1, stats['retries'])
+        self.assertEqual(8, stats['bytes_out'])
+        self.assertEqual(16, stats['bytes_in'])
+        self.assertEqual({200: 1}, stats['statuses'])
+
+    def test_failed_request(self):
+        self.send.side_effect = [make_response(404)]
+        self.assertRaises(exceptions.NotFound,
+                          self.http_client.get, '/instances/1234')
+        self.send.side_effect = requests.exceptions.ConnectionError()
+        self.assertRaises(exceptions.ConnectionRefused,
+                          self.http_client.get, '/instances/1234')
+        stats = self.metrics.snapshot()['GET /instances/{id}']
+        self.assertEqual({404: 1, 0: 1}, stats['statuses'])
+        self.assertEqual(2, stats['errors'])
+
+    def test_close_flushes(self):
+        exporter = mock.Mock()
+        self.metrics.exporters.append(exporter)
+        self.http_client.close()
+        exporter.flush.assert_called_once_with({})
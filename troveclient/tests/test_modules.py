@@ -103,7 +103,8 @@ class TestModules(testtools.TestCase):
         marker = "test-marker"
         self.modules.list(limit, marker)
         page_mock.assert_called_with(
-            "/modules", "modules", limit, marker, query_strings=None)
+            "/modules", "modules", limit, marker, query_strings=None,
+            all_pages=False, prefetch=False)
 
     def test_get(self):
         def side_effect_func(path, inst):
@@ -135,7 +136,8 @@ class TestModules(testtools.TestCase):
                                **expected_query)
         page_mock.assert_called_with("/modules/mod_1/instances",
                                      "instances", limit, marker,
-                                     query_strings=expected_query)
+                                     query_strings=expected_query,
+                                     all_pages=False, prefetch=False)
 
     def test_instance_count(self):
         expected_query = {'include_clustered': True,
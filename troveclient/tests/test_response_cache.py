@@ -0,0 +1,188 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import json
+import os
+from unittest import mock
+
+import fixtures
+import requests
+import testtools
+
+from troveclient import base
+from troveclient import client
+from troveclient import exceptions
+from troveclient import response_cache
+from troveclient.v1 import datastores
+from troveclient.v1 import flavors
+from troveclient.v1 import management
+
+
+def make_response(status_code, body=None, etag=None):
+    resp = requests.Response()
+    resp.status_code = status_code
+    resp.encoding = 'utf-8'
+    if etag:
+        resp.headers['ETag'] = etag
+    resp._content = json.dumps(body).encode('utf-8') if body else b''
+    return resp
+
+
+class MemoryCacheTest(testtools.TestCase):
+
+    def setUp(self):
+        super(MemoryCacheTest, self).setUp()
+        self.time = self.useFixture(fixtures.MockPatch(
+            'time.time', return_value=1000)).mock
+        self.cache = self._make_cache()
+
+    def _make_cache(self):
+        return response_cache.MemoryCache(ttl=60, maxsize=2)
+
+    def _get(self, key, *responses):
+        headers = {}
+        send = mock.Mock(side_effect=responses)
+        resp = self.cache.request(key, headers, send)
+        return resp, headers, send.call_count
+
+    def test_fresh_response_is_reused(self):
+        self._get('a', make_response(200, {'a': 1}))
+        resp, headers, sent = self._get('a')
+        self.assertEqual(0, sent)
+        self.assertEqual({'a': 1}, resp.json())
+
+    def test_stale_response_is_revalidated(self):
+        self._get('a', make_response(200, {'a': 1}, etag='"v1"'))
+        self.time.return_value = 1100
+        resp, headers, sent = self._get('a', make_response(304))
+        self.assertEqual({'If-None-Match': '"v1"'}, headers)
+        self.assertEqual({'a': 1}, resp.json())
+        # The revalidated response is fresh again.
+        self.assertEqual(0, self._get('a')[2])
+
+        self.time.return_value = 1200
+        resp, headers, sent = self._get(
+            'a', make_response(200, {'a': 2}, etag='"v2"'))
+        self.assertEqual({'a': 2}, resp.json())
+        self.assertEqual({'a': 2}, self._get('a')[0].json())
+
+    def test_stale_response_without_etag_is_dropped(self):
+        self._get('a', make_response(200, {'a': 1}))
+        self.time.return_value = 1100
+        resp, headers, sent = self._get('a', make_response(200, {'a': 2}))
+        self.assertEqual({}, headers)
+        self.assertEqual({'a': 2}, resp.json())
+
+    def test_errors_are_not_cached(self):
+        self._get('a', make_response(404))
+        self.assertEqual(1, self._get('a', make_response(404))[2])
+
+    def test_least_recently_used_is_evicted(self):
+        self._get('a', make_response(200, {'a': 1}))
+        self._get('b', make_response(200, {'b': 1}))
+        self._get('a')
+        self._get('c', make_response(200, {'c': 1}))
+        self.assertEqual(0, self._get('a')[2])
+        self.assertEqual(1, self._get('b', make_response(200, {}))[2])
+
+    def test_clear(self):
+        self._get('a', make_response(200, {'a': 1}))
+        self.cache.clear()
+        self.assertEqual(1, self._get('a', make_response(200, {}))[2])
+
+
+class FileCacheTest(MemoryCacheTest):
+
+    def _make_cache(self):
+        self.directory = os.path.join(
+            self.useFixture(fixtures.TempDir()).path, 'cache')
+        return response_cache.FileCache(self.directory, ttl=60, maxsize=2)
+
+    def test_least_recently_used_is_evicted(self):
+        # The last use of a response is its file modification time.
+        self._get('a', make_response(200, {'a': 1}))
+        self._get('b', make_response(200, {'b': 1}))
+        os.utime(self.cache._path('b'), (1, 1))
+        self._get('c', make_response(200, {'c': 1}))
+        self.assertEqual(0, self._get('a')[2])
+        self.assertEqual(1, self._get('b', make_response(200, {}))[2])
+
+    def test_shared_between_instances(self):
+        self._get('a', make_response(200, {'a': 1}))
+        other = response_cache.FileCache(self.directory, ttl=60)
+        resp = other.request('a', {}, mock.Mock())
+        self.assertEqual({'a': 1}, resp.json())
+        self.assertEqual(0o600, os.stat(self.cache._path('a')).st_mode & 0o777)
+
+
+class ClientResponseCacheTest(testtools.TestCase):
+
+    def setUp(self):
+        super(ClientResponseCacheTest, self).setUp()
+        self.http_client = client.HTTPClient(
+            'user', 'password', 'project', 'http://auth',
+            response_cache=response_cache.MemoryCache())
+        self.http_client.management_url = 'http://trove/v1.0/project'
+        self.http_client.auth_token = 'token'
+        self.request = self.useFixture(fixtures.MockPatchObject(
+            self.http_client.http_session, 'request')).mock
+        self.request.return_value = make_response(
+            200, {'flavors': [{'id': '1', 'name': 'small'}]})
+        self.flavors = flavors.Flavors(mock.Mock(client=self.http_client))
+
+    def test_opted_in_manager_is_cached(self):
+        self.assertEqual('small', self.flavors.list()[0].name)
+        self.assertEqual('small', self.flavors.list()[0].name)
+        self.assertEqual(1, self.request.call_count)
+
+    def test_manager_opt_out(self):
+        self.flavors.cache_responses = False
+        self.flavors.list()
+        self.flavors.list()
+        self.assertEqual(2, self.request.call_count)
+
+    def test_changes_clear_cache(self):
+        self.flavors.list()
+        self.request.return_value = make_response(202)
+        self.flavors._delete('/flavors/1')
+        self.request.return_value = make_response(200, {'flavors': []})
+        self.assertEqual([], self.flavors.list())
+
+    def test_changes_through_other_managers_clear_cache(self):
+        self.flavors.list()
+        self.request.return_value = make_response(
+            200, {'flavor': {'id': '2', 'name': 'large'}})
+        mgmt_flavors = management.MgmtFlavors(
+            mock.Mock(client=self.http_client))
+        mgmt_flavors.create('large', 1024, 10, 1)
+        self.request.return_value = make_response(200, {'flavors': []})
+        self.assertEqual([], self.flavors.list())
+
+    def test_failed_change_clears_cache(self):
+        self.flavors.list()
+        self.request.return_value = make_response(
+            400, {'badRequest': {'message': 'bad', 'code': 400}})
+        self.assertRaises(exceptions.BadRequest, self.http_client.put,
+                          '/mgmt/x', body={})
+        self.request.return_value = make_response(200, {'flavors': []})
+        self.assertEqual([], self.flavors.list())
+
+    def test_streamed_pages_are_cached(self):
+        self.request.return_value = make_response(
+            200, {'datastores': [{'id': '1', 'name': 'mysql'}]})
+        api = mock.Mock(client=self.http_client,
+                        resolution_index=base.ResolutionIndex(ttl=0),
+                        request_coalescer=None)
+        manager = datastores.Datastores(api)
+        self.assertEqual('1', manager.findall(name='mysql')[0].id)
+        self.assertEqual('1', manager.findall(name='mysql')[0].id)
+        self.assertEqual(1, self.request.call_count)
@@ -0,0 +1,133 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from unittest import mock
+
+import fixtures
+import requests
+import testtools
+
+from troveclient import client
+from troveclient import exceptions
+from troveclient import retry
+
+
+def make_error(status, retry_after=None):
+    response = requests.Response()
+    response.status_code = status
+    if retry_after is not None:
+        response.headers['Retry-After'] = retry_after
+    return exceptions.from_response(response, 'GET', '/instances')
+
+
+class RetryPolicyTest(testtools.TestCase):
+
+    def test_retried_requests(self):
+        policy = retry.RetryPolicy(retries=2, jitter=False, budget=None)
+        self.assertEqual(1, policy.get_delay(1, 'GET', make_error(503), 0))
+        self.assertEqual(2, policy.get_delay(2, 'get', make_error(500), 0))
+        # Too many attempts.
+        self.assertIsNone(policy.get_delay(3, 'GET', make_error(503), 0))
+        # Not idempotent.
+        self.assertIsNone(policy.get_delay(1, 'POST', make_error(503), 0))
+        # Not retryable.
+        self.assertIsNone(policy.get_delay(1, 'GET', make_error(400), 0))
+        self.assertIsNone(policy.get_delay(
+            1, 'GET', exceptions.ClientException(), 0))
+
+        policy = retry.RetryPolicy(methods=['POST'], statuses=[400],
+                                   budget=None)
+        self.assertIsNotNone(policy.get_delay(1, 'POST', make_error(400), 0))
+
+    def test_backoff(self):
+        policy = retry.RetryPolicy(retries=10, backoff=0.5, max_backoff=3,
+                                   budget=None)
+        with mock.patch('random.uniform', return_value=0.1) as uniform:
+            self.assertEqual(0.1, policy.get_delay(3, 'GET',
+                                                   make_error(502), 0))
+            uniform.assert_called_once_with(0, 2)
+            policy.get_delay(8, 'GET', make_error(502), 0)
+            uniform.assert_called_with(0, 3)
+
+    def test_retry_after(self):
+        policy = retry.RetryPolicy(jitter=False, budget=None)
+        self.assertEqual(7, policy.get_delay(
+            1, 'GET', make_error(429, retry_after='7'), 0))
+        self.assertEqual(1, policy.get_delay(
+            1, 'GET', make_error(503, retry_after='0'), 0))
+        # Retry-After only counts for the statuses defining it.
+        self.assertEqual(1, policy.get_delay(
+            1, 'GET', make_error(500, retry_after='7'), 0))
+        with mock.patch('time.time', return_value=784111767):
+            self.assertEqual(10, retry.get_retry_after(make_error(
+                503, retry_after='Sun, 06 Nov 1994 08:49:37 GMT')))
+        self.assertIsNone(retry.get_retry_after(
+            make_error(503, retry_after='soon')))
+
+    def test_max_elapsed(self):
+        policy = retry.RetryPolicy(jitter=False, max_elapsed=10, budget=None)
+        self.assertEqual(4, policy.get_delay(3, 'GET', make_error(503), 6))
+        self.assertIsNone(policy.get_delay(3, 'GET', make_error(503), 7))
+
+    def test_budget(self):
+        now = self.useFixture(fixtures.MockPatch(
+            'time.monotonic', return_value=100)).mock
+        budget = retry.RetryBudget(ratio=0.5, min_per_second=0.1,
+                                   max_tokens=2)
+        policy = retry.RetryPolicy(retries=10, budget=budget)
+        self.assertIsNotNone(policy.get_delay(1, 'GET', make_error(503), 0))
+        self.assertIsNotNone(policy.get_delay(2, 'GET', make_error(503), 0))
+        self.assertIsNone(policy.get_delay(3, 'GET', make_error(503), 0))
+        # Requests earn retries back.
+        policy.record_request()
+        policy.record_request()
+        self.assertIsNotNone(policy.get_delay(1, 'GET', make_error(503), 0))
+        self.assertIsNone(policy.get_delay(1, 'GET', make_error(503), 0))
+        # And so does time.
+        now.return_value = 110
+        self.assertIsNotNone(policy.get_delay(1, 'GET', make_error(503), 0))
+
+
+class HTTPClientRetryTest(testtools.TestCase):
+
+    def setUp(self):
+        super(HTTPClientRetryTest, self).setUp()
+        self.sleep = self.useFixture(fixtures.MockPatch(
+            'troveclient.client.sleep_lib.sleep')).mock
+        self.http_client = client.HTTPClient(
+            'user', 'password', 'project', 'http://auth',
+            retry_policy=retry.RetryPolicy(retries=2, jitter=False,
+                                           budget=None))
+        self.http_client.management_url = 'http://trove/v1.0/project'
+        self.http_client.auth_token = 'token'
+        self.http_client.request = mock.Mock()
+
+    def test_retry_after_honoured(self):
+        self.http_client.request.side_effect = [
+            make_error(503, retry_after='3'), make_error(500),
+            ('resp', 'body')]
+        self.assertEqual(('resp', 'body'),
+                         self.http_client.get('/instances'))
+        self.assertEqual([mock.call(3), mock.call(2)],
+                         self.sleep.call_args_list)
+
+    def test_non_idempotent_not_retried(self):
+        self.http_client.request.side_effect = [make_error(503)]
+        self.assertRaises(exceptions.ServiceUnavailable,
+                          self.http_client.post, '/instances', body={})
+        self.sleep.assert_not_called()
+
+    def test_default_policy_from_retries(self):
+        http_client = client.HTTPClient('user', 'password', 'project',
+                                        'http://auth', retries=4)
+        self.assertEqual(4, http_client.retry_policy.retries)
+        self.assertIs(retry.DEFAULT_BUDGET, http_client.retry_policy.budget)
@@ -132,6 +132,22 @@ class ShellTest(testtools.TestCase):
                 (stdout + stderr),
                 testtools.matchers.MatchesRegex(r, re.DOTALL | re.MULTILINE))
 
+    def test_circuit_breaker_disabled_by_default(self):
+        self.make_env()
+        parser = troveclient.shell.OpenStackTroveShell().get_base_parser([])
+        options, _args = parser.parse_known_args([])
+        self.assertEqual(0, options.circuit_breaker_threshold)
+
+    def test_token_cache_env(self):
+        for value, expected in (('1', True), ('true', True), ('0', False),
+                                ('false', False), ('', False)):
+            self.make_env(fake_env=dict(FAKE_V2_ENV,
+                                        TROVE_TOKEN_CACHE=value))
+            parser = troveclient.shell.OpenStackTroveShell().get_base_parser(
+                [])
+            options, _args = parser.parse_known_args([])
+            self.assertIs(expected, options.token_cache, value)
+
     def test_no_username(self):
         required = ('You must provide a username'
                     ' via either --os-username or'
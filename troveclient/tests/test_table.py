@@ -0,0 +1,92 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import io
+import random
+
+import prettytable
+import testtools
+
+from troveclient import table
+
+
+class StreamingTableTest(testtools.TestCase):
+
+    rows = [['1', 'one', '10'], ['2', 'two\nlines', '200'],
+            ['3', 'three', '3']]
+
+    def _print(self, rows, **kwargs):
+        out = io.StringIO()
+        table.StreamingTable(['ID', 'Name', 'Size'], out=out,
+                             **kwargs).print_rows(rows)
+        return out.getvalue()
+
+    def test_print_rows_like_prettytable(self):
+        pt = prettytable.PrettyTable(['ID', 'Name', 'Size'])
+        pt.align = 'l'
+        pt.align['Size'] = 'r'
+        for row in self.rows:
+            pt.add_row(row)
+        self.assertEqual(pt.get_string() + '\n',
+                         self._print(self.rows, align=['l', 'l', 'r']))
+
+    def test_print_rows_as_produced(self):
+        printed = []
+
+        def rows():
+            for row in self.rows:
+                printed.append(len(out.getvalue()))
+                yield row
+
+        out = io.StringIO()
+        table.StreamingTable(['ID', 'Name', 'Size'], out=out,
+                             sample_size=1).print_rows(rows())
+        # The header is printed before the second row is produced.
+        self.assertEqual(0, printed[0])
+        self.assertGreater(printed[1], 0)
+        self.assertIn('| 3  | three | 3    |', out.getvalue())
+
+    def test_print_rows_wider_than_sampled(self):
+        output = self._print(self.rows, widths=[2, 4, 4])
+        self.assertIn('| Name |', output.splitlines()[1])
+        self.assertIn('| three |', output)
+        self.assertIn('| two  |', output)
+
+    def test_print_no_rows(self):
+        self.assertEqual('+----+------+------+\n'
+                         '| ID | Name | Size |\n'
+                         '+----+------+------+\n'
+                         '+----+------+------+\n', self._print([]))
+
+
+class SortRowsTest(testtools.TestCase):
+
+    def test_sort_rows_in_memory(self):
+        rows = [[3, 'c'], [1, 'a'], [2, 'b']]
+        self.assertEqual([[1, 'a'], [2, 'b'], [3, 'c']],
+                         list(table.sort_rows(iter(rows))))
+
+    def test_sort_rows_spilled(self):
+        rows = [[random.randrange(50), i] for i in range(1000)]
+        self.assertEqual(
+            sorted(rows, key=lambda row: row[0]),
+            list(table.sort_rows(iter(rows), key=lambda row: row[0],
+                                 buffer_size=64)))
+        self.assertEqual(
+            sorted(rows, key=lambda row: row[0], reverse=True),
+            list(table.sort_rows(iter(rows), key=lambda row: row[0],
+                                 reverse=True, buffer_size=64)))
+
+    def test_sort_rows_list(self):
+        self.assertEqual([4, 3, 2, 1, 0],
+                         list(table.sort_rows(list(range(5)), reverse=True,
+                                              buffer_size=2)))
@@ -0,0 +1,136 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import itertools
+import os
+from unittest import mock
+
+import fixtures
+import testtools
+
+from troveclient import client
+from troveclient import exceptions
+from troveclient import token_cache
+
+
+class TokenCacheTest(testtools.TestCase):
+
+    def setUp(self):
+        super(TokenCacheTest, self).setUp()
+        self.time = self.useFixture(fixtures.MockPatch(
+            'time.time', return_value=1000)).mock
+        self.directory = os.path.join(
+            self.useFixture(fixtures.TempDir()).path, 'tokens')
+        self.cache = token_cache.TokenCache(self.directory, margin=60)
+        self.key = self.cache.make_key('http://auth', 'user', 'project')
+
+    def test_get_set(self):
+        self.assertIsNone(self.cache.get(self.key))
+        self.cache.set(self.key, 'token', 2000, 'http://trove')
+        self.assertEqual({'token': 'token', 'expires': 2000,
+                          'management_url': 'http://trove'},
+                         self.cache.get(self.key))
+        self.assertEqual(0o700, os.stat(self.directory).st_mode & 0o777)
+        self.assertEqual(
+            0o600, os.stat(self.cache._path(self.key)).st_mode & 0o777)
+
+    def test_expiring_token_is_dropped(self):
+        self.cache.set(self.key, 'token', 2000, 'http://trove')
+        self.time.return_value = 1950
+        self.assertIsNone(self.cache.get(self.key))
+        self.assertFalse(os.path.exists(self.cache._path(self.key)))
+
+    def test_keys_differ(self):
+        self.assertNotEqual(
+            self.key, self.cache.make_key('http://auth', 'user', 'other'))
+        self.assertNotEqual(self.cache.make_key('a', 'bc'),
+                            self.cache.make_key('ab', 'c'))
+
+    def test_hash_secret(self):
+        digest = self.cache.hash_secret('password')
+        self.assertEqual(digest, self.cache.hash_secret('password'))
+        self.assertNotEqual(digest, self.cache.hash_secret('other'))
+        self.assertNotIn('password', digest)
+        self.assertEqual(0o600, os.stat(os.path.join(
+            self.directory, 'salt')).st_mode & 0o777)
+        other = token_cache.TokenCache(
+            self.useFixture(fixtures.TempDir()).path)
+        self.assertNotEqual(digest, other.hash_secret('password'))
+
+
+class HTTPClientTokenCacheTest(testtools.TestCase):
+
+    def setUp(self):
+        super(HTTPClientTokenCacheTest, self).setUp()
+        self.cache = token_cache.TokenCache(
+            self.useFixture(fixtures.TempDir()).path)
+        self.tokens = itertools.count()
+
+    def _client(self, password='password', **kwargs):
+        http_client = client.HTTPClient(
+            'user', password, 'project', 'http://auth/v2.0',
+            token_cache=self.cache, **kwargs)
+
+        def authenticate():
+            http_client.auth_token = 'token-%d' % next(self.tokens)
+            http_client.auth_token_expires = 4102444800
+            http_client.management_url = 'http://trove/v1.0/project'
+
+        http_client._authenticate_with_auth_service = mock.Mock(
+            side_effect=authenticate)
+        return http_client
+
+    def test_token_reused_across_clients(self):
+        first = self._client()
+        first.authenticate()
+        second = self._client()
+        second.authenticate()
+        self.assertEqual('token-0', second.auth_token)
+        self.assertEqual('http://trove/v1.0/project', second.management_url)
+        second._authenticate_with_auth_service.assert_not_called()
+
+    def test_token_not_reused_with_other_password(self):
+        self._client().authenticate()
+        other = self._client(password='wrong')
+        other.authenticate()
+        self.assertEqual('token-1', other.auth_token)
+        other._authenticate_with_auth_service.assert_called_once_with()
+
+    def test_token_not_reused_with_other_auth_system(self):
+        other = self._client(auth_system='fake', auth_plugin=mock.Mock())
+        self.assertNotEqual(self._client()._token_cache_key(),
+                            other._token_cache_key())
+
+    def test_token_not_cached_without_expiry(self):
+        first = self._client()
+        first._authenticate_with_auth_service.side_effect = None
+        first.authenticate()
+        self.assertIsNone(self.cache.get(first._token_cache_key()))
+
+    def test_rejected_token_is_invalidated(self):
+        self._client().authenticate()
+        http_client = self._client()
+        sent_tokens = []
+        responses = [exceptions.Unauthorized(401), ('resp', 'body')]
+
+        def request(url, method, headers):
+            sent_tokens.append(headers['X-Auth-Token'])
+            response = responses.pop(0)
+            if isinstance(response, Exception):
+                raise response
+            return response
+
+        http_client.request = request
+        self.assertEqual(('resp', 'body'), http_client.get('/instances'))
+        self.assertEqual(['token-0', 'token-1'], sent_tokens)
+        self.assertEqual('token-1', self.cache.get(
+            http_client._token_cache_key())['token'])
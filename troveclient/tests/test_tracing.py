@@ -0,0 +1,123 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import asyncio
+import inspect
+from unittest import mock
+
+import fixtures
+import testtools
+
+from troveclient import base
+from troveclient import client
+from troveclient import tracing
+
+
+class TracingTest(testtools.TestCase):
+
+    def setUp(self):
+        super(TracingTest, self).setUp()
+        self.profiler = self.useFixture(fixtures.MockPatchObject(
+            tracing, 'osprofiler_profiler')).mock
+
+    def _make_manager(self):
+        class Things(base.Manager):
+            resource_class = base.Resource
+
+            def get(self, thing):
+                return self._get('/things/%s' % thing, 'thing')
+
+            def _private(self):
+                pass
+
+        api = mock.Mock()
+        api.client.get.return_value = (None, {'thing': {'id': '1'}})
+        return Things(api)
+
+    def test_manager_methods_traced(self):
+        manager = self._make_manager()
+        self.assertEqual('get', type(manager).get.__name__)
+        manager.get('1')
+        self.assertEqual(
+            [mock.call('troveclient-manager',
+                       info={'function': {'name': 'Things.get'}}),
+             mock.call('troveclient-resources', info={'count': 1})],
+            self.profiler.Trace.call_args_list)
+
+    def _make_lazy_manager(self, spans):
+        self.profiler.Trace.side_effect = lambda name, info: mock.MagicMock(
+            __enter__=lambda span: spans.append('start'),
+            __exit__=lambda span, *exc: spans.append('stop'))
+
+        class Things(base.Manager):
+            def iter_all(self):
+                spans.append('page')
+                yield 1
+
+            def list(self):
+                return (item for item in self._items())
+
+            def _items(self):
+                spans.append('page')
+                yield 1
+
+            async def get(self):
+                spans.append('request')
+                return 1
+
+        return Things(mock.Mock())
+
+    def test_generators_traced_until_exhausted(self):
+        spans = []
+        manager = self._make_lazy_manager(spans)
+        items = manager.iter_all()
+        self.assertEqual([], spans)
+        self.assertEqual([1], list(items))
+        self.assertEqual(['start', 'page', 'stop'], spans)
+
+        del spans[:]
+        items = manager.list()
+        self.assertEqual(['start', 'stop'], spans)
+        self.assertEqual([1], list(items))
+        self.assertEqual(['start', 'stop', 'start', 'page', 'stop'], spans)
+
+    def test_coroutines_traced_until_done(self):
+        spans = []
+        manager = self._make_lazy_manager(spans)
+        self.assertTrue(inspect.iscoroutinefunction(type(manager).get))
+        coroutine = manager.get()
+        self.assertEqual([], spans)
+        self.assertEqual(1, asyncio.run(coroutine))
+        self.assertEqual(['start', 'request', 'stop'], spans)
+
+    def test_disabled(self):
+        self.profiler.get.return_value = None
+        self._make_manager().get('1')
+        self.profiler.Trace.assert_not_called()
+        self.assertIs(tracing._NOT_TRACED, tracing.trace('span'))
+
+    def test_not_installed(self):
+        func = mock.Mock()
+        tracing.osprofiler_profiler = None
+        self.assertIs(func, tracing.trace_method(func, 'name'))
+        self.assertIs(tracing._NOT_TRACED, tracing.trace('span'))
+
+    def test_request_attempts_traced(self):
+        http_client = client.HTTPClient('user', 'password', 'project',
+                                        'http://auth')
+        http_client.management_url = 'http://trove/v1.0/project'
+        http_client.auth_token = 'token'
+        http_client.request = mock.Mock(return_value=('resp', 'body'))
+        http_client.get('/things/1')
+        self.profiler.Trace.assert_called_once_with(
+            'troveclient-request',
+            info={'method': 'GET', 'url': '/things/1', 'attempt': 1})
@@ -125,12 +125,14 @@ class UsersTest(testtools.TestCase):
         self.users._paginated = page_mock
         self.users.list('instance1')
         page_mock.assert_called_with('/instances/instance1/users',
-                                     'users', None, None)
+                                     'users', None, None,
+                                     all_pages=False, prefetch=False)
         limit = 'test-limit'
         marker = 'test-marker'
         self.users.list('instance1', limit, marker)
         page_mock.assert_called_with('/instances/instance1/users',
-                                     'users', limit, marker)
+                                     'users', limit, marker,
+                                     all_pages=False, prefetch=False)
 
     def test_update_no_changes(self):
         self.users.api.client.post = self._get_mock_method()
@@ -15,11 +15,19 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import io
+import json
 import os
 import tempfile
+import threading
+from unittest import mock
+
 import testtools
 
+from troveclient.apiclient import exceptions
+from troveclient import base
 from troveclient import utils
+from troveclient.v1 import shell
 
 
 class UtilsTest(testtools.TestCase):
@@ -96,3 +104,129 @@ class UtilsTest(testtools.TestCase):
                                      "'%s' deserialized is None" % datum)
                 self.assertEqual(expected_deserialized, new_deserialized_data,
                                  "Serialize/Deserialize with files failed")
+
+    def test_run_on_many_keeps_order(self):
+        started = threading.Barrier(3, timeout=5)
+
+        def action(resource):
+            # All three actions must be running at the same time.
+            started.wait()
+            if resource == 'b':
+                raise Exception('failed %s' % resource)
+
+        results = list(utils.run_on_many(action, ['a', 'b', 'c'],
+                                         concurrency=3))
+        self.assertEqual(['a', 'b', 'c'], [r for r, e in results])
+        self.assertIsNone(results[0][1])
+        self.assertEqual('failed b', str(results[1][1]))
+        self.assertIsNone(results[2][1])
+
+    def test_do_action_on_many_concurrently(self):
+        def fail_on_b(resource):
+            if resource == 'b':
+                raise Exception('boom')
+
+        action = mock.Mock(side_effect=fail_on_b)
+        with mock.patch('sys.stdout', new_callable=io.StringIO) as stdout:
+            self.assertRaises(exceptions.CommandError,
+                              utils.do_action_on_many, action,
+                              ['a', 'b', 'c'], 'deleted %s', 'failed',
+                              concurrency=2)
+        self.assertEqual(3, action.call_count)
+        self.assertIn('deleted a', stdout.getvalue())
+        self.assertIn('deleted c', stdout.getvalue())
+        self.assertNotIn('deleted b', stdout.getvalue())
+
+    def test_print_list_stream(self):
+        objs = [{'id': 'b', 'size': 10}, {'id': 'a', 'size': 2}]
+        self.patch(utils, 'stream_output', True)
+        with mock.patch('sys.stdout', new_callable=io.StringIO) as stdout:
+            utils.print_list(iter(objs), ['id', 'size'], obj_is_dict=True)
+        self.assertEqual('+----+------+\n'
+                         '| ID | Size |\n'
+                         '+----+------+\n'
+                         '| b  |   10 |\n'
+                         '| a  |    2 |\n'
+                         '+----+------+\n', stdout.getvalue())
+
+        with mock.patch('sys.stdout', new_callable=io.StringIO) as stdout:
+            utils.print_list(iter(objs), ['id', 'size'], obj_is_dict=True,
+                             order_by='id')
+        self.assertEqual(['| a  |    2 |', '| b  |   10 |'],
+                         stdout.getvalue().splitlines()[3:5])
+
+    def test_print_list_stream_sorts_numbers(self):
+        objs = [{'name': 'large', 'ram': 10}, {'name': 'small', 'ram': 2},
+                {'name': 'medium', 'ram': 9}, {'name': 'none', 'ram': None}]
+        self.patch(utils, 'stream_output', True)
+        with mock.patch('sys.stdout', new_callable=io.StringIO) as stdout:
+            utils.print_list(objs, ['name', 'ram'], obj_is_dict=True,
+                             order_by='ram')
+        self.assertEqual(['small', 'medium', 'large', 'none'],
+                         [line.split()[1] for line in
+                          stdout.getvalue().splitlines()[3:7]])
+
+    def test_print_list_jsonl(self):
+        objs = [mock.Mock(_info={'id': 'a', 'name': 'one', 'size': 1}),
+                mock.Mock(_info={'id': 'b', 'name': 'two', 'size': 2})]
+        self.patch(utils, 'output_format', 'jsonl')
+        self.patch(utils, 'output_fields', ['id', 'size'])
+        with mock.patch('sys.stdout', new_callable=io.StringIO) as stdout:
+            utils.print_list(iter(objs), ['id', 'name'])
+        self.assertEqual('{"id": "a", "size": 1}\n'
+                         '{"id": "b", "size": 2}\n', stdout.getvalue())
+
+    def test_print_list_jsonl_error(self):
+        def objs():
+            yield {'id': 'a'}
+            raise exceptions.NotFound(404)
+
+        self.patch(utils, 'output_format', 'jsonl')
+        with mock.patch('sys.stdout', new_callable=io.StringIO) as stdout:
+            self.assertRaises(exceptions.NotFound, utils.print_list,
+                              objs(), ['id'], obj_is_dict=True)
+        self.assertEqual('{"id": "a"}\n', stdout.getvalue())
+
+    def test_print_instances_json_error(self):
+        def instances():
+            yield base.Resource(mock.Mock(), {
+                'id': 'a', 'name': 'one', 'status': 'ACTIVE',
+                'flavor': {'id': '1'}, 'volume': {'size': 1},
+                'datastore': {'type': 'mysql', 'version': '5.7'}},
+                loaded=True)
+            raise exceptions.NotFound(404)
+
+        self.patch(utils, 'json_output', True)
+        with mock.patch('sys.stdout', new_callable=io.StringIO) as stdout:
+            self.assertRaises(exceptions.NotFound, shell._print_instances,
+                              instances())
+        self.assertEqual('', stdout.getvalue())
+
+    def test_print_list_json_fields_not_loaded(self):
+        manager = mock.Mock()
+        obj = base.Resource(manager, {'id': 'a'}, loaded=False)
+        obj.shown = 'set by the shell'
+        self.patch(utils, 'json_output', True)
+        self.patch(utils, 'output_fields', ['id', 'shown', 'missing'])
+        with mock.patch('sys.stdout', new_callable=io.StringIO) as stdout:
+            utils.print_list([obj], ['id'])
+        self.assertEqual([{'id': 'a', 'shown': 'set by the shell',
+                           'missing': None}], json.loads(stdout.getvalue()))
+        self.assertFalse(manager.get.called)
+
+    def test_print_list_csv(self):
+        objs = [{'id': 'a', 'volume': {'size': 1}, 'region': None},
+                {'id': 'b', 'volume': {'size': 2}, 'region': 'r1'}]
+        self.patch(utils, 'output_format', 'csv')
+        with mock.patch('sys.stdout', new_callable=io.StringIO) as stdout:
+            utils.print_list(iter(objs), ['id'], obj_is_dict=True)
+        self.assertEqual('id,volume,region\n'
+                         'a,"{""size"": 1}",\n'
+                         'b,"{""size"": 2}",r1\n', stdout.getvalue())
+
+    def test_print_dict_csv_fields(self):
+        self.patch(utils, 'output_format', 'csv')
+        self.patch(utils, 'output_fields', ['name', 'missing'])
+        with mock.patch('sys.stdout', new_callable=io.StringIO) as stdout:
+            utils.print_dict({'id': 'a', 'name': 'one'})
+        self.assertEqual('name,missing\none,\n', stdout.getvalue())
@@ -0,0 +1,135 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from unittest import mock
+
+import testtools
+
+from troveclient import base
+from troveclient import exceptions
+from troveclient import waiters
+
+
+def _res(id, **info):
+    info['id'] = id
+    return base.Resource(None, info, loaded=True)
+
+
+class FakeManager(object):
+    """Serve a scripted sequence of states for each resource."""
+
+    def __init__(self, states):
+        self.states = states
+        self.ticks = 0
+        self.list_calls = 0
+        self.get_calls = []
+
+    def _state(self, id):
+        seq = self.states[id]
+        return _res(id, status=seq[min(self.ticks, len(seq) - 1)])
+
+    def list(self, limit=None, marker=None, all_pages=False):
+        self.list_calls += 1
+        result = [self._state(id) for id in sorted(self.states)]
+        self.ticks += 1
+        return result
+
+    def get(self, id):
+        self.get_calls.append(id)
+        result = self._state(id)
+        self.ticks += 1
+        return result
+
+
+@mock.patch('time.sleep')
+class WaiterTest(testtools.TestCase):
+
+    def test_get_status(self, mock_sleep):
+        self.assertEqual('ACTIVE', waiters.get_status(_res('1',
+                                                           status='active')))
+        self.assertEqual('NONE', waiters.get_status(
+            _res('1', task={'id': 1, 'name': 'NONE'})))
+        self.assertIsNone(waiters.get_status(_res('1')))
+
+    def test_wait_coalesces_into_list(self, mock_sleep):
+        manager = FakeManager({'a': ['BUILD', 'BUILD', 'ACTIVE'],
+                               'b': ['BUILD', 'ACTIVE']})
+        result = waiters.wait_for(manager, ['a', _res('b')], jitter=0)
+        self.assertEqual(['a', 'b'], sorted(result))
+        self.assertEqual('ACTIVE', result['a'].status)
+        # Both resources share the listing; once only 'a' is left it is
+        # fetched directly.
+        self.assertEqual(2, manager.list_calls)
+        self.assertEqual(['a'], manager.get_calls)
+
+    def test_wait_missing_from_list_uses_get(self, mock_sleep):
+        manager = FakeManager({'a': ['ACTIVE'], 'b': ['ACTIVE']})
+        manager.list = mock.create_autospec(
+            manager.list, return_value=[_res('a', status='ACTIVE')])
+        waiters.wait_for(manager, ['a', 'b'])
+        self.assertEqual(['b'], manager.get_calls)
+        manager.list.assert_called_once_with(all_pages=True)
+
+    def test_wait_backoff(self, mock_sleep):
+        manager = FakeManager({'a': ['BUILD'] * 5 + ['ACTIVE']})
+        waiters.wait_for(manager, 'a', interval=1, backoff=2,
+                         max_interval=5, jitter=0)
+        self.assertEqual([1, 2, 4, 5, 5],
+                         [c[0][0] for c in mock_sleep.call_args_list])
+
+    def test_wait_backoff_resets_on_change(self, mock_sleep):
+        manager = FakeManager({'a': ['BUILD', 'BUILD', 'BUILD', 'RESIZE',
+                                     'RESIZE', 'ACTIVE']})
+        waiters.wait_for(manager, 'a', interval=1, backoff=2, jitter=0)
+        self.assertEqual([1, 2, 4, 1, 2],
+                         [c[0][0] for c in mock_sleep.call_args_list])
+
+    def test_wait_jitter(self, mock_sleep):
+        manager = FakeManager({'a': ['BUILD'] * 20 + ['ACTIVE']})
+        waiters.wait_for(manager, 'a', interval=10, backoff=1, jitter=0.5)
+        delays = [c[0][0] for c in mock_sleep.call_args_list]
+        self.assertTrue(all(5 <= d <= 15 for d in delays))
+        self.assertGreater(len(set(delays)), 1)
+
+    def test_wait_failed(self, mock_sleep):
+        manager = FakeManager({'a': ['BUILD', 'ERROR']})
+        e = self.assertRaises(exceptions.WaiterFailed,
+                              waiters.wait_for, manager, 'a')
+        self.assertEqual('a', e.resource_id)
+        self.assertEqual('ERROR', e.status)
+
+    @mock.patch('time.monotonic')
+    def test_wait_timeout(self, mock_clock, mock_sleep):
+        mock_clock.side_effect = [0, 4, 11]
+        manager = FakeManager({'a': ['BUILD']})
+        e = self.assertRaises(exceptions.WaiterTimeout,
+                              waiters.wait_for, manager, 'a', timeout=10,
+                              interval=8, jitter=0)
+        self.assertEqual(['a'], e.pending)
+        self.assertEqual({'a': 'BUILD'}, e.statuses)
+        # The sleep is capped at the time left before the deadline.
+        mock_sleep.assert_called_once_with(6)
+
+    def test_wait_predicates_and_callback(self, mock_sleep):
+        manager = FakeManager({'a': ['NEW', 'BUILDING', 'BUILDING', 'DONE']})
+        callback = mock.Mock()
+        waiters.wait_for(manager, 'a',
+                         ready=lambda status, res: status == 'DONE',
+                         failed=[], callback=callback)
+        self.assertEqual(['NEW', 'BUILDING', 'DONE'],
+                         [c[0][1] for c in callback.call_args_list])
+
+    def test_wait_leaving(self, mock_sleep):
+        manager = FakeManager({'a': ['ACTIVE', 'ACTIVE', 'REBOOT', 'ACTIVE']})
+        result = waiters.wait_for(manager, 'a', leaving=waiters.READY_STATES)
+        self.assertEqual('ACTIVE', result['a'].status)
+        self.assertEqual(4, len(manager.get_calls))
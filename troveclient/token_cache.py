@@ -0,0 +1,125 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""
+Cache of authentication tokens shared between client processes.
+"""
+
+import hashlib
+import hmac
+import json
+import os
+import tempfile
+import time
+
+
+class TokenCache(object):
+    """Store tokens and database endpoints on disk until they expire.
+
+    Each entry is a JSON file only readable by its owner, in a directory
+    only accessible to them, and is replaced atomically. An entry is reused
+    until ``margin`` seconds before its token expires.
+
+    :param directory: where the tokens are stored, by default
+                      ``~/.troveclient/tokens``
+    :param margin: number of seconds before expiry a token stops being used
+    """
+
+    def __init__(self, directory=None, margin=60):
+        self.directory = os.path.expanduser(
+            directory or os.path.join('~', '.troveclient', 'tokens'))
+        self.margin = margin
+
+    @staticmethod
+    def make_key(*parts):
+        """Build the key of an entry from what identifies the credentials."""
+        joined = '\0'.join('' if part is None else str(part)
+                           for part in parts)
+        return hashlib.sha256(joined.encode('utf-8')).hexdigest()
+
+    def hash_secret(self, secret):
+        """Return a digest of ``secret``, e.g. a password, for a key.
+
+        The digest is salted with a random salt kept in the cache directory,
+        so that the names of the entries do not allow guessing the secret.
+        """
+        if secret is None:
+            return None
+        return hmac.new(self._salt(), str(secret).encode('utf-8'),
+                        hashlib.sha256).hexdigest()
+
+    def _salt(self):
+        path = os.path.join(self.directory, 'salt')
+        try:
+            with open(path, 'rb') as f:
+                salt = f.read()
+            if salt:
+                return salt
+        except OSError:
+            pass
+        salt = os.urandom(32)
+        try:
+            os.makedirs(self.directory, 0o700, exist_ok=True)
+            fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+            with os.fdopen(fd, 'wb') as f:
+                f.write(salt)
+        except FileExistsError:
+            # Created concurrently by another client.
+            with open(path, 'rb') as f:
+                salt = f.read()
+        except OSError:
+            # NOTE: Without a stored salt, the tokens of this client are
+            # not found by the others, which only costs a round trip.
+            pass
+        return salt
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + '.json')
+
+    def get(self, key):
+        """Return the entry of ``key``, or None if missing or expiring.
+
+        :returns: a dict with the ``token``, its ``expires`` timestamp and
+                  the ``management_url``.
+        """
+        try:
+            with open(self._path(key)) as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if entry.get('expires', 0) - self.margin <= time.time():
+            self.delete(key)
+            return None
+        return entry
+
+    def set(self, key, token, expires, management_url):
+        """Store a token expiring at the ``expires`` timestamp."""
+        entry = {'token': token, 'expires': expires,
+                 'management_url': management_url}
+        try:
+            os.makedirs(self.directory, 0o700, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory,
+                                            suffix='.tmp')
+            with os.fdopen(fd, 'w') as f:
+                json.dump(entry, f)
+            os.replace(tmp_path, self._path(key))
+        except OSError:
+            # NOTE: The token is only cached to save a round trip, failing
+            # to store it must not fail the request.
+            pass
+
+    def delete(self, key):
+        """Forget the entry of ``key``, e.g. once its token is rejected."""
+        try:
+            os.remove(self._path(key))
+        except OSError:
+            pass
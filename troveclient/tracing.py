@@ -0,0 +1,99 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""
+osprofiler trace points of the client side work.
+
+When osprofiler is not installed nothing is traced or wrapped. When it is
+installed but no profiler was initialized, as done by ``trove --profile``,
+a trace point only costs checking for the profiler.
+"""
+
+import contextlib
+import functools
+import inspect
+
+from oslo_utils import importutils
+
+osprofiler_profiler = importutils.try_import("osprofiler.profiler")
+
+_NOT_TRACED = contextlib.nullcontext()
+
+
+def trace(name, **info):
+    """Trace the ``with`` block as an osprofiler span named ``name``."""
+    if osprofiler_profiler is None or not osprofiler_profiler.get():
+        return _NOT_TRACED
+    return osprofiler_profiler.Trace(name, info=info)
+
+
+def trace_method(func, name):
+    """Wrap ``func`` to trace its calls as ``troveclient-manager`` spans.
+
+    The generators, asynchronous generators and coroutines returned by
+    ``func`` are traced until they are exhausted or done, rather than only
+    while being created. ``func`` is returned unchanged when osprofiler is
+    not installed.
+    """
+    if osprofiler_profiler is None:
+        return func
+
+    if inspect.iscoroutinefunction(func):
+        @functools.wraps(func)
+        async def coroutine_wrapper(*args, **kwargs):
+            with _trace_manager(name):
+                return await func(*args, **kwargs)
+        return coroutine_wrapper
+
+    lazy = (inspect.isgeneratorfunction(func) or
+            inspect.isasyncgenfunction(func))
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if not osprofiler_profiler.get():
+            return func(*args, **kwargs)
+        if lazy:
+            return _trace_lazy(func(*args, **kwargs), name)
+        with _trace_manager(name):
+            result = func(*args, **kwargs)
+        return _trace_lazy(result, name)
+    return wrapper
+
+
+def _trace_manager(name):
+    return trace('troveclient-manager', function={'name': name})
+
+
+def _trace_lazy(result, name):
+    if inspect.isgenerator(result):
+        return _trace_generator(result, name)
+    if inspect.isasyncgen(result):
+        return _trace_async_generator(result, name)
+    if inspect.iscoroutine(result):
+        return _trace_coroutine(result, name)
+    return result
+
+
+def _trace_generator(generator, name):
+    with _trace_manager(name):
+        return (yield from generator)
+
+
+async def _trace_async_generator(generator, name):
+    with _trace_manager(name):
+        async for item in generator:
+            yield item
+
+
+async def _trace_coroutine(coroutine, name):
+    with _trace_manager(name):
+        return await coroutine
@@ -15,16 +15,21 @@
 #    under the License.
 
 import base64
+from concurrent import futures
+import csv
+import itertools
 import json
+import operator
 import os
+import sys
 import uuid
 
-from openstackclient.identity import common as identity_common
 from oslo_utils import encodeutils
 from oslo_utils import uuidutils
 import prettytable
 
 from troveclient.apiclient import exceptions
+from troveclient import table
 
 
 def arg(*args, **kwargs):
@@ -107,6 +112,17 @@ def get_service_type(f):
     return getattr(f, 'service_type', None)
 
 
+def get_resource_name(resource_class):
+    """Retrieves the name of the resources of a resource class.
+
+    Compact resource classes are named after the class they make compact.
+    """
+    name = getattr(resource_class, 'RESOURCE_NAME', None)
+    if not isinstance(name, str):
+        name = resource_class.__name__
+    return name
+
+
 def translate_keys(collection, convert):
     for item in collection:
         keys = list(item.__dict__.keys())
@@ -118,29 +134,78 @@ def translate_keys(collection, convert):
 def _output_override(objs, print_as):
     """Output override flag checking.
 
-    If an output override global flag is set, print with override
-    raise BaseException if no printing was overridden.
+    If an output override global flag is set, print with override.
+
+    :returns: True if the output was printed, False otherwise
     """
+    fields = globals().get('output_fields')
+    output_format = globals().get('output_format')
     if globals().get('json_output', False):
         if print_as == 'list':
             new_objs = []
             for o in objs:
-                new_objs.append(o._info)
+                new_objs.append(_get_record(o, fields))
         elif print_as == 'dict':
-            new_objs = objs
+            new_objs = _get_record(objs, fields)
         # pretty print the json
         print(json.dumps(new_objs, indent='  '))
+    elif output_format in ('jsonl', 'csv'):
+        if print_as == 'list':
+            records = (_get_record(o, fields) for o in objs)
+        elif print_as == 'dict':
+            records = [_get_record(objs, fields)]
+        if output_format == 'jsonl':
+            _print_jsonl(records)
+        else:
+            _print_csv(records, fields)
     else:
-        raise BaseException('No valid output override')
+        return False
+    return True
 
 
-def print_list(objs, fields, formatters={}, order_by=None, obj_is_dict=False,
-               labels={}):
-    try:
-        _output_override(objs, 'list')
-        return
-    except BaseException:
-        pass
+def _get_record(obj, fields=None):
+    """Return the dict of ``fields`` of a resource, or of a dict."""
+    info = obj if isinstance(obj, dict) else obj._info
+    if not fields:
+        return info
+    # Fall back on the attributes set on the resources by the shell, but
+    # never on those that would load the resource.
+    attrs = {} if isinstance(obj, dict) else vars(obj)
+    return dict((field, info[field] if field in info
+                 else attrs.get(field)) for field in fields)
+
+
+def _print_jsonl(records):
+    """Print one JSON object per line, as the records are produced."""
+    out = sys.stdout
+    for record in records:
+        out.write(json.dumps(record) + '\n')
+
+
+def _print_csv(records, fields=None):
+    """Print the records as CSV, as they are produced.
+
+    Without ``fields`` the columns are the keys of the first record. Nested
+    values are written as JSON.
+    """
+    writer = None
+    for record in records:
+        if writer is None:
+            writer = csv.DictWriter(sys.stdout, fields or list(record),
+                                    extrasaction='ignore',
+                                    lineterminator='\n')
+            writer.writeheader()
+        writer.writerow(dict((key, _csv_value(value))
+                             for key, value in record.items()))
+
+
+def _csv_value(value):
+    if isinstance(value, (dict, list)):
+        return json.dumps(value)
+    return '' if value is None else value
+
+
+def _make_labels(fields, labels):
     # Make nice labels from the fields, if not provided in the labels arg
     if not labels:
         labels = {}
@@ -156,6 +221,30 @@ def print_list(objs, fields, formatters={}, order_by=None, obj_is_dict=False,
                 label = ' '.join(word[0].upper() + word[1:]
                                  for word in label.split())
             labels[field] = label
+    return labels
+
+
+def _get_row(obj, fields, formatters, obj_is_dict):
+    row = []
+    for field in fields:
+        if formatters and field in formatters:
+            data = formatters[field](obj)
+        elif obj_is_dict:
+            data = obj.get(field, '')
+        else:
+            data = getattr(obj, field, '')
+        row.append(data)
+    return row
+
+
+def print_list(objs, fields, formatters={}, order_by=None, obj_is_dict=False,
+               labels={}):
+    if _output_override(objs, 'list'):
+        return
+    labels = _make_labels(fields, labels)
+    if globals().get('stream_output', False):
+        _stream_list(objs, fields, formatters, order_by, obj_is_dict, labels)
+        return
 
     pt = prettytable.PrettyTable(
         [labels[field] for field in fields], caching=False)
@@ -164,13 +253,9 @@ def print_list(objs, fields, formatters={}, order_by=None, obj_is_dict=False,
     set_align = True
     for obj in objs:
         row = []
-        for field in fields:
-            if formatters and field in formatters:
-                data = formatters[field](obj)
-            elif obj_is_dict:
-                data = obj.get(field, '')
-            else:
-                data = getattr(obj, field, '')
+        for field, data in zip(fields,
+                               _get_row(obj, fields, formatters,
+                                        obj_is_dict)):
             if isinstance(data, str):
                 row.append(data.encode('utf-8'))
             else:
@@ -188,12 +273,45 @@ def print_list(objs, fields, formatters={}, order_by=None, obj_is_dict=False,
     print(pt.get_string(sortby=order_by))
 
 
+def _stream_list(objs, fields, formatters, order_by, obj_is_dict, labels):
+    """Print the rows of a list as the objects are produced.
+
+    The rows are only sorted when ``order_by`` is given, in bounded memory.
+    """
+    rows = (_get_row(obj, fields, formatters, obj_is_dict) for obj in objs)
+    align = ['l'] * len(fields)
+    first = next(rows, None)
+    if first is not None:
+        # set the alignment to right-aligned if it's a numeric
+        align = ['r' if hasattr(data, '__int__') else 'l' for data in first]
+        rows = itertools.chain([first], rows)
+    if not order_by:
+        rows = ([str(data) for data in row] for row in rows)
+    else:
+        # Sorted on the values rather than their strings, so that numbers
+        # sort as numbers; only the strings are kept, to be spilled.
+        index = fields.index(order_by)
+        rows = ((_sort_key(row[index]), [str(data) for data in row])
+                for row in rows)
+        rows = (row for key, row in table.sort_rows(
+            rows, key=operator.itemgetter(0)))
+    table.StreamingTable([labels[field] for field in fields],
+                         align=align).print_rows(rows)
+
+
+def _sort_key(value):
+    # None and the values of other types than numbers and strings, which
+    # may not compare with each other, sort after them.
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return (0, value, '')
+    if isinstance(value, str):
+        return (1, 0, value)
+    return (2, 0, '' if value is None else str(value))
+
+
 def print_dict(d, key="Property"):
-    try:
-        _output_override(d, 'dict')
+    if _output_override(d, 'dict'):
         return
-    except BaseException:
-        pass
     pt = prettytable.PrettyTable([key, 'Value'], caching=False)
     pt.align = 'l'
     [pt.add_row(list(r)) for r in d.items()]
@@ -218,6 +336,9 @@ def get_resource_id_by_name(manager, name):
 
 
 def get_project_id(manager, id_or_name):
+    # NOTE: openstackclient is slow to import and only needed here.
+    from openstackclient.identity import common as identity_common
+
     if not uuidutils.is_uuid_like(id_or_name):
         try:
             project = identity_common.find_project(manager, id_or_name)
@@ -267,12 +388,14 @@ def find_resource(manager, name_or_id):
                     return manager.find(display_name=name_or_id)
                 except exceptions.NotFound:
                     msg = "No %s with a name or ID of '%s' exists." % \
-                        (manager.resource_class.__name__.lower(), name_or_id)
+                        (get_resource_name(manager.resource_class).lower(),
+                         name_or_id)
                     raise exceptions.CommandError(msg)
     except exceptions.NoUniqueMatch:
         msg = ("Multiple %s matches found for '%s', use an ID to be more"
-               " specific." % (manager.resource_class.__name__.lower(),
-                               name_or_id))
+               " specific." % (
+                   get_resource_name(manager.resource_class).lower(),
+                   name_or_id))
         raise exceptions.CommandError(msg)
 
 
@@ -359,17 +482,42 @@ def do_action_with_msg(action, success_msg):
     print(success_msg)
 
 
-def do_action_on_many(action, resources, success_msg, error_msg):
+def run_on_many(action, resources, concurrency=1):
+    """Run an action on many resources.
+
+    Yields a ``(resource, exception)`` tuple per resource, in the order of
+    ``resources``, with ``exception`` set to None if the action succeeded.
+    When ``concurrency`` is above 1 the actions run on a pool of that many
+    threads.
+    """
+    if not concurrency or concurrency <= 1:
+        for resource in resources:
+            try:
+                action(resource)
+            except Exception as e:
+                yield resource, e
+            else:
+                yield resource, None
+        return
+
+    with futures.ThreadPoolExecutor(max_workers=concurrency) as executor:
+        jobs = [(resource, executor.submit(action, resource))
+                for resource in resources]
+        for resource, job in jobs:
+            yield resource, job.exception()
+
+
+def do_action_on_many(action, resources, success_msg, error_msg,
+                      concurrency=1):
     """Helper to run an action on many resources."""
     failure_flag = False
 
-    for resource in resources:
-        try:
-            action(resource)
+    for resource, error in run_on_many(action, resources, concurrency):
+        if error is None:
             print(success_msg % resource)
-        except Exception as e:
+        else:
             failure_flag = True
-            print(encodeutils.safe_encode(str(e)))
+            print(encodeutils.safe_encode(str(error)))
 
     if failure_flag:
         raise exceptions.CommandError(error_msg)
@@ -0,0 +1,23 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from troveclient import base
+from troveclient.v1.aio import base as aio_base
+from troveclient.v1 import backups
+
+
+class Backups(aio_base.AsyncManager, backups.Backups):
+    """Manage :class:`Backups` information asynchronously."""
+
+    async def delete(self, backup):
+        """Delete the specified backup."""
+        await self._call('delete', "/backups/%s" % base.getid(backup))
@@ -0,0 +1,169 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""
+Base classes of the asyncio managers.
+
+The asyncio managers subclass their synchronous counterparts from
+:mod:`troveclient.v1`, so they share the URLs and resource classes, and
+build the request bodies with the ``_*_body`` helpers of the synchronous
+managers. :class:`AsyncManager` turns the request helpers into coroutines,
+which makes every manager method that returns a helper's result awaitable
+as is; the methods that post-process a response, or use the result of
+another manager method, are overridden with coroutines by each manager.
+"""
+
+import asyncio
+import inspect
+
+from troveclient.apiclient import exceptions
+from troveclient import base
+from troveclient import common
+
+
+class AsyncManager(object):
+    """Mixin providing coroutine versions of the :class:`base.Manager`
+    request helpers.
+
+    Resources are always built fully loaded, as lazy-loading an attribute
+    cannot wait for a response.
+    """
+
+    def _paginated(self, url, response_key, limit=None, marker=None,
+                   query_strings=None, all_pages=False, prefetch=False):
+        """Get one page of a collection, or iterate over all of its pages.
+
+        Returns a coroutine resolving to one page, or with ``all_pages`` an
+        asynchronous generator yielding every item of the collection.
+        """
+        if all_pages:
+            return self._paginated_iter(url, response_key, limit=limit,
+                                        marker=marker,
+                                        query_strings=query_strings,
+                                        prefetch=prefetch)
+        return self._paginated_page(url, response_key, limit=limit,
+                                    marker=marker,
+                                    query_strings=query_strings)
+
+    async def _paginated_page(self, url, response_key, limit=None,
+                              marker=None, query_strings=None):
+        query_strings = query_strings or {}
+        url = common.append_query_strings(url, limit=limit, marker=marker,
+                                          **query_strings)
+        resp, body = await self.api.client.get(url)
+        return self._build_page(url, body, response_key, loaded=True)
+
+    async def _paginated_iter(self, url, response_key, limit=None,
+                              marker=None, query_strings=None,
+                              prefetch=False):
+        def fetch(marker):
+            return self._paginated_page(url, response_key, limit=limit,
+                                        marker=marker,
+                                        query_strings=query_strings)
+
+        page = await fetch(marker)
+        while True:
+            has_next = bool(page.next) and page.next != marker
+            if has_next:
+                marker = page.next
+            task = None
+            if has_next and prefetch:
+                task = asyncio.ensure_future(fetch(marker))
+            try:
+                for item in page:
+                    yield item
+            except BaseException:
+                # The consumer stopped early, drop the prefetched page.
+                if task is not None:
+                    task.cancel()
+                raise
+            if not has_next:
+                return
+            page = await (task if task is not None else fetch(marker))
+
+    def iter_all(self, *args, **kwargs):
+        """Asynchronously iterate over every item of ``list()``."""
+        kwargs['all_pages'] = True
+        return self.list(*args, **kwargs)
+
+    async def _list(self, url, response_key, obj_class=None, body=None):
+        if body:
+            resp, body = await self.api.client.post(url, body=body)
+        else:
+            resp, body = await self.api.client.get(url)
+
+        if obj_class is None:
+            obj_class = self.resource_class
+
+        data = body[response_key]
+        if isinstance(data, dict):
+            try:
+                data = data['values']
+            except KeyError:
+                pass
+        return [obj_class(self, res, loaded=True) for res in data if res]
+
+    async def _get(self, url, response_key=None):
+        resp, body = await self.api.client.get(url)
+        if response_key:
+            body = body[response_key]
+        return self.resource_class(self, body, loaded=True)
+
+    async def _create(self, url, body, response_key, return_raw=False,
+                      **kwargs):
+        self.run_hooks('modify_body_for_create', body, **kwargs)
+        resp, body = await self.api.client.post(url, body=body)
+        if body:
+            if return_raw:
+                return body[response_key]
+            return self.resource_class(self, body[response_key], loaded=True)
+
+    async def _delete(self, url):
+        return await self.api.client.delete(url)
+
+    async def _update(self, url, body, **kwargs):
+        self.run_hooks('modify_body_for_update', body, **kwargs)
+        resp, body = await self.api.client.put(url, body=body)
+        return body
+
+    async def _edit(self, url, body):
+        resp, body = await self.api.client.patch(url, body=body)
+        return body
+
+    async def _call(self, method, url, body=None):
+        """Send a request and raise on an error status.
+
+        :returns: the response body.
+        """
+        kwargs = {} if body is None else {'body': body}
+        resp, body = await getattr(self.api.client, method)(url, **kwargs)
+        common.check_for_exceptions(resp, body, url)
+        return body
+
+    async def find(self, **kwargs):
+        """Find a single item with attributes matching ``**kwargs``."""
+        matches = await self.findall(**kwargs)
+        num_matches = len(matches)
+        if num_matches == 0:
+            msg = "No %s matching %s." % (self.resource_class.__name__, kwargs)
+            raise exceptions.NotFound(404, msg)
+        elif num_matches > 1:
+            raise exceptions.NoUniqueMatch
+        return matches[0]
+
+    async def findall(self, **kwargs):
+        """Find all items with attributes matching ``**kwargs``."""
+        if 'all_pages' in inspect.signature(self.list).parameters:
+            candidates = [r async for r in self.list(all_pages=True)]
+        else:
+            candidates = await self.list()
+        return base._filter_resources(candidates, kwargs.items())
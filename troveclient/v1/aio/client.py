@@ -0,0 +1,296 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""
+asyncio client for the OpenStack Database API.
+"""
+
+import asyncio
+import logging
+import ssl
+
+from oslo_utils import importutils
+
+from troveclient import exceptions
+from troveclient import jsonutils
+from troveclient.v1.aio import backups
+from troveclient.v1.aio import clusters
+from troveclient.v1.aio import configurations
+from troveclient.v1.aio import databases
+from troveclient.v1.aio import datastores
+from troveclient.v1.aio import flavors
+from troveclient.v1.aio import instances
+from troveclient.v1.aio import limits
+from troveclient.v1.aio import users
+
+aiohttp = importutils.try_import('aiohttp')
+
+_CONNECTION_ERRORS = (aiohttp.ClientConnectionError,) if aiohttp else ()
+
+
+class AsyncResponse(object):
+    """A fully read HTTP response.
+
+    Exposes the attributes of :class:`requests.Response` that
+    :func:`exceptions.from_response` and the managers rely on.
+    """
+
+    def __init__(self, status_code, headers, text):
+        self.status_code = status_code
+        self.headers = headers
+        self.text = text
+
+    def json(self):
+        return jsonutils.loads(self.text)
+
+
+class AsyncHTTPClient(object):
+    """aiohttp based transport for :class:`Client`.
+
+    Authenticates either with an explicit ``endpoint`` and ``token`` or
+    with a keystoneauth ``session``, from which the token and the database
+    endpoint are fetched once and refreshed when the token is rejected.
+    """
+
+    USER_AGENT = 'python-troveclient'
+
+    def __init__(self, endpoint=None, token=None, session=None, auth=None,
+                 service_type='database', service_name=None,
+                 endpoint_type='publicURL', region_name=None,
+                 insecure=False, cacert=None, timeout=None, retries=None,
+                 pool_maxsize=None, http_session=None, http_log_debug=False):
+        if not endpoint and not session:
+            raise exceptions.CommandError(
+                "Either an endpoint or a keystoneauth session is required.")
+        if http_session is None and aiohttp is None:
+            raise ImportError("The asyncio client requires aiohttp.")
+        self.management_url = endpoint.rstrip('/') if endpoint else None
+        self.auth_token = token
+        self.session = session
+        self.auth = auth
+        self.service_type = service_type
+        self.service_name = service_name
+        self.interface = endpoint_type
+        self.region_name = region_name
+        self.insecure = insecure
+        self.cacert = cacert
+        self.timeout = timeout
+        self.retries = int(retries or 0)
+        self.pool_maxsize = pool_maxsize
+        self.http_session = http_session
+        self.http_log_debug = http_log_debug
+        self.LOG = logging.getLogger(__name__)
+        self._auth_lock = None
+
+    def _get_http_session(self):
+        if self.http_session is None:
+            if self.insecure:
+                ssl_context = False
+            elif self.cacert:
+                ssl_context = ssl.create_default_context(cafile=self.cacert)
+            else:
+                ssl_context = None
+            connector = aiohttp.TCPConnector(limit=self.pool_maxsize or 100,
+                                             ssl=ssl_context)
+            self.http_session = aiohttp.ClientSession(connector=connector)
+        return self.http_session
+
+    async def authenticate(self):
+        """Fetch a token and the database endpoint from the session."""
+        if self.session is None:
+            if not self.auth_token:
+                raise exceptions.AuthorizationFailure(
+                    "No token to authenticate with.")
+            return
+        loop = asyncio.get_running_loop()
+        # NOTE: keystoneauth is synchronous, so run it in the default
+        # executor. It is only called when the token is missing or expired.
+        self.auth_token = await loop.run_in_executor(
+            None, self.session.get_token, self.auth)
+        if not self.management_url:
+            endpoint = await loop.run_in_executor(
+                None, lambda: self.session.get_endpoint(
+                    self.auth, service_type=self.service_type,
+                    service_name=self.service_name,
+                    interface=self.interface,
+                    region_name=self.region_name))
+            if not endpoint:
+                raise exceptions.EndpointNotFound()
+            self.management_url = endpoint.rstrip('/')
+
+    async def _reauthenticate(self, stale_token, invalidate=False):
+        """Authenticate once for all the requests that saw stale_token."""
+        if self._auth_lock is None:
+            self._auth_lock = asyncio.Lock()
+        async with self._auth_lock:
+            if self.auth_token != stale_token and self.management_url:
+                # Another request has already refreshed the token.
+                return
+            if invalidate:
+                self.session.invalidate(self.auth)
+            await self.authenticate()
+
+    async def request(self, url, method, **kwargs):
+        headers = kwargs.setdefault('headers', {})
+        headers['User-Agent'] = self.USER_AGENT
+        headers['Accept'] = 'application/json'
+        if 'body' in kwargs:
+            headers['Content-Type'] = 'application/json'
+            kwargs['data'] = jsonutils.dumps(kwargs.pop('body'))
+        if self.timeout and aiohttp is not None:
+            kwargs.setdefault('timeout',
+                              aiohttp.ClientTimeout(total=self.timeout))
+        if self.http_log_debug:
+            self.LOG.debug("REQ: %s %s %s", method, url, kwargs.get('data'))
+
+        async with self._get_http_session().request(
+                method, url, **kwargs) as http_resp:
+            text = await http_resp.text()
+            resp = AsyncResponse(http_resp.status, http_resp.headers, text)
+        if self.http_log_debug:
+            self.LOG.debug("RESP: [%s] %s\nRESP BODY: %s\n",
+                           resp.status_code, resp.headers, resp.text)
+
+        body = None
+        if resp.text:
+            try:
+                body = jsonutils.loads(resp.text)
+            except ValueError:
+                pass
+
+        if resp.status_code >= 400:
+            raise exceptions.from_response(resp, body, url)
+
+        return resp, body
+
+    async def _cs_request(self, url, method, **kwargs):
+        auth_attempts = 0
+        attempts = 0
+        backoff = 1
+        while True:
+            attempts += 1
+            if not self.management_url or not self.auth_token:
+                await self._reauthenticate(self.auth_token)
+            token = self.auth_token
+            kwargs.setdefault('headers', {})['X-Auth-Token'] = token
+            try:
+                return await self.request(self.management_url + url, method,
+                                          **kwargs)
+            except exceptions.Unauthorized:
+                if auth_attempts > 0 or self.session is None:
+                    raise
+                self.LOG.debug("Unauthorized, reauthenticating.")
+                await self._reauthenticate(token, invalidate=True)
+                # First reauth. Discount this attempt.
+                attempts -= 1
+                auth_attempts += 1
+                continue
+            except exceptions.HttpError as e:
+                if attempts > self.retries or not 500 <= e.http_status <= 599:
+                    raise
+            except _CONNECTION_ERRORS as e:
+                self.LOG.debug("Connection refused: %s", e)
+                msg = 'Unable to establish connection: %s' % e
+                raise exceptions.ConnectionRefused(msg)
+            self.LOG.debug(
+                "Failed attempt(%s of %s), retrying in %s seconds",
+                attempts, self.retries, backoff)
+            await asyncio.sleep(backoff)
+            backoff *= 2
+
+    async def close(self):
+        """Close the pooled connections held by this client."""
+        if self.http_session is not None:
+            await self.http_session.close()
+
+    def get(self, url, **kwargs):
+        return self._cs_request(url, 'GET', **kwargs)
+
+    def patch(self, url, **kwargs):
+        return self._cs_request(url, 'PATCH', **kwargs)
+
+    def post(self, url, **kwargs):
+        return self._cs_request(url, 'POST', **kwargs)
+
+    def put(self, url, **kwargs):
+        return self._cs_request(url, 'PUT', **kwargs)
+
+    def delete(self, url, **kwargs):
+        return self._cs_request(url, 'DELETE', **kwargs)
+
+
+class Client(object):
+    """asyncio client for the OpenStack Database API.
+
+    Create an instance with a keystoneauth session, or an endpoint and a
+    token::
+
+        >> client = Client(session=sess)
+
+    Then await the methods of its managers from a running event loop::
+
+        >> async with client:
+        ..     await client.instances.get(instance_id)
+        ..     async for instance in client.instances.list(all_pages=True):
+        ..         ...
+
+    The managers return the same resource classes as the synchronous
+    client, fully loaded.
+    """
+
+    def __init__(self, endpoint=None, token=None, session=None, auth=None,
+                 service_type='database', service_name=None,
+                 endpoint_type='publicURL', region_name=None,
+                 insecure=False, cacert=None, timeout=None, retries=None,
+                 pool_maxsize=None, http_session=None, http_log_debug=False):
+        self.backups = backups.Backups(self)
+        self.clusters = clusters.Clusters(self)
+        self.configurations = configurations.Configurations(self)
+        self.configuration_parameters = configurations.ConfigurationParameters(
+            self)
+        self.databases = databases.Databases(self)
+        self.datastores = datastores.Datastores(self)
+        self.datastore_versions = datastores.DatastoreVersions(self)
+        self.flavors = flavors.Flavors(self)
+        self.instances = instances.Instances(self)
+        self.limits = limits.Limits(self)
+        self.users = users.Users(self)
+
+        self.client = AsyncHTTPClient(
+            endpoint=endpoint,
+            token=token,
+            session=session,
+            auth=auth,
+            service_type=service_type,
+            service_name=service_name,
+            endpoint_type=endpoint_type,
+            region_name=region_name,
+            insecure=insecure,
+            cacert=cacert,
+            timeout=timeout,
+            retries=retries,
+            pool_maxsize=pool_maxsize,
+            http_session=http_session,
+            http_log_debug=http_log_debug)
+
+    async def authenticate(self):
+        await self.client.authenticate()
+
+    async def close(self):
+        """Release the connections pooled by the underlying HTTP client."""
+        await self.client.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        await self.close()
@@ -0,0 +1,43 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from troveclient import base
+from troveclient.v1.aio import base as aio_base
+from troveclient.v1 import clusters
+
+
+class Clusters(aio_base.AsyncManager, clusters.Clusters):
+    """Manage :class:`Cluster` resources asynchronously."""
+
+    async def delete(self, cluster):
+        """Delete the specified cluster."""
+        await self._call('delete', "/clusters/%s" % base.getid(cluster))
+
+    async def reset_status(self, cluster):
+        """Reset the status of a cluster."""
+        await self._action(cluster, {'reset-status': {}})
+
+    async def _action(self, cluster, body):
+        """Perform a cluster "action" -- grow/shrink/etc."""
+        body = await self._call('post', "/clusters/%s" % base.getid(cluster),
+                                body)
+        if body:
+            return self.resource_class(self, body['cluster'], loaded=True)
+        return body
+
+    async def add_shard(self, cluster):
+        """Adds a shard to the specified cluster."""
+        body = await self._call('post', "/clusters/%s" % base.getid(cluster),
+                                {"add_shard": {}})
+        if body:
+            return self.resource_class(self, body, loaded=True)
+        return body
@@ -0,0 +1,44 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from troveclient import base
+from troveclient.v1.aio import base as aio_base
+from troveclient.v1 import configurations
+
+
+class Configurations(aio_base.AsyncManager, configurations.Configurations):
+    """Manage :class:`Configurations` information asynchronously."""
+
+    async def update(self, configuration, values, name=None,
+                     description=None):
+        """Update an existing configuration."""
+        body = self._update_body(values, name=name, description=description)
+        await self._call('put',
+                         "/configurations/%s" % base.getid(configuration),
+                         body)
+
+    async def edit(self, configuration, values):
+        """Update an existing configuration."""
+        body = self._edit_body(values)
+        await self._call('patch',
+                         "/configurations/%s" % base.getid(configuration),
+                         body)
+
+    async def delete(self, configuration):
+        """Delete the specified configuration."""
+        await self._call('delete',
+                         "/configurations/%s" % base.getid(configuration))
+
+
+class ConfigurationParameters(aio_base.AsyncManager,
+                              configurations.ConfigurationParameters):
+    """Manage :class:`ConfigurationParameters` information asynchronously."""
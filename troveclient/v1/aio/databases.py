@@ -0,0 +1,29 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from troveclient import base
+from troveclient.v1.aio import base as aio_base
+from troveclient.v1 import databases
+
+
+class Databases(aio_base.AsyncManager, databases.Databases):
+    """Manage :class:`Databases` resources asynchronously."""
+
+    async def create(self, instance, databases):
+        """Create new databases within the specified instance."""
+        url = "/instances/%s/databases" % base.getid(instance)
+        await self._call('post', url, {"databases": databases})
+
+    async def delete(self, instance, dbname):
+        """Delete an existing database in the specified instance."""
+        url = "/instances/%s/databases/%s" % (base.getid(instance), dbname)
+        await self._call('delete', url)
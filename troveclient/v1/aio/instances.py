@@ -0,0 +1,174 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import asyncio
+
+from troveclient import base
+from troveclient import common
+from troveclient.v1.aio import base as aio_base
+from troveclient.v1 import instances
+from troveclient.v1 import modules as core_modules
+
+
+class Instances(aio_base.AsyncManager, instances.Instances):
+    """Manage :class:`Instance` resources asynchronously."""
+
+    async def modify(self, instance, configuration=None):
+        """This method is deprecated, use update instead."""
+        await self._call('put', "/instances/%s" % base.getid(instance),
+                         self._modify_body(configuration))
+
+    async def update(self, instance, configuration=None, name=None,
+                     detach_replica_source=False, remove_configuration=False,
+                     is_public=None, allowed_cidrs=None):
+        """Update instance."""
+        body = self._update_body(
+            configuration=configuration, name=name,
+            detach_replica_source=detach_replica_source,
+            remove_configuration=remove_configuration, is_public=is_public,
+            allowed_cidrs=allowed_cidrs)
+        await self._call('put', "/instances/%s" % base.getid(instance), body)
+
+    async def upgrade(self, instance, datastore_version):
+        """Upgrades an instance with a new datastore version."""
+        await self._call('patch', "/instances/%s" % base.getid(instance),
+                         self._upgrade_body(datastore_version))
+
+    async def delete(self, instance):
+        """Delete the specified instance."""
+        await self._call('delete', "/instances/%s" % base.getid(instance))
+
+    async def force_delete(self, instance):
+        """Force delete the specified instance."""
+        await self.reset_status(instance)
+        await self.delete(instance)
+
+    async def _action(self, instance, body):
+        """Perform a server "action" -- reboot/rebuild/resize/etc."""
+        url = "/instances/%s/action" % base.getid(instance)
+        body = await self._call('post', url, body)
+        if body:
+            return self.resource_class(self, body, loaded=True)
+        return body
+
+    async def reset_status(self, instance):
+        """Reset the status of an instance."""
+        await self._action(instance, {'reset_status': {}})
+
+    async def resize_volume(self, instance, volume_size):
+        """Resize the volume on an existing instances."""
+        await self._action(instance,
+                           {"resize": {"volume": {"size": volume_size}}})
+
+    async def resize_instance(self, instance, flavor_id):
+        """Resizes an instance with a new flavor."""
+        await self._action(instance, {"resize": {"flavorRef": flavor_id}})
+
+    async def restart(self, instance):
+        """Restart the database instance."""
+        await self._action(instance, {'restart': {}})
+
+    async def promote_to_replica_source(self, instance):
+        """Promote a replica to be the new replica_source of its set."""
+        await self._action(instance, {'promote_to_replica_source': {}})
+
+    async def eject_replica_source(self, instance):
+        """Eject a replica source from its set."""
+        await self._action(instance, {'eject_replica_source': {}})
+
+    async def _modules_get(self, instance, from_guest=None,
+                           include_contents=None):
+        url = "/instances/%s/modules" % base.getid(instance)
+        query_strings = {}
+        if from_guest is not None:
+            query_strings["from_guest"] = from_guest
+        if include_contents is not None:
+            query_strings["include_contents"] = include_contents
+        url = common.append_query_strings(url, **query_strings)
+        body = await self._call('get', url)
+        return [core_modules.Module(self, module, loaded=True)
+                for module in body['modules']]
+
+    async def module_retrieve(self, instance, directory=None, prefix=None):
+        """Retrieve the module data file from an instance."""
+        module_list = await self._modules_get(
+            instance, from_guest=True, include_contents=True)
+        return self._save_modules(module_list, directory, prefix)
+
+    async def module_apply(self, instance, modules):
+        """Apply modules to an instance."""
+        url = "/instances/%s/modules" % base.getid(instance)
+        body = {"modules": self._get_module_list(modules)}
+        body = await self._call('post', url, body)
+        return [core_modules.Module(self, module, loaded=True)
+                for module in body['modules']]
+
+    async def module_remove(self, instance, module):
+        """Remove a module from an instance."""
+        url = "/instances/%s/modules/%s" % (base.getid(instance),
+                                            base.getid(module))
+        await self._call('delete', url)
+
+    async def log_list(self, instance):
+        """Get a list of all guest logs."""
+        body = await self._call('get',
+                                '/instances/%s/log' % base.getid(instance))
+        return [instances.DatastoreLog(self, log, loaded=True)
+                for log in body['logs']]
+
+    async def log_action(self, instance, log_name, enable=None, disable=None,
+                         publish=None, discard=None):
+        """Perform action on guest log."""
+        body = self._log_action_body(log_name, enable=enable,
+                                     disable=disable, publish=publish,
+                                     discard=discard)
+        body = await self._call('post',
+                                "/instances/%s/log" % base.getid(instance),
+                                body)
+        return instances.DatastoreLog(self, body['log'], loaded=True)
+
+    async def _get_container_info(self, instance, log_name):
+        log_info = await self.log_show(instance, log_name)
+        return log_info.container, log_info.prefix, log_info.metafile
+
+    async def log_generator(self, instance, log_name, lines=50, swift=None,
+                            concurrency=1,
+                            chunk_size=instances.LOG_CHUNK_SIZE,
+                            follow=False, follow_interval=5):
+        """Return generator to yield the last <lines> lines of guest log.
+
+        The log is looked up asynchronously, but swiftclient is synchronous:
+        the returned generator function reads the log from swift with
+        blocking calls.
+        """
+        if not swift:
+            swift = self._get_swift_client()
+        container, prefix, metadata_file = await self._get_container_info(
+            instance, log_name)
+        return lambda: self._iter_log(swift, container, prefix, lines,
+                                      concurrency, chunk_size, follow,
+                                      follow_interval)
+
+    async def log_save(self, instance, log_name, filename=None,
+                       concurrency=1):
+        """Saves a guest log to a file.
+
+        The log is read from swift in the default executor.
+        """
+        written_file = filename or (
+            'trove-' + instance.id + '-' + log_name + ".log")
+        log_gen = await self.log_generator(instance, log_name, lines=0,
+                                           concurrency=concurrency)
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self._write_log, log_gen,
+                                   written_file)
+        return written_file
@@ -0,0 +1,28 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from troveclient.apiclient import exceptions
+from troveclient.v1.aio import base as aio_base
+from troveclient.v1 import limits
+
+
+class Limits(aio_base.AsyncManager, limits.Limits):
+    """Manages :class `Limit` resources asynchronously."""
+
+    async def _list(self, url, response_key):
+        resp, body = await self.api.client.get(url)
+        if resp is None or resp.status_code != 200:
+            raise exceptions.from_response(resp, body, url)
+        if not body:
+            raise Exception("Call to " + url + " did not return a body.")
+        return [self.resource_class(self, res, loaded=True)
+                for res in body[response_key]]
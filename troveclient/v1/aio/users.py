@@ -0,0 +1,65 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from troveclient import base
+from troveclient import common
+from troveclient.v1.aio import base as aio_base
+from troveclient.v1 import databases
+from troveclient.v1 import users
+
+
+class Users(aio_base.AsyncManager, users.Users):
+    """Manage :class:`Users` resources asynchronously."""
+
+    def _url(self, instance, username=None, hostname=None):
+        url = "/instances/%s/users" % base.getid(instance)
+        if username is not None:
+            url += "/%s" % common.quote_user_host(username, hostname)
+        return url
+
+    async def create(self, instance, users):
+        """Create users with permissions to the specified databases."""
+        await self._call('post', self._url(instance), {"users": users})
+
+    async def delete(self, instance, username, hostname=None):
+        """Delete an existing user in the specified instance."""
+        await self._call('delete', self._url(instance, username, hostname))
+
+    async def update_attributes(self, instance, username, newuserattr=None,
+                                hostname=None):
+        """Update attributes of a single User in an instance."""
+        await self._call('put', self._url(instance, username, hostname),
+                         self._update_attributes_body(username, newuserattr))
+
+    async def list_access(self, instance, username, hostname=None):
+        """Show all databases the given user has access to."""
+        url = self._url(instance, username, hostname) + "/databases"
+        body = await self._call('get', url)
+        if not body:
+            raise Exception("Call to %s did not return to a body" % url)
+        return [databases.Database(self, db, loaded=True)
+                for db in body['databases']]
+
+    async def grant(self, instance, username, databases, hostname=None):
+        """Allow an existing user permissions to access a database."""
+        url = self._url(instance, username, hostname) + "/databases"
+        await self._call('put', url, self._grant_body(databases))
+
+    async def revoke(self, instance, username, database, hostname=None):
+        """Revoke from an existing user access permissions to a database."""
+        url = "%s/databases/%s" % (self._url(instance, username, hostname),
+                                   database)
+        await self._call('delete', url)
+
+    async def change_passwords(self, instance, users):
+        """Change the password for one or more users."""
+        await self._call('put', self._url(instance), {"users": users})
@@ -18,8 +18,6 @@
 import json
 import uuid
 
-from mistralclient.api.client import client as mistral_client
-
 from troveclient import base
 from troveclient import common
 
@@ -31,6 +29,14 @@ class Backup(base.Resource):
         return "<Backup: %s>" % self.name
 
 
+class CompactBackup(Backup, base.CompactResource):
+    """A :class:`Backup` keeping its attributes in its raw dict only."""
+    RESOURCE_NAME = 'Backup'
+    FIELDS = ('id', 'name', 'description', 'status', 'instance_id',
+              'locationRef', 'size', 'parent_id', 'datastore', 'project_id',
+              'storage_driver', 'created', 'updated')
+
+
 class Schedule(base.Resource):
     """Schedule is a resource used to hold information about scheduled backups.
     """
@@ -52,6 +58,7 @@ class Backups(base.ManagerWithFind):
     """Manage :class:`Backups` information."""
 
     resource_class = Backup
+    compact_resource_class = CompactBackup
 
     def get(self, backup):
         """Get a specific backup.
@@ -62,7 +69,8 @@ class Backups(base.ManagerWithFind):
                          "backup")
 
     def list(self, limit=None, marker=None, datastore=None, instance_id=None,
-             all_projects=False, project_id=None):
+             all_projects=False, project_id=None, all_pages=False,
+             prefetch=False):
         """Get a list of all backups."""
         query_strings = {}
         if datastore:
@@ -75,7 +83,8 @@ class Backups(base.ManagerWithFind):
             query_strings["project_id"] = project_id
 
         return self._paginated("/backups", "backups", limit, marker,
-                               query_strings)
+                               query_strings, all_pages=all_pages,
+                               prefetch=prefetch)
 
     def create(self, name, instance, description=None,
                parent_id=None, incremental=False, storage_driver=None,
@@ -133,12 +142,14 @@ class Backups(base.ManagerWithFind):
         :param backup: The backup to delete
         """
         url = "/backups/%s" % base.getid(backup)
-        resp, body = self.api.client.delete(url)
+        resp, body = self._delete(url)
         common.check_for_exceptions(resp, body, url)
 
     backup_create_workflow = "trove.backup_create"
 
     def _get_mistral_client(self):
+        from mistralclient.api.client import client as mistral_client
+
         if hasattr(self.api.client, 'auth'):
             auth_url = self.api.client.auth.auth_url
             user = self.api.client.auth._username
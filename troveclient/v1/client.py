@@ -14,24 +14,43 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import importlib
+import threading
+
+from troveclient import base
 from troveclient import client as trove_client
-from troveclient.v1 import backup_strategy
-from troveclient.v1 import backups
-from troveclient.v1 import clusters
-from troveclient.v1 import configurations
-from troveclient.v1 import databases
-from troveclient.v1 import datastores
-from troveclient.v1 import flavors
-from troveclient.v1 import instances
-from troveclient.v1 import limits
-from troveclient.v1 import management
-from troveclient.v1 import metadata
-from troveclient.v1 import modules
-from troveclient.v1 import quota
-from troveclient.v1 import root
-from troveclient.v1 import security_groups
-from troveclient.v1 import users
-from troveclient.v1 import volume_types
+
+
+class _LazyManager(object):
+    """Create a manager of :class:`Client` on first access.
+
+    The module defining the manager is only imported then, so that a
+    command touching a few managers does not pay for importing all of them
+    and their dependencies. The manager is stored on the client, which
+    bypasses this descriptor from then on.
+    """
+
+    _lock = threading.Lock()
+
+    def __init__(self, module, class_name):
+        self.module = module
+        self.class_name = class_name
+        self.name = None
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, client, owner=None):
+        if client is None:
+            return self
+        with self._lock:
+            manager = client.__dict__.get(self.name)
+            if manager is None:
+                module = importlib.import_module(
+                    'troveclient.v1.' + self.module)
+                manager = getattr(module, self.class_name)(client)
+                client.__dict__[self.name] = manager
+        return manager
 
 
 class Client(object):
@@ -51,6 +70,31 @@ class Client(object):
 
     """
 
+    flavors = _LazyManager('flavors', 'Flavors')
+    volume_types = _LazyManager('volume_types', 'VolumeTypes')
+    users = _LazyManager('users', 'Users')
+    databases = _LazyManager('databases', 'Databases')
+    backups = _LazyManager('backups', 'Backups')
+    backup_strategies = _LazyManager('backup_strategy',
+                                     'BackupStrategiesManager')
+    clusters = _LazyManager('clusters', 'Clusters')
+    instances = _LazyManager('instances', 'Instances')
+    limits = _LazyManager('limits', 'Limits')
+    root = _LazyManager('root', 'Root')
+    security_group_rules = _LazyManager('security_groups',
+                                        'SecurityGroupRules')
+    security_groups = _LazyManager('security_groups', 'SecurityGroups')
+    datastores = _LazyManager('datastores', 'Datastores')
+    datastore_versions = _LazyManager('datastores', 'DatastoreVersions')
+    configurations = _LazyManager('configurations', 'Configurations')
+    configuration_parameters = _LazyManager('configurations',
+                                            'ConfigurationParameters')
+    metadata = _LazyManager('metadata', 'Metadata')
+    modules = _LazyManager('modules', 'Modules')
+    quota = _LazyManager('quota', 'Quotas')
+    mgmt_instances = _LazyManager('management', 'Management')
+    mgmt_ds_versions = _LazyManager('management', 'MgmtDatastoreVersions')
+
     def __init__(self, username=None, password=None, project_id=None,
                  auth_url='',
                  insecure=False, timeout=None, tenant_id=None,
@@ -61,32 +105,24 @@ class Client(object):
                  http_log_debug=False,
                  cacert=None, bypass_url=None,
                  auth_system='keystone', auth_plugin=None, session=None,
-                 auth=None, **kwargs):
+                 auth=None, pool_connections=None, pool_maxsize=None,
+                 resolution_cache_ttl=30, response_cache=None,
+                 token_cache=None, retry_policy=None, circuit_breaker=None,
+                 compression_threshold=None, metrics=None,
+                 compact_resources=False, strict_loading=False, **kwargs):
         # self.limits = limits.LimitsManager(self)
 
-        # extensions
-        self.flavors = flavors.Flavors(self)
-        self.volume_types = volume_types.VolumeTypes(self)
-        self.users = users.Users(self)
-        self.databases = databases.Databases(self)
-        self.backups = backups.Backups(self)
-        self.backup_strategies = backup_strategy.BackupStrategiesManager(self)
-        self.clusters = clusters.Clusters(self)
-        self.instances = instances.Instances(self)
-        self.limits = limits.Limits(self)
-        self.root = root.Root(self)
-        self.security_group_rules = security_groups.SecurityGroupRules(self)
-        self.security_groups = security_groups.SecurityGroups(self)
-        self.datastores = datastores.Datastores(self)
-        self.datastore_versions = datastores.DatastoreVersions(self)
-        self.configurations = configurations.Configurations(self)
-        self.configuration_parameters = configurations.ConfigurationParameters(
-            self)
-        self.metadata = metadata.Metadata(self)
-        self.modules = modules.Modules(self)
-        self.quota = quota.Quotas(self)
-        self.mgmt_instances = management.Management(self)
-        self.mgmt_ds_versions = management.MgmtDatastoreVersions(self)
+        # Whether the managers build compact resources, which keep their
+        # attributes in their raw dict only, see base.CompactResource.
+        self.compact_resources = compact_resources
+        # Resources lazy-loaded on attribute access, refused when strict.
+        self.lazy_loads = base.LazyLoads(strict=strict_loading)
+
+        # Name to resource index shared by the find() of all managers.
+        self.resolution_index = base.ResolutionIndex(ttl=resolution_cache_ttl)
+        # Identical GETs sent concurrently by several threads share one
+        # request.
+        self.request_coalescer = base.RequestCoalescer()
 
         # Add in any extensions...
         if extensions:
@@ -118,6 +154,14 @@ class Client(object):
             auth_plugin=auth_plugin,
             session=session,
             auth=auth,
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            response_cache=response_cache,
+            token_cache=token_cache,
+            retry_policy=retry_policy,
+            circuit_breaker=circuit_breaker,
+            compression_threshold=compression_threshold,
+            metrics=metrics,
             **kwargs)
 
     def authenticate(self):
@@ -131,5 +175,15 @@ class Client(object):
         """
         self.client.authenticate()
 
+    def close(self):
+        """Release the connections pooled by the underlying HTTP client."""
+        self.client.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
     def get_database_api_version_from_endpoint(self):
         return self.client.get_database_api_version_from_endpoint()
@@ -32,9 +32,18 @@ class Cluster(base.Resource):
         self.manager.delete(self)
 
 
+class CompactCluster(Cluster, base.CompactResource):
+    """A :class:`Cluster` keeping its attributes in its raw dict only."""
+    RESOURCE_NAME = 'Cluster'
+    FIELDS = ('id', 'name', 'task', 'datastore', 'instances', 'ip',
+              'locality', 'configuration', 'extended_properties', 'tenant_id',
+              'created', 'updated', 'links')
+
+
 class Clusters(base.ManagerWithFind):
     """Manage :class:`Cluster` resources."""
     resource_class = Cluster
+    compact_resource_class = CompactCluster
 
     def create(self, name, datastore, datastore_version, instances=None,
                locality=None, extended_properties=None, configuration=None):
@@ -58,12 +67,13 @@ class Clusters(base.ManagerWithFind):
 
         return self._create("/clusters", body, "cluster")
 
-    def list(self, limit=None, marker=None):
+    def list(self, limit=None, marker=None, all_pages=False, prefetch=False):
         """Get a list of all clusters.
 
         :rtype: list of :class:`Cluster`.
         """
-        return self._paginated("/clusters", "clusters", limit, marker)
+        return self._paginated("/clusters", "clusters", limit, marker,
+                               all_pages=all_pages, prefetch=prefetch)
 
     def get(self, cluster):
         """Get a specific cluster.
@@ -79,7 +89,7 @@ class Clusters(base.ManagerWithFind):
         :param cluster: The cluster to delete
         """
         url = "/clusters/%s" % base.getid(cluster)
-        resp, body = self.api.client.delete(url)
+        resp, body = self._delete(url)
         common.check_for_exceptions(resp, body, url)
 
     def reset_status(self, cluster):
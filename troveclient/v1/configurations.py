@@ -47,13 +47,14 @@ class Configurations(base.ManagerWithFind):
                                base.getid(configuration),
                                "instances", limit, marker)
 
-    def list(self, limit=None, marker=None):
+    def list(self, limit=None, marker=None, all_pages=False, prefetch=False):
         """Get a list of all configurations.
 
         :rtype: list of :class:`Configurations`.
         """
         return self._paginated("/configurations", "configurations",
-                               limit, marker)
+                               limit, marker, all_pages=all_pages,
+                               prefetch=prefetch)
 
     def create(self, name, values, description=None, datastore=None,
                datastore_version=None, datastore_version_number=None):
@@ -77,8 +78,8 @@ class Configurations(base.ManagerWithFind):
             body['configuration']['description'] = description
         return self._create("/configurations", body, "configuration")
 
-    def update(self, configuration, values, name=None, description=None):
-        """Update an existing configuration."""
+    @staticmethod
+    def _update_body(values, name=None, description=None):
         body = {
             "configuration": {
                 "values": json.loads(values)
@@ -88,19 +89,30 @@ class Configurations(base.ManagerWithFind):
             body['configuration']['name'] = name
         if description:
             body['configuration']['description'] = description
+        return body
+
+    def update(self, configuration, values, name=None, description=None):
+        """Update an existing configuration."""
+        body = self._update_body(values, name=name, description=description)
         url = "/configurations/%s" % base.getid(configuration)
         resp, body = self.api.client.put(url, body=body)
+        self._invalidate_caches()
         common.check_for_exceptions(resp, body, url)
 
-    def edit(self, configuration, values):
-        """Update an existing configuration."""
-        body = {
+    @staticmethod
+    def _edit_body(values):
+        return {
             "configuration": {
                 "values": json.loads(values)
             }
         }
+
+    def edit(self, configuration, values):
+        """Update an existing configuration."""
+        body = self._edit_body(values)
         url = "/configurations/%s" % base.getid(configuration)
         resp, body = self.api.client.patch(url, body=body)
+        self._invalidate_caches()
         common.check_for_exceptions(resp, body, url)
 
     def delete(self, configuration):
@@ -109,7 +121,7 @@ class Configurations(base.ManagerWithFind):
         :param configuration: The configuration id to delete
         """
         url = "/configurations/%s" % base.getid(configuration)
-        resp, body = self.api.client.delete(url)
+        resp, body = self._delete(url)
         common.check_for_exceptions(resp, body, url)
 
 
@@ -123,6 +135,7 @@ class ConfigurationParameters(base.ManagerWithFind):
     """Manage :class:`ConfigurationParameters` information."""
 
     resource_class = ConfigurationParameter
+    cache_responses = True
 
     def parameters(self, datastore, version):
         """Get a list of valid parameters that can be changed."""
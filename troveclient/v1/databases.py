@@ -37,21 +37,25 @@ class Databases(base.ManagerWithFind):
         body = {"databases": databases}
         url = "/instances/%s/databases" % base.getid(instance)
         resp, body = self.api.client.post(url, body=body)
+        self._invalidate_caches()
         common.check_for_exceptions(resp, body, url)
 
     def delete(self, instance, dbname):
         """Delete an existing database in the specified instance."""
         url = "/instances/%s/databases/%s" % (base.getid(instance), dbname)
         resp, body = self.api.client.delete(url)
+        self._invalidate_caches()
         common.check_for_exceptions(resp, body, url)
 
-    def list(self, instance, limit=None, marker=None):
+    def list(self, instance, limit=None, marker=None, all_pages=False,
+             prefetch=False):
         """Get a list of all Databases from the instance.
 
         :rtype: list of :class:`Database`.
         """
         url = "/instances/%s/databases" % base.getid(instance)
-        return self._paginated(url, "databases", limit, marker)
+        return self._paginated(url, "databases", limit, marker,
+                               all_pages=all_pages, prefetch=prefetch)
 
 #    def get(self, instance, database):
 #        """
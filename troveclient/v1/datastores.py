@@ -42,16 +42,18 @@ class DatastoreVersionMember(base.Resource):
 class Datastores(base.ManagerWithFind):
     """Manage :class:`Datastore` resources."""
     resource_class = Datastore
+    cache_responses = True
 
     def __repr__(self):
         return "<Datastore Manager at %s>" % id(self)
 
-    def list(self, limit=None, marker=None):
+    def list(self, limit=None, marker=None, all_pages=False, prefetch=False):
         """Get a list of all datastores.
 
         :rtype: list of :class:`Datastore`.
         """
-        return self._paginated("/datastores", "datastores", limit, marker)
+        return self._paginated("/datastores", "datastores", limit, marker,
+                               all_pages=all_pages, prefetch=prefetch)
 
     def get(self, datastore):
         """Get a specific datastore.
@@ -69,17 +71,20 @@ class Datastores(base.ManagerWithFind):
 class DatastoreVersions(base.ManagerWithFind):
     """Manage :class:`DatastoreVersion` resources."""
     resource_class = DatastoreVersion
+    cache_responses = True
 
     def __repr__(self):
         return "<DatastoreVersions Manager at %s>" % id(self)
 
-    def list(self, datastore, limit=None, marker=None):
+    def list(self, datastore, limit=None, marker=None, all_pages=False,
+             prefetch=False):
         """Get a list of all datastore versions.
 
         :rtype: list of :class:`DatastoreVersion`.
         """
         return self._paginated("/datastores/%s/versions" % datastore,
-                               "versions", limit, marker)
+                               "versions", limit, marker,
+                               all_pages=all_pages, prefetch=prefetch)
 
     def get(self, datastore, datastore_version):
         """Get a specific datastore version.
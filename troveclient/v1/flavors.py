@@ -32,6 +32,7 @@ class Flavor(base.Resource):
 class Flavors(base.ManagerWithFind):
     """Manage :class:`Flavor` resources."""
     resource_class = Flavor
+    cache_responses = True
 
     def list(self):
         """Get a list of all flavors.
@@ -15,7 +15,14 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import codecs
+import collections
+from concurrent import futures
+import itertools
 import os
+import tempfile
+import threading
+import time
 
 from troveclient import base
 from troveclient import common
@@ -23,10 +30,11 @@ from troveclient import exceptions
 from troveclient import utils
 from troveclient.v1 import modules as core_modules
 
-from swiftclient import client as swift_client
-
 REBOOT_SOFT = 'SOFT'
 REBOOT_HARD = 'HARD'
+LOG_CHUNK_SIZE = 64 * 1024
+# Size above which log parts downloaded ahead are spooled to disk.
+LOG_SPOOL_SIZE = 8 * 1024 * 1024
 
 
 class Instance(base.Resource):
@@ -53,6 +61,16 @@ class Instance(base.Resource):
         self.manager.edit(self.id, detach_replica_source=True)
 
 
+class CompactInstance(Instance, base.CompactResource):
+    """An :class:`Instance` keeping its attributes in its raw dict only."""
+    RESOURCE_NAME = 'Instance'
+    FIELDS = ('id', 'name', 'status', 'operating_status', 'flavor', 'volume',
+              'datastore', 'region', 'ip', 'addresses', 'access',
+              'replica_of', 'replicas', 'configuration', 'cluster_id',
+              'shard_id', 'locality', 'fault', 'networks', 'tenant_id',
+              'server_id', 'created', 'updated', 'links')
+
+
 class DatastoreLog(base.Resource):
     """A DatastoreLog is a log on the database guest instance."""
 
@@ -63,8 +81,11 @@ class DatastoreLog(base.Resource):
 class Instances(base.ManagerWithFind):
     """Manage :class:`Instance` resources."""
     resource_class = Instance
+    compact_resource_class = CompactInstance
 
     def _get_swift_client(self):
+        from swiftclient import client as swift_client
+
         if hasattr(self.api.client, 'auth'):
             auth_url = self.api.client.auth.auth_url
             user = self.api.client.auth._username
@@ -140,26 +161,28 @@ class Instances(base.ManagerWithFind):
 
         return self._create("/instances", body, "instance")
 
-    def modify(self, instance, configuration=None):
-        """This method is deprecated, use update instead."""
+    @staticmethod
+    def _modify_body(configuration=None):
         body = {
             "instance": {
             }
         }
         if configuration is not None:
             body["instance"]["configuration"] = base.getid(configuration)
+        return body
+
+    def modify(self, instance, configuration=None):
+        """This method is deprecated, use update instead."""
+        body = self._modify_body(configuration)
         url = "/instances/%s" % base.getid(instance)
         resp, body = self.api.client.put(url, body=body)
+        self._invalidate_caches()
         common.check_for_exceptions(resp, body, url)
 
-    def update(self, instance, configuration=None, name=None,
-               detach_replica_source=False, remove_configuration=False,
-               is_public=None, allowed_cidrs=None):
-        """Update instance.
-
-        The configuration change, detach_replica and access change cannot be
-        updated at the same time.
-        """
+    @staticmethod
+    def _update_body(configuration=None, name=None,
+                     detach_replica_source=False, remove_configuration=False,
+                     is_public=None, allowed_cidrs=None):
         body = {
             "instance": {}
         }
@@ -180,25 +203,44 @@ class Instances(base.ManagerWithFind):
                 body["instance"]['access']['is_public'] = is_public
             if allowed_cidrs is not None:
                 body["instance"]['access']['allowed_cidrs'] = allowed_cidrs
+        return body
 
+    def update(self, instance, configuration=None, name=None,
+               detach_replica_source=False, remove_configuration=False,
+               is_public=None, allowed_cidrs=None):
+        """Update instance.
+
+        The configuration change, detach_replica and access change cannot be
+        updated at the same time.
+        """
+        body = self._update_body(
+            configuration=configuration, name=name,
+            detach_replica_source=detach_replica_source,
+            remove_configuration=remove_configuration, is_public=is_public,
+            allowed_cidrs=allowed_cidrs)
         url = "/instances/%s" % base.getid(instance)
         resp, body = self.api.client.put(url, body=body)
+        self._invalidate_caches()
         common.check_for_exceptions(resp, body, url)
 
-    def upgrade(self, instance, datastore_version):
-        """Upgrades an instance with a new datastore version."""
-        body = {
+    @staticmethod
+    def _upgrade_body(datastore_version):
+        return {
             "instance": {
                 "datastore_version": datastore_version
             }
         }
 
+    def upgrade(self, instance, datastore_version):
+        """Upgrades an instance with a new datastore version."""
+        body = self._upgrade_body(datastore_version)
         url = "/instances/%s" % base.getid(instance)
         resp, body = self.api.client.patch(url, body=body)
+        self._invalidate_caches()
         common.check_for_exceptions(resp, body, url)
 
     def list(self, limit=None, marker=None, include_clustered=False,
-             detailed=False):
+             detailed=False, all_pages=False, prefetch=False):
         """Get a list of all instances.
 
         :rtype: list of :class:`Instance`.
@@ -206,7 +248,8 @@ class Instances(base.ManagerWithFind):
         detail = "/detail" if detailed else ""
         url = "/instances%s" % detail
         return self._paginated(url, "instances", limit, marker,
-                               {"include_clustered": include_clustered})
+                               {"include_clustered": include_clustered},
+                               all_pages=all_pages, prefetch=prefetch)
 
     def get(self, instance):
         """Get a specific instances.
@@ -216,7 +259,8 @@ class Instances(base.ManagerWithFind):
         return self._get("/instances/%s" % base.getid(instance),
                          "instance")
 
-    def backups(self, instance, limit=None, marker=None):
+    def backups(self, instance, limit=None, marker=None, all_pages=False,
+                prefetch=False):
         """Get the list of backups for a specific instance.
 
         :param instance: instance for which to list backups
@@ -225,7 +269,8 @@ class Instances(base.ManagerWithFind):
         :rtype: list of :class:`Backups`.
         """
         url = "/instances/%s/backups" % base.getid(instance)
-        return self._paginated(url, "backups", limit, marker)
+        return self._paginated(url, "backups", limit, marker,
+                               all_pages=all_pages, prefetch=prefetch)
 
     def delete(self, instance):
         """Delete the specified instance.
@@ -233,7 +278,7 @@ class Instances(base.ManagerWithFind):
         :param instance: A reference to the instance to delete
         """
         url = "/instances/%s" % base.getid(instance)
-        resp, body = self.api.client.delete(url)
+        resp, body = self._delete(url)
         common.check_for_exceptions(resp, body, url)
 
     def reset_status(self, instance):
@@ -318,6 +363,16 @@ class Instances(base.ManagerWithFind):
         """Retrieve the module data file from an instance.  This includes
         the contents of the module data file.
         """
+        module_list = self._modules_get(
+            instance, from_guest=True, include_contents=True)
+        return self._save_modules(module_list, directory, prefix)
+
+    @staticmethod
+    def _save_modules(module_list, directory=None, prefix=None):
+        """Write the contents of each module to a file in ``directory``.
+
+        :returns: a dict mapping each module name to its file name.
+        """
         if directory:
             try:
                 os.makedirs(directory, exist_ok=True)
@@ -333,8 +388,6 @@ class Instances(base.ManagerWithFind):
         prefix = prefix or ''
         if prefix and not prefix.endswith('_'):
             prefix += '_'
-        module_list = self._modules_get(
-            instance, from_guest=True, include_contents=True)
         saved_modules = {}
         for module in module_list:
             filename = '%s%s_%s_%s.dat' % (prefix, module.name,
@@ -400,6 +453,20 @@ class Instances(base.ManagerWithFind):
     def log_show(self, instance, log_name):
         return self.log_action(instance, log_name)
 
+    @staticmethod
+    def _log_action_body(log_name, enable=None, disable=None, publish=None,
+                         discard=None):
+        body = {"name": log_name}
+        if enable:
+            body.update({'enable': int(enable)})
+        if disable:
+            body.update({'disable': int(disable)})
+        if publish:
+            body.update({'publish': int(publish)})
+        if discard:
+            body.update({'discard': int(discard)})
+        return body
+
     def log_action(self, instance, log_name, enable=None, disable=None,
                    publish=None, discard=None):
         """Perform action on guest log.
@@ -413,22 +480,17 @@ class Instances(base.ManagerWithFind):
         :param discard: Delete the associated container
         :rtype: List of :class:`DatastoreLog`.
         """
-        body = {"name": log_name}
-        if enable:
-            body.update({'enable': int(enable)})
-        if disable:
-            body.update({'disable': int(disable)})
-        if publish:
-            body.update({'publish': int(publish)})
-        if discard:
-            body.update({'discard': int(discard)})
-
+        body = self._log_action_body(log_name, enable=enable,
+                                     disable=disable, publish=publish,
+                                     discard=discard)
         url = "/instances/%s/log" % base.getid(instance)
         resp, body = self.api.client.post(url, body=body)
         common.check_for_exceptions(resp, body, url)
         return DatastoreLog(self, body['log'], loaded=True)
 
     def _get_container_info(self, instance, log_name):
+        from swiftclient import client as swift_client
+
         try:
             log_info = self.log_show(instance, log_name)
             container = log_info.container
@@ -440,7 +502,131 @@ class Instances(base.ManagerWithFind):
                 raise exceptions.GuestLogNotFoundError()
             raise
 
-    def log_generator(self, instance, log_name, lines=50, swift=None):
+    def _clone_swift_client(self, swift):
+        """Return a new connection sharing the credentials of ``swift``.
+
+        swiftclient connections are not thread safe, so each download
+        worker gets its own, reusing the token of the original connection.
+        """
+        from swiftclient import client as swift_client
+
+        return swift_client.Connection(
+            swift.authurl, swift.user, swift.key, retries=swift.retries,
+            preauthurl=swift.url, preauthtoken=swift.token,
+            os_options=swift.os_options, auth_version=swift.auth_version,
+            cacert=swift.cacert, insecure=swift.insecure, cert=swift.cert,
+            cert_key=swift.cert_key, timeout=swift.timeout,
+            session=swift.session)
+
+    def _iter_log_parts(self, swift, container, parts, concurrency,
+                        chunk_size):
+        """Yield ``(part, chunks)`` for each log part, in order.
+
+        ``chunks`` iterates over the content of the part in blocks of at
+        most ``chunk_size`` bytes. With a ``concurrency`` above 1 up to
+        that many parts are downloaded ahead by a pool of workers, which
+        spool them to temporary files so memory use stays bounded.
+        """
+        if concurrency <= 1:
+            for part in parts:
+                headers, chunks = swift.get_object(
+                    container, part['name'], resp_chunk_size=chunk_size)
+                yield part, chunks
+            return
+
+        workers = _SwiftWorkers(swift, concurrency, self._clone_swift_client)
+
+        def download(conn, name):
+            headers, chunks = conn.get_object(container, name,
+                                              resp_chunk_size=chunk_size)
+            spool = tempfile.SpooledTemporaryFile(max_size=LOG_SPOOL_SIZE)
+            for chunk in chunks:
+                spool.write(chunk)
+            spool.seek(0)
+            return spool
+
+        def read(spool):
+            with spool:
+                for chunk in iter(lambda: spool.read(chunk_size), b''):
+                    yield chunk
+
+        with workers:
+            pending = collections.deque()
+            queued = iter(parts)
+            for part in itertools.islice(queued, concurrency):
+                pending.append((part, workers.submit(download, part['name'])))
+            while pending:
+                part, job = pending.popleft()
+                for next_part in itertools.islice(queued, 1):
+                    pending.append((next_part, workers.submit(
+                        download, next_part['name'])))
+                yield part, read(job.result())
+
+    def _log_tail_parts(self, swift, container, parts, lines, concurrency):
+        """Select the newest log parts holding the last ``lines`` lines.
+
+        :returns: the selected parts, oldest first, and the number of lines
+                  to show from the first of them.
+        """
+        parts = sorted(parts, key=lambda obj: obj['last_modified'],
+                       reverse=True)
+        selected = []
+        remaining = lines
+        with _SwiftWorkers(swift, concurrency,
+                           self._clone_swift_client) as workers:
+            for start in range(0, len(parts), max(concurrency, 1)):
+                batch = parts[start:start + max(concurrency, 1)]
+                jobs = [workers.submit(lambda conn, name: conn.head_object(
+                        container, name), part['name']) for part in batch]
+                for part, job in zip(batch, jobs):
+                    obj_lines = int(job.result()['x-object-meta-lines'])
+                    selected.insert(0, part)
+                    if obj_lines >= remaining:
+                        return selected, remaining
+                    remaining -= obj_lines
+        return selected, lines
+
+    def _follow_log(self, swift, container, prefix, last_name, offset,
+                    interval, chunk_size):
+        """Yield what is appended to a guest log, forever.
+
+        Every ``interval`` seconds the latest part is checked for growth,
+        and only its new bytes are fetched with a ranged GET. Parts newer
+        than the latest one are listed with a marker and streamed whole.
+        """
+        decoder = codecs.getincrementaldecoder('utf-8')()
+        while True:
+            time.sleep(interval)
+            if last_name is not None:
+                headers = swift.head_object(container, last_name)
+                if int(headers['content-length']) > offset:
+                    headers, chunks = swift.get_object(
+                        container, last_name, resp_chunk_size=chunk_size,
+                        headers={'Range': 'bytes=%d-' % offset})
+                    for chunk in chunks:
+                        offset += len(chunk)
+                        text = decoder.decode(chunk)
+                        if text:
+                            yield text
+
+            head, body = swift.get_container(container, prefix=prefix,
+                                             marker=last_name)
+            for part in sorted(body, key=lambda obj: obj['last_modified']):
+                text = decoder.decode(b'', final=True)
+                if text:
+                    yield text
+                last_name, offset = part['name'], 0
+                headers, chunks = swift.get_object(
+                    container, last_name, resp_chunk_size=chunk_size)
+                for chunk in chunks:
+                    offset += len(chunk)
+                    text = decoder.decode(chunk)
+                    if text:
+                        yield text
+
+    def log_generator(self, instance, log_name, lines=50, swift=None,
+                      concurrency=1, chunk_size=LOG_CHUNK_SIZE,
+                      follow=False, follow_interval=5):
         """Return generator to yield the last <lines> lines of guest log.
 
         :param instance: The :class:`Instance` (or its ID) of the database
@@ -448,71 +634,172 @@ class Instances(base.ManagerWithFind):
         :param log_name: The name of <log> to publish
         :param lines: Display last <lines> lines of log (0 for all lines)
         :param swift: Connection to swift
+        :param concurrency: Number of log parts to fetch in parallel
+        :param chunk_size: Size in bytes of the blocks log parts are
+                           streamed in
+        :param follow: Keep yielding new log entries as they are published
+        :param follow_interval: Seconds between checks for new entries
         :rtype: generator function to yield log as chunks.
         """
         if not swift:
             swift = self._get_swift_client()
 
         def _log_generator(instance, log_name, lines, swift):
-            try:
-                container, prefix, metadata_file = self._get_container_info(
-                    instance, log_name)
-
-                head, body = swift.get_container(container, prefix=prefix)
-                log_obj_to_display = []
-
-                if lines:
-                    total_lines = lines
-                    partial_results = False
-                    parts = sorted(body, key=lambda obj: obj['last_modified'],
-                                   reverse=True)
-
-                    for part in parts:
-                        obj_hdrs = swift.head_object(container, part['name'])
-                        obj_lines = int(obj_hdrs['x-object-meta-lines'])
-                        log_obj_to_display.insert(0, part)
-                        if obj_lines >= lines:
-                            partial_results = True
-                            break
-                        lines -= obj_lines
-                    if not partial_results:
-                        lines = total_lines
-
-                    part = log_obj_to_display.pop(0)
-                    hdrs, log_obj = swift.get_object(container, part['name'])
-                    log_by_lines = log_obj.decode().splitlines()
-                    yield "\n".join(log_by_lines[-1 * lines:]) + "\n"
-                else:
-                    # Show all the logs
-                    log_obj_to_display = sorted(
-                        body, key=lambda obj: obj['last_modified'])
-
-                for log_part in log_obj_to_display:
-                    headers, log_obj = swift.get_object(container,
-                                                        log_part['name'])
-                    yield log_obj.decode()
-            except swift_client.ClientException as ex:
-                if ex.http_status == 404:
-                    raise exceptions.GuestLogNotFoundError()
-                raise
+            container, prefix, metadata_file = self._get_container_info(
+                instance, log_name)
+            yield from self._iter_log(swift, container, prefix, lines,
+                                      concurrency, chunk_size, follow,
+                                      follow_interval)
 
         return lambda: _log_generator(instance, log_name, lines, swift)
 
-    def log_save(self, instance, log_name, filename=None):
+    def _iter_log(self, swift, container, prefix, lines, concurrency,
+                  chunk_size, follow, follow_interval):
+        """Yield the last ``lines`` lines of the guest log in ``container``.
+
+        See :meth:`log_generator` for the arguments.
+        """
+        from swiftclient import client as swift_client
+
+        try:
+            head, body = swift.get_container(container, prefix=prefix)
+
+            first_lines = None
+            if lines:
+                log_obj_to_display, first_lines = self._log_tail_parts(
+                    swift, container, body, lines, concurrency)
+            else:
+                # Show all the logs
+                log_obj_to_display = sorted(
+                    body, key=lambda obj: obj['last_modified'])
+
+            # Bytes read from the latest part, where follow resumes.
+            last_name = None
+            offset = [0]
+            if log_obj_to_display:
+                last_name = log_obj_to_display[-1]['name']
+
+            log_parts = self._iter_log_parts(
+                swift, container, log_obj_to_display, concurrency,
+                chunk_size)
+            for log_part, chunks in log_parts:
+                if log_part['name'] == last_name:
+                    chunks = _count_bytes(chunks, offset)
+                if first_lines is not None:
+                    tail = _tail_lines(_decode_chunks(chunks),
+                                       first_lines)
+                    first_lines = None
+                    yield "\n".join(tail) + "\n"
+                    continue
+                for text in _decode_chunks(chunks):
+                    yield text
+
+            if follow:
+                for text in self._follow_log(
+                        swift, container, prefix, last_name, offset[0],
+                        follow_interval, chunk_size):
+                    yield text
+        except swift_client.ClientException as ex:
+            if ex.http_status == 404:
+                raise exceptions.GuestLogNotFoundError()
+            raise
+
+    def log_save(self, instance, log_name, filename=None, concurrency=1):
         """Saves a guest log to a file.
 
         :param instance: The :class:`Instance` (or its ID) of the database
                          instance to get the log for.
         :param log_name: The name of <log> to publish
+        :param concurrency: Number of log parts to fetch in parallel
         :rtype: Filename to which log was saved
         """
         written_file = filename or (
             'trove-' + instance.id + '-' + log_name + ".log")
-        log_gen = self.log_generator(instance, log_name, lines=0)
-        with open(written_file, 'w') as f:
+        log_gen = self.log_generator(instance, log_name, lines=0,
+                                     concurrency=concurrency)
+        self._write_log(log_gen, written_file)
+        return written_file
+
+    @staticmethod
+    def _write_log(log_gen, filename):
+        with open(filename, 'w') as f:
             for log_obj in log_gen():
                 f.write(log_obj)
-        return written_file
+
+
+class _SwiftWorkers(object):
+    """Run swift calls on a thread pool, one connection per thread.
+
+    With a concurrency of 1 the calls run inline on ``swift``.
+    """
+
+    def __init__(self, swift, concurrency, clone):
+        self.swift = swift
+        self.clone = clone
+        self.local = threading.local()
+        self.executor = None
+        if concurrency > 1:
+            self.executor = futures.ThreadPoolExecutor(
+                max_workers=concurrency)
+
+    def _run(self, fn, *args):
+        conn = getattr(self.local, 'conn', None)
+        if conn is None:
+            conn = self.local.conn = self.clone(self.swift)
+        return fn(conn, *args)
+
+    def submit(self, fn, *args):
+        if self.executor is not None:
+            return self.executor.submit(self._run, fn, *args)
+        job = futures.Future()
+        try:
+            job.set_result(fn(self.swift, *args))
+        except Exception as e:
+            job.set_exception(e)
+        return job
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        if self.executor is not None:
+            self.executor.shutdown(wait=True, cancel_futures=True)
+
+
+def _decode_chunks(chunks):
+    """Decode a stream of UTF-8 byte chunks."""
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    for chunk in chunks:
+        text = decoder.decode(chunk)
+        if text:
+            yield text
+    text = decoder.decode(b'', final=True)
+    if text:
+        yield text
+
+
+def _count_bytes(chunks, counter):
+    """Pass byte chunks through, adding their length to ``counter[0]``."""
+    for chunk in chunks:
+        counter[0] += len(chunk)
+        yield chunk
+
+
+def _tail_lines(texts, count):
+    """Return the last ``count`` lines of a stream of text blocks."""
+    tail = collections.deque(maxlen=count)
+    pending = ''
+    for text in texts:
+        lines = (pending + text).splitlines(True)
+        pending = ''
+        if lines and (lines[-1][-1] not in '\n\r' or
+                      lines[-1].endswith('\r')):
+            # Incomplete line, or a '\r' that may be followed by '\n'.
+            pending = lines.pop()
+        tail.extend(line.splitlines()[0] for line in lines)
+    if pending:
+        tail.extend(pending.splitlines())
+    return list(tail)
 
 
 class InstanceStatus(object):
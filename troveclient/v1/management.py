@@ -34,6 +34,7 @@ class RootHistory(base.Resource):
 class Management(base.ManagerWithFind):
     """Manage :class:`Instances` resources."""
     resource_class = instances.Instance
+    compact_resource_class = instances.CompactInstance
 
     def show(self, instance):
         """Get details of one instance.
@@ -48,13 +49,15 @@ class Management(base.ManagerWithFind):
         """A wrapper for list method."""
         return self.list(**kwargs)
 
-    def list(self, limit=None, marker=None, deleted=False, **kwargs):
+    def list(self, limit=None, marker=None, deleted=False, all_pages=False,
+             prefetch=False, **kwargs):
         """Get all the database instances."""
         url = "/mgmt/instances"
         kwargs["deleted"] = deleted
 
         return self._paginated(url, "instances", limit, marker,
-                               query_strings=kwargs)
+                               query_strings=kwargs, all_pages=all_pages,
+                               prefetch=prefetch)
 
     def root_enabled_history(self, instance):
         """Get root access history of one instance."""
@@ -112,6 +115,7 @@ class Management(base.ManagerWithFind):
 class MgmtClusters(base.ManagerWithFind):
     """Manage :class:`Cluster` resources."""
     resource_class = clusters.Cluster
+    compact_resource_class = clusters.CompactCluster
 
     # Appease the abc gods
     def list(self):
@@ -206,6 +210,7 @@ class MgmtConfigurationParameters(configurations.ConfigurationParameters):
 
         url = "/mgmt/datastores/versions/%s/parameters" % version
         resp, body = self.api.client.post(url, body=body)
+        self._invalidate_caches()
         common.check_for_exceptions(resp, body, url)
 
     def list_all_parameter_by_version(self, version):
@@ -239,6 +244,7 @@ class MgmtConfigurationParameters(configurations.ConfigurationParameters):
         url = ("/mgmt/datastores/versions/%(version)s/"
                "parameters/%(parameter_name)s" % output)
         resp, body = self.api.client.put(url, body=body)
+        self._invalidate_caches()
         common.check_for_exceptions(resp, body, url)
 
     def delete(self, version, name):
@@ -250,6 +256,7 @@ class MgmtConfigurationParameters(configurations.ConfigurationParameters):
         url = ("/mgmt/datastores/versions/%(version_id)s/"
                "parameters/%(parameter_name)s" % output)
         resp, body = self.api.client.delete(url)
+        self._invalidate_caches()
         common.check_for_exceptions(resp, body, url)
 
 
@@ -322,10 +329,11 @@ class MgmtDatastoreVersions(base.ManagerWithFind):
 
         url = ("/mgmt/datastore-versions/%s" % datastore_version_id)
         resp, body = self.api.client.patch(url, body=body)
+        self._invalidate_caches()
         common.check_for_exceptions(resp, body, url)
 
     def delete(self, datastore_version_id):
         """Delete a datastore version."""
         url = ("/mgmt/datastore-versions/%s" % datastore_version_id)
-        resp, body = self.api.client.delete(url)
+        resp, body = self._delete(url)
         common.check_for_exceptions(resp, body, url)
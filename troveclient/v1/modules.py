@@ -134,16 +134,19 @@ class Modules(base.ManagerWithFind):
 
         url = "/modules/%s" % base.getid(module)
         resp, body = self.api.client.put(url, body=body)
+        self._invalidate_caches()
         common.check_for_exceptions(resp, body, url)
         return Module(self, body['module'], loaded=True)
 
-    def list(self, limit=None, marker=None, datastore=None):
+    def list(self, limit=None, marker=None, datastore=None, all_pages=False,
+             prefetch=False):
         """Get a list of all modules."""
         query_strings = None
         if datastore:
             query_strings = {"datastore": base.getid(datastore)}
         return self._paginated(
-            "/modules", "modules", limit, marker, query_strings=query_strings)
+            "/modules", "modules", limit, marker, query_strings=query_strings,
+            all_pages=all_pages, prefetch=prefetch)
 
     def get(self, module):
         """Get a specific module."""
@@ -153,11 +156,12 @@ class Modules(base.ManagerWithFind):
     def delete(self, module):
         """Delete the specified module."""
         url = "/modules/%s" % base.getid(module)
-        resp, body = self.api.client.delete(url)
+        resp, body = self._delete(url)
         common.check_for_exceptions(resp, body, url)
 
     def instances(self, module, limit=None, marker=None,
-                  include_clustered=False, count_only=False):
+                  include_clustered=False, count_only=False, all_pages=False,
+                  prefetch=False):
         """Get a list of all instances this module has been applied to."""
         url = "/modules/%s/instances" % base.getid(module)
         query_strings = {}
@@ -166,7 +170,8 @@ class Modules(base.ManagerWithFind):
         if count_only:
             query_strings['count_only'] = count_only
         return self._paginated(url, "instances", limit, marker,
-                               query_strings=query_strings)
+                               query_strings=query_strings,
+                               all_pages=all_pages, prefetch=prefetch)
 
     def reapply(self, module, md5=None, include_clustered=None,
                 batch_size=None, delay=None, force=None):
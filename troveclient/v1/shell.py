@@ -309,30 +309,35 @@ def do_volume_type_show(cs, args):
 def do_list(cs, args):
     """Lists all the instances."""
     instances = cs.instances.list(limit=args.limit, marker=args.marker,
-                                  include_clustered=args.include_clustered)
+                                  include_clustered=args.include_clustered,
+                                  all_pages=not args.limit)
     _print_instances(instances)
 
 
 def _print_instances(instances, is_admin=False):
-    for instance in instances:
-        setattr(instance, 'flavor_id', instance.flavor['id'])
-        if hasattr(instance, 'volume'):
-            setattr(instance, 'size', instance.volume['size'])
-        else:
-            setattr(instance, 'size', '-')
-        if not hasattr(instance, 'region'):
-            setattr(instance, 'region', '')
-        if hasattr(instance, 'datastore'):
-            if instance.datastore.get('version'):
-                setattr(instance, 'datastore_version',
-                        instance.datastore['version'])
-            setattr(instance, 'datastore', instance.datastore['type'])
     fields = ['id', 'name', 'datastore',
               'datastore_version', 'status',
               'flavor_id', 'size', 'region']
     if is_admin:
         fields.append('tenant_id')
-    utils.print_list(instances, fields)
+    utils.print_list((_instance_row(instance) for instance in instances),
+                     fields)
+
+
+def _instance_row(instance):
+    setattr(instance, 'flavor_id', instance.flavor['id'])
+    if hasattr(instance, 'volume'):
+        setattr(instance, 'size', instance.volume['size'])
+    else:
+        setattr(instance, 'size', '-')
+    if not hasattr(instance, 'region'):
+        setattr(instance, 'region', '')
+    if hasattr(instance, 'datastore'):
+        if instance.datastore.get('version'):
+            setattr(instance, 'datastore_version',
+                    instance.datastore['version'])
+        setattr(instance, 'datastore', instance.datastore['type'])
+    return instance
 
 
 @utils.arg('--limit', metavar='<limit>', type=int, default=None,
@@ -418,6 +423,8 @@ def do_cluster_shrink(cs, args):
 
 @utils.arg('instance', metavar='<instance>', nargs='+',
            help=_('ID or name of the instance(s).'))
+@utils.arg('--parallel', metavar='<N>', type=int, default=1,
+           help=_('Number of delete requests to send concurrently.'))
 @utils.service_type('database')
 def do_delete(cs, args):
     """Delete specified instance(s)."""
@@ -425,7 +432,8 @@ def do_delete(cs, args):
         lambda s: cs.instances.delete(_find_instance(cs, s)),
         args.instance,
         _("Request to delete instance %s has been accepted."),
-        _("Unable to delete the specified instance(s)."))
+        _("Unable to delete the specified instance(s)."),
+        concurrency=args.parallel)
 
 
 @utils.arg('instance', metavar='<instance>',
@@ -454,6 +462,8 @@ def do_reset_status(cs, args):
 
 @utils.arg('cluster', metavar='<cluster>', nargs='+',
            help=_('ID or name of the cluster(s).'))
+@utils.arg('--parallel', metavar='<N>', type=int, default=1,
+           help=_('Number of delete requests to send concurrently.'))
 @utils.service_type('database')
 def do_cluster_delete(cs, args):
     """Delete specified cluster(s)."""
@@ -461,7 +471,8 @@ def do_cluster_delete(cs, args):
         lambda s: cs.clusters.delete(_find_cluster(cs, s)),
         args.cluster,
         _("Request to delete cluster %s has been accepted."),
-        _("Unable to delete the specified cluster(s)."))
+        _("Unable to delete the specified cluster(s)."),
+        concurrency=args.parallel)
 
 
 @utils.arg('cluster', metavar='<cluster>',
@@ -1036,12 +1047,9 @@ def do_backup_show(cs, args):
 def do_backup_list_instance(cs, args):
     """Lists available backups for an instance."""
     instance = _find_instance(cs, args.instance)
-    items = cs.instances.backups(instance, limit=args.limit,
-                                 marker=args.marker)
-    backups = items
-    while items.next and not args.limit:
-        items = cs.instances.backups(instance, marker=items.next)
-        backups += items
+    backups = cs.instances.backups(instance, limit=args.limit,
+                                   marker=args.marker,
+                                   all_pages=not args.limit)
     utils.print_list(backups, ['id', 'name', 'status',
                                'parent_id', 'updated'],
                      order_by='updated')
@@ -1060,12 +1068,8 @@ def do_backup_list_instance(cs, args):
 @utils.service_type('database')
 def do_backup_list(cs, args):
     """Lists available backups."""
-    items = cs.backups.list(limit=args.limit, datastore=args.datastore,
-                            marker=args.marker)
-    backups = items
-    while items.next and not args.limit:
-        items = cs.backups.list(marker=items.next)
-        backups += items
+    backups = cs.backups.list(limit=args.limit, datastore=args.datastore,
+                              marker=args.marker, all_pages=not args.limit)
     utils.print_list(backups, ['id', 'instance_id', 'name',
                                'status', 'parent_id', 'updated'],
                      order_by='updated')
@@ -1206,11 +1210,7 @@ def do_database_create(cs, args):
 def do_database_list(cs, args):
     """Lists available databases on an instance."""
     instance, _ = _find_instance_or_cluster(cs, args.instance)
-    items = cs.databases.list(instance)
-    databases = items
-    while (items.next):
-        items = cs.databases.list(instance, marker=items.next)
-        databases += items
+    databases = cs.databases.list(instance, all_pages=True)
 
     utils.print_list(databases, ['name'])
 
@@ -1254,11 +1254,7 @@ def do_user_create(cs, args):
 def do_user_list(cs, args):
     """Lists the users for an instance."""
     instance, _ = _find_instance_or_cluster(cs, args.instance)
-    items = cs.users.list(instance)
-    users = items
-    while (items.next):
-        items = cs.users.list(instance, marker=items.next)
-        users += items
+    users = list(cs.users.list(instance, all_pages=True))
     for user in users:
         db_names = [db['name'] for db in user.databases]
         user.databases = ', '.join(db_names)
@@ -2061,13 +2057,9 @@ def do_module_list_instance(cs, args):
 def do_module_instances(cs, args):
     """Lists the instances that have a particular module applied."""
     module = _find_module(cs, args.module)
-    items = cs.modules.instances(
+    instance_list = cs.modules.instances(
         module, limit=args.limit, marker=args.marker,
-        include_clustered=args.include_clustered)
-    instance_list = items
-    while not args.limit and items.next:
-        items = cs.modules.instances(module, marker=items.next)
-        instance_list += items
+        include_clustered=args.include_clustered, all_pages=not args.limit)
     _print_instances(instance_list, utils.is_admin(cs))
 
 
@@ -2296,15 +2288,19 @@ def do_log_discard(cs, args):
 @utils.arg('log_name', metavar='<log_name>', help=_('Name of log to publish.'))
 @utils.arg('--lines', metavar='<lines>', default=50, type=int,
            help=_('Publish latest entries from guest before display.'))
+@utils.arg('--follow', action='store_true', default=False,
+           help=_('Keep displaying new log entries as they are published.'))
 @utils.service_type('database')
 def do_log_tail(cs, args):
     """Display log entries for instance."""
     try:
         instance = _find_instance(cs, args.instance)
         log_gen = cs.instances.log_generator(instance, args.log_name,
-                                             args.lines)
+                                             args.lines, follow=args.follow)
         for log_part in log_gen():
-            print(log_part, end="")
+            print(log_part, end="", flush=args.follow)
+    except KeyboardInterrupt:
+        pass
     except exceptions.GuestLogNotFoundError:
         print(NO_LOG_FOUND_ERROR % {'log_name': args.log_name,
                                     'instance': instance})
@@ -2318,13 +2314,16 @@ def do_log_tail(cs, args):
 @utils.arg('log_name', metavar='<log_name>', help=_('Name of log to publish.'))
 @utils.arg('--file', metavar='<file>', default=None,
            help=_('Path of file to save log to for instance.'))
+@utils.arg('--parallel', metavar='<N>', type=int, default=1,
+           help=_('Number of log parts to download concurrently.'))
 @utils.service_type('database')
 def do_log_save(cs, args):
     """Save log file for instance."""
     try:
         instance = _find_instance(cs, args.instance)
         filename = cs.instances.log_save(instance, args.log_name,
-                                         filename=args.file)
+                                         filename=args.file,
+                                         concurrency=args.parallel)
         print(_('Log "%(log_name)s" written to %(file_name)s')
               % {'log_name': args.log_name,
                  'file_name': filename})
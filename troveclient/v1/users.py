@@ -36,6 +36,7 @@ class Users(base.ManagerWithFind):
         body = {"users": users}
         url = "/instances/%s/users" % base.getid(instance)
         resp, body = self.api.client.post(url, body=body)
+        self._invalidate_caches()
         common.check_for_exceptions(resp, body, url)
 
     def delete(self, instance, username, hostname=None):
@@ -43,15 +44,18 @@ class Users(base.ManagerWithFind):
         user = common.quote_user_host(username, hostname)
         url = "/instances/%s/users/%s" % (base.getid(instance), user)
         resp, body = self.api.client.delete(url)
+        self._invalidate_caches()
         common.check_for_exceptions(resp, body, url)
 
-    def list(self, instance, limit=None, marker=None):
+    def list(self, instance, limit=None, marker=None, all_pages=False,
+             prefetch=False):
         """Get a list of all Users from the instance's Database.
 
         :rtype: list of :class:`User`.
         """
         url = "/instances/%s/users" % base.getid(instance)
-        return self._paginated(url, "users", limit, marker)
+        return self._paginated(url, "users", limit, marker,
+                               all_pages=all_pages, prefetch=prefetch)
 
     def get(self, instance, username, hostname=None):
         """Get a single User from the instance's Database.
@@ -62,21 +66,27 @@ class Users(base.ManagerWithFind):
         url = "/instances/%s/users/%s" % (base.getid(instance), user)
         return self._get(url, "user")
 
+    @staticmethod
+    def _update_attributes_body(username, newuserattr):
+        if not newuserattr:
+            raise exceptions.ValidationError("No updates specified for user %s"
+                                             % username)
+        user_dict = {}
+        user_dict['user'] = newuserattr
+        return user_dict
+
     def update_attributes(self, instance, username, newuserattr=None,
                           hostname=None):
         """Update attributes of a single User in an instance.
 
         :rtype: :class:`User`.
         """
-        if not newuserattr:
-            raise exceptions.ValidationError("No updates specified for user %s"
-                                             % username)
+        user_dict = self._update_attributes_body(username, newuserattr)
         instance_id = base.getid(instance)
         user = common.quote_user_host(username, hostname)
-        user_dict = {}
-        user_dict['user'] = newuserattr
         url = "/instances/%s/users/%s" % (instance_id, user)
         resp, body = self.api.client.put(url, body=user_dict)
+        self._invalidate_caches()
         common.check_for_exceptions(resp, body, url)
 
     def list_access(self, instance, username, hostname=None):
@@ -91,12 +101,16 @@ class Users(base.ManagerWithFind):
             raise Exception("Call to %s did not return to a body" % url)
         return [databases.Database(self, db) for db in body['databases']]
 
+    @staticmethod
+    def _grant_body(databases):
+        return {'databases': [{'name': db} for db in databases]}
+
     def grant(self, instance, username, databases, hostname=None):
         """Allow an existing user permissions to access a database."""
         instance_id = base.getid(instance)
         user = common.quote_user_host(username, hostname)
         url = "/instances/%(instance_id)s/users/%(user)s/databases"
-        dbs = {'databases': [{'name': db} for db in databases]}
+        dbs = self._grant_body(databases)
         local_vars = locals()
         resp, body = self.api.client.put(url % local_vars, body=dbs)
         common.check_for_exceptions(resp, body, url)
@@ -31,6 +31,7 @@ class VolumeType(base.Resource):
 class VolumeTypes(base.ManagerWithFind):
     """Manage :class:`VolumeType` resources."""
     resource_class = VolumeType
+    cache_responses = True
 
     def list(self):
         """Get a list of all volume-types.
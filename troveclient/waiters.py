@@ -0,0 +1,171 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""
+Wait for Trove resources to reach a target state.
+"""
+
+import inspect
+import random
+import time
+
+from troveclient import base
+from troveclient import exceptions
+
+READY_STATES = ('ACTIVE', 'HEALTHY', 'COMPLETED', 'NONE')
+FAILED_STATES = ('ERROR', 'FAILED')
+
+
+def get_status(resource):
+    """Return the upper-cased status of an instance, backup or cluster.
+
+    Clusters have no ``status`` of their own; their current task name is
+    used instead, which becomes ``NONE`` once the cluster is idle.
+    """
+    status = base._peek(resource, 'status')
+    if status is base._MISSING or status is None:
+        task = base._peek(resource, 'task')
+        status = task.get('name') if isinstance(task, dict) else None
+    return str(status).upper() if status is not None else None
+
+
+def _as_predicate(states):
+    if callable(states):
+        return states
+    states = frozenset(s.upper() for s in states)
+    return lambda status, resource: status in states
+
+
+class Waiter(object):
+    """Poll one or more resources of a manager until they settle.
+
+    Every tick issues a single ``list`` call for all resources still
+    pending, falling back to ``get`` when only one resource is pending or
+    a resource is missing from the listing. The polling interval starts
+    at ``interval`` and grows by ``backoff`` up to ``max_interval``; it is
+    reset whenever any resource changes status. Each sleep is randomised
+    by up to ``jitter`` (a fraction of the interval) so that many waiters
+    do not poll in lock-step.
+
+    :param manager: the manager owning the resources, e.g.
+                    ``client.instances``.
+    :param ready: statuses, or a ``predicate(status, resource)``, that
+                  mark a resource as done.
+    :param failed: statuses, or a ``predicate(status, resource)``, that
+                   mark a resource as failed.
+    :param leaving: statuses, or a ``predicate(status, resource)``, that a
+                    resource must first be seen out of before it counts as
+                    ready, e.g. ``READY_STATES`` when waiting for an action
+                    that only starts after the request was accepted. None
+                    to accept the ready states at once.
+    :param timeout: seconds to wait overall, None to wait forever.
+    :param callback: called as ``callback(resource_id, status, resource)``
+                     every time a resource is seen with a new status.
+    """
+
+    def __init__(self, manager, ready=READY_STATES, failed=FAILED_STATES,
+                 interval=2, max_interval=30, backoff=1.5, jitter=0.2,
+                 timeout=None, callback=None, list_kwargs=None,
+                 leaving=None):
+        self.manager = manager
+        self.ready = _as_predicate(ready)
+        self.failed = _as_predicate(failed)
+        self.leaving = _as_predicate(leaving) if leaving is not None else None
+        self.interval = interval
+        self.max_interval = max(max_interval, interval)
+        self.backoff = backoff
+        self.jitter = jitter
+        self.timeout = timeout
+        self.callback = callback
+        self.list_kwargs = list_kwargs or {}
+
+    def _sleep_time(self, interval):
+        if not self.jitter:
+            return interval
+        spread = interval * self.jitter
+        return max(0, interval + random.uniform(-spread, spread))
+
+    def _fetch(self, pending):
+        """Return a dict of the current state of the pending resources."""
+        found = {}
+        if len(pending) > 1:
+            kwargs = dict(self.list_kwargs)
+            if 'all_pages' in inspect.signature(
+                    self.manager.list).parameters:
+                kwargs['all_pages'] = True
+            for resource in self.manager.list(**kwargs):
+                resource_id = getattr(resource, 'id', None)
+                if resource_id in pending:
+                    found[resource_id] = resource
+        for resource_id in pending:
+            if resource_id not in found:
+                found[resource_id] = self.manager.get(resource_id)
+        return found
+
+    def wait(self, resources):
+        """Block until every resource is ready.
+
+        :param resources: resources or IDs to wait for.
+        :returns: a dict mapping each ID to its final resource.
+        :raises WaiterFailed: if a resource reaches a failed state.
+        :raises WaiterTimeout: if ``timeout`` expires first.
+        """
+        if isinstance(resources, (str, base.Resource)):
+            resources = [resources]
+        pending = [base.getid(r) for r in resources]
+        deadline = (time.monotonic() + self.timeout
+                    if self.timeout is not None else None)
+        statuses = {}
+        done = {}
+        left = set()
+        interval = self.interval
+
+        while True:
+            changed = False
+            for resource_id, resource in self._fetch(pending).items():
+                status = get_status(resource)
+                if statuses.get(resource_id) != status:
+                    changed = True
+                    statuses[resource_id] = status
+                    if self.callback:
+                        self.callback(resource_id, status, resource)
+                if self.failed(status, resource):
+                    raise exceptions.WaiterFailed(resource_id, status)
+                if (self.leaving is None or
+                        not self.leaving(status, resource)):
+                    left.add(resource_id)
+                if resource_id in left and self.ready(status, resource):
+                    done[resource_id] = resource
+            pending = [r for r in pending if r not in done]
+            if not pending:
+                return done
+
+            if changed:
+                interval = self.interval
+            else:
+                interval = min(interval * self.backoff, self.max_interval)
+            delay = self._sleep_time(interval)
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise exceptions.WaiterTimeout(
+                        pending, dict((r, statuses.get(r)) for r in pending))
+                delay = min(delay, remaining)
+            time.sleep(delay)
+
+
+def wait_for(manager, resources, **kwargs):
+    """Wait for ``resources`` of ``manager`` to be ready.
+
+    Shortcut for ``Waiter(manager, **kwargs).wait(resources)``.
+    """
+    return Waiter(manager, **kwargs).wait(resources)